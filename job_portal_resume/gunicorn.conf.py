@@ -0,0 +1,21 @@
+import multiprocessing
+import os
+
+# gunicorn job_portal_resume.wsgi -c gunicorn.conf.py
+#
+# Loads the application, with the production settings and the warm-up in
+# job_resume/warmup.py, once in the master before forking, so workers share
+# its compiled templates and imported code and answer their first request
+# warm. Settings come from the environment; see settings_production.py.
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_portal_resume.settings_production')
+os.environ.setdefault('DJANGO_WARMUP', '1')
+
+wsgi_app = 'job_portal_resume.wsgi:application'
+preload_app = True
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+# Recycle workers now and then; they fork from the warm master
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'job_resume.querycount.QueryCountMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +87,53 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# Rendered resume previews get their own alias (see job_resume/preview_cache.py).
+# Swap it for 'django.core.cache.backends.filebased.FileBasedCache' with a
+# LOCATION directory to share the previews between worker processes.
+# Sessions and logged-in users are cached in 'sessions'; in production point
+# it at a cache every worker shares (Redis, Memcached), see below.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'resume_previews': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'resume-previews',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+RESUME_PREVIEW_CACHE = 'resume_previews'
+
+
+# Sessions and authentication
+#
+# Authenticated requests read the session and the user from the cache, so a
+# warm request makes no database queries for them. 'cached_db' sessions are
+# written through to the database and read back from it on a cache miss, so
+# a cache restart logs nobody out; 'django.contrib.sessions.backends.cache'
+# (cache only) or 'django.contrib.sessions.backends.signed_cookies' (no
+# server-side storage) also avoid the database. The user is cached by
+# job_resume/auth_cache.py until it is saved or deleted; with a per-process
+# cache, other processes see role and password changes only after
+# AUTH_USER_CACHE_TIMEOUT seconds. Use ModelBackend to turn user caching off.
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+AUTHENTICATION_BACKENDS = ['job_resume.auth_cache.CachedModelBackend']
+AUTH_USER_CACHE = 'sessions'
+AUTH_USER_CACHE_TIMEOUT = 300
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -127,8 +175,57 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 STATIC_ROOT = BASE_DIR / 'staticfiles/'
 MEDIA_ROOT = BASE_DIR / 'media/'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+
+# Static files are served by WhiteNoise as they are; production settings
+# (settings_production.py) switch to hashed, precompressed files built by
+# collectstatic.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
 
 LOGIN_URL = 'job_resume:login'
 LOGIN_REDIRECT_URL = 'job_resume:home'
-LOGOUT_REDIRECT_URL = 'job_resume:login'
\ No newline at end of file
+LOGOUT_REDIRECT_URL = 'job_resume:login'
+
+# Server-side resume PDFs (see job_resume/resume_pdf.py). Rendering runs in a
+# process pool of RESUME_PDF_WORKERS processes; 0 renders in the request thread.
+# A render slower than RESUME_PDF_TIMEOUT seconds is answered with a 503; keep
+# it below the server's worker timeout (30 s in gunicorn.conf.py). Resumes
+# with characters outside Windows-1252 are set in RESUME_PDF_UNICODE_FONTS
+# (the fonts-dejavu-core package on Debian/Ubuntu). The cache is pruned to
+# RESUME_PDF_CACHE_MAX_BYTES, dropping files unused for RESUME_PDF_CACHE_MAX_AGE
+# seconds.
+RESUME_PDF_CACHE_DIR = BASE_DIR / 'cache' / 'resume_pdfs'
+RESUME_PDF_WORKERS = 2
+RESUME_PDF_TIMEOUT = 20
+RESUME_PDF_UNICODE_FONTS = {
+    'regular': '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    'bold': '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+}
+RESUME_PDF_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RESUME_PDF_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Per-request SQL instrumentation (see job_resume/querycount.py). Requests
+# over budget or repeating one query QUERY_REPEAT_THRESHOLD+ times are logged
+# to "job_resume.queries"; QUERY_BUDGETS overrides per-view budgets.
+QUERY_COUNT_ENABLED = True
+QUERY_COUNT_BUDGET = 20
+QUERY_TIME_BUDGET_MS = 200
+QUERY_REPEAT_THRESHOLD = 5
+QUERY_BUDGETS = {}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'job_resume': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,105 @@
+"""
+Production settings for job_portal_resume.
+
+Use with DJANGO_SETTINGS_MODULE=job_portal_resume.settings_production (the
+default in gunicorn.conf.py). Everything deployment-specific comes from the
+environment:
+
+    DJANGO_SECRET_KEY       required
+    DJANGO_ALLOWED_HOSTS    comma-separated host names (default: localhost)
+    DJANGO_DEBUG            "1" to turn debug on (default: off)
+    DJANGO_DB_PATH          SQLite database file (default: BASE_DIR/db.sqlite3)
+    DJANGO_CONN_MAX_AGE     seconds to keep database connections open (default: 600)
+    DJANGO_REDIS_URL        shared cache for sessions, users and facets, e.g.
+                            redis://127.0.0.1:6379/0 (default: sessions and users
+                            from the database, facet counts not cached)
+    DJANGO_STATIC_ROOT      where collectstatic writes (default: BASE_DIR/staticfiles)
+    DJANGO_SECURE_COOKIES   "0" when not served over HTTPS (default: on)
+    DJANGO_WARMUP           "1" to run job_resume.warmup when the WSGI app loads
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, CACHES, DATABASES, STORAGES, TEMPLATES
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, '1' if default else '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY to use the production settings.') from None
+
+DEBUG = _env_flag('DJANGO_DEBUG', False)
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',') if host.strip()]
+
+# Compiled templates are kept in memory for the life of the worker instead
+# of being re-read and re-parsed from disk; job_resume.warmup compiles them
+# all before the first request.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Persistent connections, checked before each request reuses them, so a
+# worker connects once instead of on every request.
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DJANGO_DB_PATH', DATABASES['default']['NAME']),
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+
+# Sessions, cached users (job_resume/auth_cache.py) and facet generations must
+# be shared by all workers to stay consistent; resume previews can stay local.
+# Without a shared cache, sessions and users are read from the database and
+# facet counts are computed on every request: a per-process cache would keep
+# a logged-out session, or a demoted, deactivated or deleted user, valid in
+# every worker but the one that made the change, and would miss the facet
+# generation bumps (job_resume/facets.py) made by other workers.
+if os.environ.get('DJANGO_REDIS_URL'):
+    _redis = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': os.environ['DJANGO_REDIS_URL']}
+    CACHES = {
+        **CACHES,
+        'default': {**_redis, 'KEY_PREFIX': 'default'},
+        'sessions': {**_redis, 'KEY_PREFIX': 'sessions'},
+    }
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+    CACHES = {**CACHES, 'facets': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    FACET_CACHE = 'facets'
+
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles/')
+
+# `manage.py collectstatic` writes every static file (including the vendored
+# third-party assets, see job_resume/assets.py) under a content-hashed name
+# with gzip and, when the Brotli package is installed, brotli variants next
+# to it. WhiteNoise serves the precompressed file the browser accepts and
+# marks hashed files as cacheable for ten years. Templates need the manifest,
+# so run collectstatic as part of every deploy.
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+SESSION_COOKIE_SECURE = CSRF_COOKIE_SECURE = _env_flag('DJANGO_SECURE_COOKIES', True)
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_portal_resume.settings')
 
 application = get_wsgi_application()
+
+# Compile templates and prime caches before the first request rather than
+# during it; with gunicorn --preload this runs once, before workers fork.
+if os.environ.get('DJANGO_WARMUP', '').lower() in ('1', 'true', 'yes', 'on'):
+    from job_resume.warmup import warm_up
+
+    warm_up()
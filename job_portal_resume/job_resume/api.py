@@ -0,0 +1,129 @@
+import datetime
+import hashlib
+from functools import wraps
+
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition, require_GET
+
+from . import job_facets
+from .conditional import fingerprint
+from .models import Job
+from .pagination import paginate
+
+# Read-only JSON API over approved jobs, for aggregator partners.
+#
+#   GET /api/jobs/               newest first, ?cursor= paging, ?limit= (max
+#                                API_MAX_PAGE_SIZE) and the job_list facet
+#                                filters (?location=, ?company=, ?salary=)
+#   GET /api/jobs/?updated_since=<ISO 8601>
+#                                incremental sync: jobs changed since then,
+#                                oldest change first; jobs that are no longer
+#                                approved come back as {"id", "updated_at",
+#                                "removed": true}
+#   GET /api/jobs/<id>/          one approved job
+#
+# Rows are read with values(), so no Job instances are built. Every response
+# is cached and tagged with a fingerprint of the jobs table (the latest
+# updated_at and the row count, one indexed query), which any job save,
+# delete or bulk change moves: a repeated request is served from the cache,
+# and a matching If-None-Match gets a 304, after that one query. Taking the
+# tag from the database rather than from a cached counter keeps it right in
+# every worker, whichever process made the change and whatever the cache
+# has lost. Deleted jobs are not reported by the sync; partners should still
+# re-crawl in full now and then. A sync client should pass the updated_at of
+# the last job it saw, less a few seconds, since a transaction committing
+# late can carry an earlier timestamp; the results are safe to apply twice.
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+API_CACHE_TIMEOUT = 60
+
+JOB_FIELDS = ('id', 'title', 'company', 'location', 'salary', 'description', 'created_at', 'updated_at')
+
+
+def _error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _job(request, row):
+    job = dict(row)
+    job['url'] = request.build_absolute_uri(reverse('job_resume:job_detail', args=[row['id']]))
+    return job
+
+
+def _response_tag(request, *args, **kwargs):
+    # Cached per request, so the cache lookup and condition() share one probe
+    if not hasattr(request, '_job_view_tag'):
+        parts = [fingerprint(Job.objects.all()), request.build_absolute_uri()]
+        request._job_view_tag = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return request._job_view_tag
+
+
+def cached_job_view(view_func):
+    """Cache ``view_func``'s 200 responses per URL and jobs fingerprint, with matching ETags.
+
+    For read-only views whose output depends only on the URL and the jobs
+    (the API and the job feeds).
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        cache = caches['default']
+        key = f'jobview:{_response_tag(request)}'
+        cached = cache.get(key)
+        if cached is not None:
+            content_type, body = cached
+            return HttpResponse(body, content_type=content_type)
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, (response['Content-Type'], response.content), API_CACHE_TIMEOUT)
+        return response
+    return require_GET(condition(etag_func=_response_tag)(wrapper))
+
+
+def _page_size(value):
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return API_PAGE_SIZE
+    return min(max(size, 1), API_MAX_PAGE_SIZE)
+
+
+@cached_job_view
+def job_list(request):
+    since = request.GET.get('updated_since')
+    jobs = job_facets.apply_filters(Job.objects.all(), job_facets.clean_filters(request.GET))
+    if since:
+        since = parse_datetime(since)
+        if since is None:
+            return _error('updated_since must be an ISO 8601 date and time.')
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since, datetime.timezone.utc)
+        jobs, ordering = jobs.filter(updated_at__gte=since), ['updated_at', 'id']
+    else:
+        jobs, ordering = jobs.filter(status='approved'), ['-created_at', '-id']
+    page = paginate(request, jobs.values(*JOB_FIELDS, 'status'), ordering,
+                    page_size=_page_size(request.GET.get('limit')))
+
+    results = []
+    for row in page.object_list:
+        if row.pop('status') == 'approved':
+            results.append(_job(request, row))
+        else:
+            results.append({'id': row['id'], 'updated_at': row['updated_at'], 'removed': True})
+    return JsonResponse({
+        'results': results,
+        'next': request.build_absolute_uri(f'{request.path}?{page.next_query}') if page.has_next else None,
+    }, encoder=DjangoJSONEncoder)
+
+
+@cached_job_view
+def job_detail(request, job_id):
+    row = Job.objects.filter(pk=job_id, status='approved').values(*JOB_FIELDS).first()
+    if row is None:
+        return _error('Job not found.', status=404)
+    return JsonResponse(_job(request, row), encoder=DjangoJSONEncoder)
@@ -0,0 +1,33 @@
+from django.db import transaction
+
+from . import counters
+from .models import Application
+
+# Application status changes by employers, one or many at a time.
+#
+# A change is one UPDATE per previous status over the caller's queryset
+# (which carries the job__posted_by ownership check), so shortlisting a whole
+# filtered list costs the same as shortlisting one application and no ids
+# are loaded into Python. queryset.update() skips the Application signals:
+# the dashboard counters are adjusted here from the UPDATE row counts, so a
+# concurrent change between the statements cannot make them drift.
+
+# Statuses an employer may move applications to
+EMPLOYER_STATUSES = ['shortlisted', 'rejected', 'hired']
+
+
+def set_status(applications, status):
+    """Move ``applications`` to ``status``; returns how many changed."""
+    if status not in EMPLOYER_STATUSES:
+        raise ValueError(f'Unsupported application status {status!r}')
+    changes = {}
+    with transaction.atomic():
+        for old_status, label in Application.STATUS_CHOICES:
+            if old_status == status:
+                continue
+            moved = applications.filter(status=old_status).update(status=status)
+            if moved:
+                changes[old_status] = -moved
+                changes[status] = changes.get(status, 0) + moved
+        counters.adjust(Application, changes)
+    return changes.get(status, 0)
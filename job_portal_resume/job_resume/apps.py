@@ -3,3 +3,19 @@ from django.apps import AppConfig
 
 class JobResumeConfig(AppConfig):
     name = 'job_resume'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from .search import ensure_fts_triggers
+        post_migrate.connect(ensure_fts_triggers, sender=self, dispatch_uid='ensure_fts_triggers')
+
+        from . import auth_cache, candidates, counters, job_facets, matching, preview_cache, skills, storage, tasks
+        auth_cache.connect_signals()
+        candidates.connect_signals()
+        counters.connect_signals()
+        job_facets.connect_signals()
+        matching.connect_signals()
+        preview_cache.connect_signals()
+        skills.connect_signals()
+        storage.connect_signals()
+        tasks.connect_signals()
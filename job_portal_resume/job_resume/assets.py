@@ -0,0 +1,96 @@
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+# Third-party CSS, JS and fonts, served from our own static files.
+#
+# `manage.py vendor_assets` downloads each entry of VENDOR_ASSETS (and the
+# fonts its CSS refers to) into job_resume/static/, checking the integrity
+# hash where there is one; collectstatic then fingerprints and precompresses
+# them with the rest of the static files, so WhiteNoise serves them from our
+# origin with far-future cache headers. Templates include them with
+# {% vendor_asset 'name' %}, which falls back to the CDN URL for any asset
+# that has not been vendored yet, so a checkout without the files still works.
+# An asset counts as vendored only when the file exists (in the app's static
+# directory or in STATIC_ROOT) and has a static URL, so files vendored on a
+# host after collectstatic ran (not in the manifest yet) also use the CDN
+# instead of breaking the page.
+
+GOOGLE_FONTS = 'https://fonts.googleapis.com/css2?family='
+
+VENDOR_ASSETS = {
+    'bootstrap-css': {
+        'url': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+        'path': 'vendor/bootstrap-5.3.0/bootstrap.min.css',
+        'integrity': 'sha384-9ndCyUaIbzAi2FUVXJi0CjmCapSmO7SnpJef0486qhLnuZ2cdeRhO02iuK6FUUVM',
+    },
+    'bootstrap-js': {
+        'url': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+        'path': 'vendor/bootstrap-5.3.0/bootstrap.bundle.min.js',
+        'integrity': 'sha384-geWF76RCwLtnZ8qwWowPQNguL3RmwHVBC9FhGdlKrxdiJJigb/j/68SIy3Te4Bkz',
+    },
+    'font-awesome': {
+        'url': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+        'path': 'vendor/fontawesome-6.4.0/css/all.min.css',
+        'integrity': 'sha512-iecdLmaskl7CVkqkXNQ/ZH/XLlvWZOJyj7Yy7tcenmpD1ypASozpmT/E0iPtmFIB46ZmdtAc9eNBvH0H/ZpiBw==',
+    },
+    'fonts-site': {
+        'url': GOOGLE_FONTS + 'Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700'
+                              '&family=Playfair+Display:wght@400;500;600;700&display=swap',
+        'path': 'vendor/fonts/site.css',
+    },
+    'fonts-classic': {
+        'url': GOOGLE_FONTS + 'Cormorant+Garamond:ital,wght@0,400;0,600;0,700;1,400'
+                              '&family=Lato:wght@300;400;700&display=swap',
+        'path': 'vendor/fonts/classic.css',
+    },
+    'fonts-modern': {
+        'url': GOOGLE_FONTS + 'Merriweather:ital,wght@0,300;0,400;0,700;1,300'
+                              '&family=Inter:wght@300;400;500;600;700&display=swap',
+        'path': 'vendor/fonts/modern.css',
+    },
+    'fonts-creative': {
+        'url': GOOGLE_FONTS + 'Outfit:wght@300;400;500;600;700&family=Space+Grotesk:wght@300;400;500;600;700'
+                              '&display=swap',
+        'path': 'vendor/fonts/creative.css',
+    },
+    'fonts-executive': {
+        'url': GOOGLE_FONTS + 'Libre+Baskerville:ital,wght@0,400;0,700;1,400'
+                              '&family=Montserrat:wght@300;400;500;600;700&display=swap',
+        'path': 'vendor/fonts/executive.css',
+    },
+}
+
+_local_urls = {}
+
+
+def local_url(name):
+    """The static URL of a vendored asset, or None if it is not served locally."""
+    if name not in _local_urls:
+        path = VENDOR_ASSETS[name]['path']
+        url = None
+        if finders.find(path) is not None or staticfiles_storage.exists(path):
+            try:
+                url = static(path)
+            except ValueError:  # missing from the manifest
+                pass
+        _local_urls[name] = url
+    return _local_urls[name]
+
+
+def is_vendored(name):
+    return local_url(name) is not None
+
+
+def asset_tag(name):
+    """<link> or <script> tag for a VENDOR_ASSETS entry, local when vendored."""
+    asset = VENDOR_ASSETS[name]
+    if is_vendored(name):
+        url, attrs = local_url(name), ''
+    else:
+        url = asset['url']
+        attrs = format_html(' integrity="{}" crossorigin="anonymous"', asset['integrity']) if 'integrity' in asset else ''
+    if asset['path'].endswith('.js'):
+        return format_html('<script src="{}"{}></script>', url, attrs)
+    return format_html('<link rel="stylesheet" href="{}"{}>', url, attrs)
@@ -0,0 +1,83 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from .models import User
+
+# Cached user loading for authenticated requests.
+#
+# Every request with a session loads request.user by primary key. With
+# CachedModelBackend in AUTHENTICATION_BACKENDS that lookup is served from the
+# AUTH_USER_CACHE alias, under a key built from the user id and a per-user
+# version number. Saving or deleting a user (a role change, a password change,
+# deactivation, delete_user, even the last_login update on login) bumps the
+# version, so the next request loads the user from the database again; stale
+# copies are never read and simply age out. Django still checks the session's
+# password hash against the cached user, so a password change logs other
+# sessions out as before. queryset.update() on users skips the signals and
+# must call bump() itself.
+#
+# The cache has to be shared by all worker processes (Redis, Memcached) for a
+# change made in one process to reach the others at once; with a per-process
+# cache such as LocMemCache the other processes pick it up after
+# AUTH_USER_CACHE_TIMEOUT.
+
+AUTH_USER_CACHE_TIMEOUT = 300
+
+
+def get_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE', 'default')]
+
+
+def _version_key(user_id):
+    return f'auth:user:{user_id}:version'
+
+
+def _version(cache, user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from a fresh number rather than 0, so copies cached under an
+        # evicted version cannot come back
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def user_version(user_id):
+    """A number that changes whenever the user is saved or deleted."""
+    return _version(get_cache(), user_id)
+
+
+def bump(user_id):
+    cache = get_cache()
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user() is served from AUTH_USER_CACHE."""
+
+    def get_user(self, user_id):
+        cache = get_cache()
+        key = f'auth:user:{user_id}:{_version(cache, user_id)}'
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', AUTH_USER_CACHE_TIMEOUT))
+        return user
+
+
+def _user_changed(sender, instance, **kwargs):
+    bump(instance.pk)
+
+
+def connect_signals():
+    post_save.connect(_user_changed, sender=User, dispatch_uid='auth_cache_user_saved')
+    post_delete.connect(_user_changed, sender=User, dispatch_uid='auth_cache_user_deleted')
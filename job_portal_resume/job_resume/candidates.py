@@ -0,0 +1,128 @@
+import re
+
+from django.db.models import Count
+from django.http import QueryDict
+from django.db.models.signals import post_save, pre_save
+
+from . import facets
+from .models import Resume, Skill, User, UserProfile
+from .search import search_resumes
+from .skills import normalize
+
+# Candidate search for employers.
+#
+# Every filter maps onto a precomputed, indexed structure:
+# - visibility: Resume.searchable, maintained here whenever a resume, its
+#   owner's role or their profile visibility changes (users who never opened
+#   their profile page count as visible, as that is the default);
+# - keywords: the FTS5 index over summary and work experience (migration 0015);
+# - skills: the Resume.skill_set join table (skills.py);
+# - location: Resume.location, the city part of the free-text address.
+#
+# Facet counts for the matched set are grouped queries cached per filter
+# combination. Resume edits only shift counts slightly, so they are left to
+# expire (facets.FACET_TIMEOUT); visibility changes invalidate them at once.
+
+FACET_NAMESPACE = 'candidates'
+FACET_LIMIT = 10
+
+_SEGMENT_RE = re.compile(r'[,\n;]+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def location_key(address):
+    # "221B Baker St, London, UK" -> "London": the first part of the address
+    # without digits (street numbers, postcodes)
+    for segment in _SEGMENT_RE.split(address or ''):
+        segment = _SPACE_RE.sub(' ', segment).strip(' .')
+        if segment and not any(char.isdigit() for char in segment):
+            return segment.title()[:100]
+    return ''
+
+
+def is_searchable(user_id):
+    return User.objects.filter(pk=user_id, role='job_seeker').exclude(profile__profile_visibility=False).exists()
+
+
+def clean_filters(params):
+    skills = sorted({normalize(skill) for skill in params.getlist('skill') if skill.strip()})
+    return {
+        'q': params.get('q', '').strip(),
+        'skills': [skill for skill in skills if skill],
+        'location': params.get('location', '').strip(),
+    }
+
+
+def filter_params(filters):
+    """Canonical query parameters for ``filters`` (the inverse of clean_filters)."""
+    params = QueryDict(mutable=True)
+    if filters['q']:
+        params['q'] = filters['q']
+    params.setlist('skill', filters['skills'])
+    if filters['location']:
+        params['location'] = filters['location']
+    return params
+
+
+def search_candidates(filters):
+    resumes = Resume.objects.filter(searchable=True)
+    for skill in filters['skills']:
+        resumes = resumes.filter(skill_set__name=skill)
+    if filters['location']:
+        resumes = resumes.filter(location=filters['location'])
+    if filters['q']:
+        resumes = search_resumes(resumes, filters['q'])
+    return resumes
+
+
+def compute_facets(resumes):
+    Link = Resume.skill_set.through
+    skills = list(
+        Link.objects.filter(resume__in=resumes.order_by().values('id'))
+        .values('skill_id').annotate(total=Count('resume_id'))
+        .order_by('-total', 'skill_id')[:FACET_LIMIT]
+    )
+    names = {skill.id: skill for skill in Skill.objects.filter(id__in=[row['skill_id'] for row in skills])}
+    locations = (
+        resumes.order_by().exclude(location='')
+        .values('location').annotate(total=Count('id'))
+        .order_by('-total', 'location')[:FACET_LIMIT]
+    )
+    return {
+        'skills': [(names[row['skill_id']].name, names[row['skill_id']].label, row['total']) for row in skills],
+        'locations': [(row['location'], row['total']) for row in locations],
+    }
+
+
+def candidate_facets(filters, resumes):
+    return facets.cached_facets(FACET_NAMESPACE, filters, lambda: compute_facets(resumes))
+
+
+def update_searchable(user_id):
+    searchable = is_searchable(user_id)
+    if Resume.objects.filter(user_id=user_id).exclude(searchable=searchable).update(searchable=searchable):
+        facets.invalidate(FACET_NAMESPACE)
+
+
+def _on_resume_pre_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.location = location_key(instance.address)
+        instance.searchable = is_searchable(instance.user_id)
+
+
+def _on_profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_searchable(instance.user_id)
+
+
+def _on_user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login only; new users have no resumes yet
+    if raw or created or (update_fields and 'role' not in update_fields):
+        return
+    update_searchable(instance.pk)
+
+
+def connect_signals():
+    pre_save.connect(_on_resume_pre_save, sender=Resume, dispatch_uid='candidates_resume_pre_save')
+    post_save.connect(_on_profile_saved, sender=UserProfile, dispatch_uid='candidates_profile_saved')
+    post_save.connect(_on_user_saved, sender=User, dispatch_uid='candidates_user_saved')
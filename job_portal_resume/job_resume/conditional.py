@@ -0,0 +1,107 @@
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db.models import Count, Exists, Max, OuterRef
+from django.template.loader import get_template
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from . import auth_cache, preview_cache
+from .models import Application, Job, Resume
+
+# Conditional GET for the most visited pages.
+#
+# Before the view runs, a version probe (one or a few indexed aggregate
+# queries) builds an ETag from everything the page shows: the probed rows,
+# the viewer (id and auth_cache version, for the navigation bar), the query
+# string, the template sources and the static files manifest (a deploy that
+# changes CSS or JS changes the hashed URLs the page links to). Django's
+# condition() answers a matching If-None-Match with 304 Not Modified, so the
+# view's own queries and the template rendering are skipped. Responses are Cache-Control: private,
+# no-cache, so browsers keep them but revalidate on every visit.
+#
+# List pages are fingerprinted by the latest updated_at and the row count of
+# the jobs the viewer can see: an edit, a status change (moderation sets
+# updated_at) or a delete all change it. Requests with pending flash messages
+# get no ETag, so the messages are rendered rather than left queued. Nothing
+# time-relative ("posted 5 minutes ago") may be rendered on these pages, since
+# the ETag does not change with the clock; they show absolute dates.
+
+_template_hashes = {}
+
+
+def _template_hash(names):
+    if names not in _template_hashes:
+        digest = hashlib.sha1()
+        for name in names:
+            digest.update(get_template(name).template.source.encode())
+        _template_hashes[names] = digest.hexdigest()[:12]
+    return _template_hashes[names]
+
+
+def _etag(request, templates, *versions):
+    if get_messages(request):
+        return None
+    user = request.user
+    parts = [
+        user.pk, auth_cache.user_version(user.pk), request.GET.urlencode(), _template_hash(templates),
+        getattr(staticfiles_storage, 'manifest_hash', ''),
+    ]
+    parts.extend(versions)
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def visible_jobs(user):
+    if user.role == 'admin':
+        return Job.objects.all()
+    if user.role == 'employer':
+        return Job.objects.filter(posted_by=user)
+    return Job.objects.filter(status='approved')
+
+
+def fingerprint(queryset):
+    values = queryset.order_by().aggregate(changed=Max('updated_at'), total=Count('pk'))
+    return values['changed'], values['total']
+
+
+def home_etag(request):
+    user = request.user
+    versions = [fingerprint(visible_jobs(user))]
+    if user.role == 'job_seeker':
+        # Recommendations follow the seeker's resumes and skip applied jobs
+        versions.append(fingerprint(Resume.objects.filter(user=user)))
+        applications = Application.objects.filter(user=user).aggregate(last=Max('pk'), total=Count('pk'))
+        versions.append((applications['last'], applications['total']))
+    return _etag(request, ('base.html', 'home.html'), *versions)
+
+
+def job_list_etag(request):
+    return _etag(request, ('base.html', 'job_list.html', 'pagination.html'), fingerprint(visible_jobs(request.user)))
+
+
+def job_detail_etag(request, job_id):
+    applied = Application.objects.filter(user=request.user, job=OuterRef('pk'))
+    row = Job.objects.filter(pk=job_id).values_list('updated_at', Exists(applied)).first()
+    if row is None:
+        return None
+    return _etag(request, ('base.html', 'job_detail.html'), job_id, *row)
+
+
+def resume_preview_etag(request, resume_id):
+    row = Resume.objects.filter(pk=resume_id, user=request.user).values_list('updated_at', 'template_type').first()
+    if row is None:
+        return None
+    updated_at, saved_type = row
+    # The same choice resume_preview makes for ?template=
+    template_type = request.GET.get('template', saved_type)
+    if template_type not in dict(Resume.TEMPLATE_CHOICES):
+        template_type = saved_type
+    return _etag(request, (preview_cache.template_name(template_type),), resume_id, updated_at)
+
+
+def conditional_page(etag_func):
+    """Answer GET/HEAD with 304 when ``etag_func`` matches the client's If-None-Match."""
+    def decorator(view_func):
+        return cache_control(private=True, no_cache=True)(condition(etag_func=etag_func)(view_func))
+    return decorator
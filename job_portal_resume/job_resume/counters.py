@@ -0,0 +1,143 @@
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+
+from .models import User, Job, Application, SiteCounters
+
+# Incremental maintenance of SiteCounters.
+#
+# Each tracked model contributes one counter per value of a choice field
+# (User.role, Job.status, Application.status); the column name is
+# ``<prefix>_<value>``. Saves and deletes adjust the single counters row with
+# an F() expression inside the caller's transaction, so the dashboards read
+# one row instead of counting whole tables.
+#
+# queryset.update(), bulk_create() and raw SQL bypass model signals; code
+# using them must call adjust() itself (or run reconcile_counters).
+#
+# A save counts the change from the value stored in the database, not the one
+# the instance was loaded with, and inside a transaction that row stays locked
+# until commit, so two saves moving the same row from the same value are
+# counted one after the other. Deleting an instance directly re-reads its row
+# the same way (delete() always runs in a transaction). Views saving a
+# tracked field of an existing row do it inside transaction.atomic() (the
+# admin already does).
+
+COUNTERS_PK = 1
+
+# Snapshot marker for instances loaded with the tracked field deferred
+UNKNOWN = object()
+# Marker for a row deleted by someone else before this delete reached it
+GONE = object()
+
+TRACKED = {
+    User: ('role', 'users'),
+    Job: ('status', 'jobs'),
+    Application: ('status', 'applications'),
+}
+
+
+def _column(model, value):
+    field, prefix = TRACKED[model]
+    return f'{prefix}_{value}'
+
+
+def adjust(model, changes):
+    """Apply ``{choice_value: delta}`` to the counters of ``model``."""
+    columns = {}
+    for value, delta in changes.items():
+        if delta:
+            column = _column(model, value)
+            columns[column] = F(column) + delta
+    if columns:
+        SiteCounters.objects.filter(pk=COUNTERS_PK).update(**columns)
+
+
+def get_counters():
+    counters = SiteCounters.objects.filter(pk=COUNTERS_PK).first()
+    if counters is None:
+        counters = recount()
+    return counters
+
+
+def recount():
+    values = {}
+    for model, (field, prefix) in TRACKED.items():
+        for choice, label in model._meta.get_field(field).choices:
+            values[f'{prefix}_{choice}'] = 0
+        rows = model.objects.order_by().values(field).annotate(total=Count('pk'))
+        for row in rows:
+            column = f'{prefix}_{row[field]}'
+            if column in values:
+                values[column] = row['total']
+    counters, created = SiteCounters.objects.update_or_create(pk=COUNTERS_PK, defaults=values)
+    return counters
+
+
+def _remember_value(sender, instance, **kwargs):
+    field, prefix = TRACKED[sender]
+    if instance.pk is None:
+        instance._counted_value = None
+    else:
+        instance._counted_value = instance.__dict__.get(field, UNKNOWN)
+
+
+def _lock_stored_value(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    if raw:
+        return
+    field, prefix = TRACKED[sender]
+    if instance.pk is None:
+        instance._counted_value = None
+    elif update_fields is not None and field not in update_fields:
+        instance._counted_value = getattr(instance, field)  # not written by this save
+    else:
+        instance._counted_value = _stored_value(sender, instance, using)
+
+
+def _lock_deleted_value(sender, instance, using=None, origin=None, **kwargs):
+    # Rows collected by a queryset delete or a cascade were just loaded; an
+    # instance deleted directly may be older than the row
+    if instance is origin:
+        value = _stored_value(sender, instance, using)
+        instance._counted_value = GONE if value is None else value
+
+
+def _stored_value(sender, instance, using):
+    field, prefix = TRACKED[sender]
+    rows = sender._base_manager.using(using).filter(pk=instance.pk)
+    if transaction.get_connection(using).in_atomic_block:
+        rows = rows.select_for_update()
+    return rows.values_list(field, flat=True).first()
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    field, prefix = TRACKED[sender]
+    new = getattr(instance, field)
+    old = None if created else getattr(instance, '_counted_value', None)
+    if old != new:
+        changes = {new: 1}
+        if old is not None:
+            changes[old] = -1
+        adjust(sender, changes)
+    instance._counted_value = new
+
+
+def _on_delete(sender, instance, **kwargs):
+    field, prefix = TRACKED[sender]
+    value = getattr(instance, '_counted_value', UNKNOWN)
+    if value is GONE:
+        return
+    if value is None or value is UNKNOWN:
+        value = getattr(instance, field)
+    adjust(sender, {value: -1})
+
+
+def connect_signals():
+    for model in TRACKED:
+        post_init.connect(_remember_value, sender=model, dispatch_uid=f'counters_init_{model.__name__}')
+        pre_save.connect(_lock_stored_value, sender=model, dispatch_uid=f'counters_pre_save_{model.__name__}')
+        pre_delete.connect(_lock_deleted_value, sender=model, dispatch_uid=f'counters_pre_delete_{model.__name__}')
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'counters_save_{model.__name__}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'counters_delete_{model.__name__}')
@@ -0,0 +1,74 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .pagination import CURSOR_PARAM
+
+# Cached facet counts.
+#
+# Counts depend on the whole filter combination, so each combination is
+# cached under a key built from the namespace, a per-namespace generation
+# number and a hash of the normalized filters. invalidate() bumps the
+# generation: every combination cached before the change becomes unreachable
+# at once and simply ages out, with no need to know which keys exist.
+#
+# The generation lives in the cache, so FACET_CACHE must be shared by every
+# process that serves or changes jobs and resumes; a per-process cache only
+# sees its own process's invalidations. settings_production turns facet
+# caching off when no shared cache is configured.
+
+FACET_TIMEOUT = 300
+
+
+def get_cache():
+    return caches[getattr(settings, 'FACET_CACHE', 'default')]
+
+
+def _generation_key(namespace):
+    return f'facets:{namespace}:generation'
+
+
+def invalidate(namespace):
+    cache = get_cache()
+    try:
+        cache.incr(_generation_key(namespace))
+    except ValueError:
+        cache.set(_generation_key(namespace), 1, None)
+
+
+def generation(namespace):
+    """The namespace's current generation; it changes on every invalidate()."""
+    return get_cache().get_or_set(_generation_key(namespace), 0, None)
+
+
+def cached_facets(namespace, filters, compute, timeout=FACET_TIMEOUT):
+    """Return ``compute()`` for ``filters``, from the cache when possible."""
+    cache = get_cache()
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+    key = f'facets:{namespace}:{generation(namespace)}:{digest}'
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+def toggle_query(params, key, value, multiple=False):
+    """Query string for ``params`` with ``key=value`` switched on or off.
+
+    Single-valued keys are replaced; the pagination cursor is always dropped
+    because it belongs to the old result set.
+    """
+    params = params.copy()
+    params.pop(CURSOR_PARAM, None)
+    values = params.getlist(key)
+    if value in values:
+        values.remove(value)
+    elif multiple:
+        values.append(value)
+    else:
+        values = [value]
+    params.setlist(key, values)
+    return params.urlencode()
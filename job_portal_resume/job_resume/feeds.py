@@ -0,0 +1,63 @@
+from django.contrib.syndication.views import Feed
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from . import job_facets
+from .api import cached_job_view
+from .models import Job
+
+# RSS and Atom feeds of the latest approved jobs, optionally narrowed with the
+# job_list filters (?location=, ?company=, ?salary=).
+#
+# The rendered XML is cached per URL by cached_job_view, under the same jobs
+# fingerprint as the API: approving, rejecting, editing or deleting any job
+# changes it, so a feed is rendered once per change and every poll in between
+# is a cache hit (or a 304) after a single indexed query. Jobs come newest change first,
+# so a job shows up when it is approved, not when it was first posted.
+
+FEED_ITEMS = 50
+
+
+class LatestJobsFeed(Feed):
+    description = 'Newly approved jobs.'
+
+    def get_object(self, request):
+        return job_facets.clean_filters(request.GET)
+
+    def title(self, filters):
+        narrowed = [filters[facet] for facet in ('location', 'company') if filters[facet]]
+        return ' - '.join(['Latest jobs'] + narrowed)
+
+    def link(self, filters):
+        query = job_facets.filter_params(filters).urlencode()
+        return f"{reverse('job_resume:job_list')}?{query}" if query else reverse('job_resume:job_list')
+
+    def items(self, filters):
+        jobs = job_facets.apply_filters(Job.objects.filter(status='approved'), filters)
+        return jobs.order_by('-updated_at', '-id').values(
+            'id', 'title', 'company', 'location', 'description', 'created_at', 'updated_at',
+        )[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return f"{item['title']} at {item['company']}"
+
+    def item_description(self, item):
+        return f"{item['location']} - {item['description']}"
+
+    def item_link(self, item):
+        return reverse('job_resume:job_detail', args=[item['id']])
+
+    def item_pubdate(self, item):
+        return item['created_at']
+
+    def item_updateddate(self, item):
+        return item['updated_at']
+
+
+class LatestJobsAtomFeed(LatestJobsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestJobsFeed.description
+
+
+job_feed_rss = cached_job_view(LatestJobsFeed())
+job_feed_atom = cached_job_view(LatestJobsAtomFeed())
@@ -23,6 +23,13 @@ class JobForm(forms.ModelForm):
             'salary': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Salary (e.g. 50000)'}),
         }
 
+class JobImportForm(forms.Form):
+    file = forms.FileField(
+        label="Jobs file (CSV or JSON Lines)",
+        help_text="One job per row with title, description, company, location and optional salary",
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.ndjson'})
+    )
+
 class JobApplicationForm(forms.ModelForm):
     cv_pdf = forms.FileField(
         required=True,
@@ -0,0 +1,151 @@
+import codecs
+import csv
+import json
+import os
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import counters, facets, job_facets
+from .forms import JobForm
+from .models import Job
+
+# Bulk job import from CSV or JSON Lines.
+#
+# The file is read as a stream, one row at a time, and each row is cleaned
+# with the fields of JobForm (the rules post_job applies), so a bad row only
+# costs its own error message. Valid rows are inserted with bulk_create() in
+# batches of IMPORT_BATCH_SIZE, each in its own transaction: batches already
+# committed stay if a later one fails. Imported jobs are pending, like
+# posted ones. bulk_create() skips the Job signals, so the dashboard counters
+# and the job facets are updated here; the search index is kept by triggers.
+
+IMPORT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+IMPORT_FIELDS = JobForm._meta.fields
+
+
+class ImportFileError(Exception):
+    pass
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []  # [(line number, message)], the first MAX_REPORTED_ERRORS
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def detect_format(filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ImportFileError(f'Unsupported file type "{extension}"; upload a .csv or .jsonl file.')
+    return IMPORT_FORMATS[extension]
+
+
+def _lines(chunks):
+    # Text lines from an iterable of byte chunks (an upload or a binary file)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = ''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ''
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def read_rows(chunks, file_format):
+    """Yield ``(line number, row dict or None, error)`` for each record of the file."""
+    lines = _lines(chunks)
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        missing = [field for field in ('title', 'description', 'company', 'location')
+                   if field not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFileError(f'Missing CSV column(s): {", ".join(missing)}.')
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, 'more values than columns'
+            else:
+                yield reader.line_num, row, None
+        return
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield number, None, f'invalid JSON ({error})'
+            continue
+        if isinstance(row, dict):
+            yield number, row, None
+        else:
+            yield number, None, 'expected a JSON object'
+
+
+def clean_row(fields, row):
+    cleaned, errors = {}, []
+    for name, field in fields.items():
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            cleaned[name] = field.clean('' if value is None else value)
+        except ValidationError as error:
+            errors.append(f'{name}: {" ".join(error.messages)}')
+    return cleaned, errors
+
+
+def _insert(jobs):
+    with transaction.atomic():
+        Job.objects.bulk_create(jobs)
+        counters.adjust(Job, {'pending': len(jobs)})
+
+
+def import_jobs(chunks, file_format, employer, batch_size=IMPORT_BATCH_SIZE):
+    """Create pending jobs for ``employer`` from the rows of a CSV or JSONL file.
+
+    Raises ImportFileError if the file cannot be read at all; a file that
+    breaks off part way (bad encoding, unbalanced CSV quotes) keeps the rows
+    before the break and reports the rest as one error.
+    """
+    result = ImportResult()
+    fields = {name: field for name, field in JobForm().fields.items() if name in IMPORT_FIELDS}
+    batch = []
+    try:
+        for line, row, error in read_rows(chunks, file_format):
+            if error is None:
+                cleaned, errors = clean_row(fields, row)
+                error = '; '.join(errors)
+            if error:
+                result.add_error(line, error)
+                continue
+            batch.append(Job(posted_by=employer, status='pending', **cleaned))
+            if len(batch) >= batch_size:
+                _insert(batch)
+                result.created += len(batch)
+                batch = []
+    except (csv.Error, UnicodeDecodeError) as error:
+        result.add_error(None, f'Stopped reading the file: {error}')
+    if batch:
+        _insert(batch)
+        result.created += len(batch)
+    if result.created:
+        facets.invalidate(job_facets.FACET_NAMESPACE)
+    return result
@@ -0,0 +1,121 @@
+from decimal import Decimal
+
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.http import QueryDict
+
+from . import facets
+from .models import Job
+
+# Faceted filters for job_list: location, company and salary band.
+#
+# Each facet is counted over the jobs matching every *other* active filter
+# (and the search query), so picking "Berlin" still shows how many jobs the
+# other cities have. All three facets come from one UNION ALL of grouped
+# queries, cached per filter combination and scope (facets.py); any job save
+# or delete invalidates them. Code changing jobs with queryset.update() must
+# call facets.invalidate(FACET_NAMESPACE) itself.
+
+FACET_NAMESPACE = 'jobs'
+FACET_LIMIT = 8
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+SALARY_BANDS = [
+    ('0-30k', 'Under $30k', None, Decimal('30000')),
+    ('30k-60k', '$30k - $60k', Decimal('30000'), Decimal('60000')),
+    ('60k-100k', '$60k - $100k', Decimal('60000'), Decimal('100000')),
+    ('100k+', '$100k+', Decimal('100000'), None),
+    ('unspecified', 'Not specified', None, None),
+]
+SALARY_LABELS = {key: label for key, label, low, high in SALARY_BANDS}
+
+FACETS = ['location', 'company', 'salary']
+
+
+def _band_q(key):
+    for band, label, low, high in SALARY_BANDS:
+        if band != key:
+            continue
+        if low is None and high is None:
+            return Q(salary__isnull=True)
+        condition = Q()
+        if low is not None:
+            condition &= Q(salary__gte=low)
+        if high is not None:
+            condition &= Q(salary__lt=high)
+        return condition
+    return None
+
+
+def salary_band():
+    whens = [When(_band_q(key), then=Value(key)) for key, label, low, high in SALARY_BANDS]
+    return Case(*whens, default=Value('unspecified'), output_field=CharField())
+
+
+def clean_filters(params):
+    salary = params.get('salary', '')
+    return {
+        'location': params.get('location', '').strip(),
+        'company': params.get('company', '').strip(),
+        'salary': salary if salary in SALARY_LABELS else '',
+    }
+
+
+def filter_params(filters, query=''):
+    params = QueryDict(mutable=True)
+    if query:
+        params['q'] = query
+    for facet in FACETS:
+        if filters[facet]:
+            params[facet] = filters[facet]
+    return params
+
+
+def apply_filters(jobs, filters, skip=None):
+    if filters['location'] and skip != 'location':
+        jobs = jobs.filter(location=filters['location'])
+    if filters['company'] and skip != 'company':
+        jobs = jobs.filter(company=filters['company'])
+    if filters['salary'] and skip != 'salary':
+        jobs = jobs.filter(_band_q(filters['salary']))
+    return jobs
+
+
+def compute_facets(jobs, filters):
+    """``{facet: [(value, count), ...]}`` for ``jobs`` (unfiltered by the facets)."""
+    jobs = jobs.order_by()
+    branches = []
+    for facet in FACETS:
+        scoped = apply_filters(jobs, filters, skip=facet)
+        value = salary_band() if facet == 'salary' else F(facet)
+        branches.append(
+            scoped.annotate(facet_name=Value(facet, output_field=CharField()), facet_value=value)
+            .values('facet_name', 'facet_value').annotate(total=Count('id'))
+            .values_list('facet_name', 'facet_value', 'total')
+        )
+    counts = {facet: [] for facet in FACETS}
+    for facet, value, total in branches[0].union(*branches[1:], all=True):
+        if value:
+            counts[facet].append((value, total))
+    band_order = [key for key, label, low, high in SALARY_BANDS]
+    for facet, values in counts.items():
+        if facet == 'salary':
+            values.sort(key=lambda item: band_order.index(item[0]))
+        else:
+            values.sort(key=lambda item: (-item[1], item[0]))
+            del values[FACET_LIMIT:]
+    return counts
+
+
+def job_facets(scope, query, filters, jobs):
+    key = {'scope': scope, 'q': query, **filters}
+    return facets.cached_facets(FACET_NAMESPACE, key, lambda: compute_facets(jobs, filters))
+
+
+def _invalidate(sender, **kwargs):
+    facets.invalidate(FACET_NAMESPACE)
+
+
+def connect_signals():
+    post_save.connect(_invalidate, sender=Job, dispatch_uid='job_facets_saved')
+    post_delete.connect(_invalidate, sender=Job, dispatch_uid='job_facets_deleted')
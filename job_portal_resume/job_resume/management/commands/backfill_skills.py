@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from job_resume.models import Resume
+from job_resume.skills import get_or_create_skills, normalized
+
+
+class Command(BaseCommand):
+    help = 'Populate the normalized Skill catalog and resume links from Resume.skills.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        Link = Resume.skill_set.through
+        batch_size = options['batch_size']
+        resumes = Resume.objects.only('id', 'skills').order_by('id')
+        last_id, total_resumes, total_links = 0, 0, 0
+        while True:
+            batch = list(resumes.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            per_resume = {resume.id: normalized(resume.skills) for resume in batch}
+            names = {}
+            for skills in per_resume.values():
+                for name, label in skills.items():
+                    names.setdefault(name, label)
+            with transaction.atomic():
+                ids = get_or_create_skills(names)
+                links = [
+                    Link(resume_id=resume_id, skill_id=ids[name])
+                    for resume_id, skills in per_resume.items() for name in skills
+                ]
+                Link.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+            total_resumes += len(batch)
+            total_links += len(links)
+            self.stdout.write(f'{total_resumes} resumes processed')
+        self.stdout.write(self.style.SUCCESS(f'Linked {total_resumes} resumes to skills ({total_links} links).'))
@@ -0,0 +1,106 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+
+from job_resume import facets
+from job_resume.candidates import FACET_NAMESPACE, candidate_facets, clean_filters, location_key, search_candidates
+from job_resume.management.commands.bench_job_search import CITIES, FILLER, WORDS, _percentile
+from job_resume.models import Resume, User, UserProfile
+from job_resume.pagination import PAGE_SIZE
+from job_resume.skills import get_or_create_skills, normalized
+
+# Runs against a throwaway test database (created and destroyed by the
+# command, like `manage.py test` does), filled with synthetic job seekers.
+
+QUERIES = [
+    '',
+    'skill=python',
+    'skill=python&skill=django',
+    'location=Berlin',
+    'q=senior',
+    'q=backend engineer&skill=aws',
+    'q=rust&location=Remote&skill=docker',
+]
+SKILLS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'Kubernetes', 'Go', 'Rust', 'SQL', 'Java',
+          'TypeScript', 'Terraform', 'Figma', 'Excel', 'Salesforce', 'Swift', 'Kotlin', 'PHP', 'C#', 'Spark']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark employer candidate search (results page + facet counts) at several resume counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query')
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _populate(self, rng, start, stop):
+        Link = Resume.skill_set.through
+        for offset in range(start, stop, 5000):
+            count = min(5000, stop - offset)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=f'seeker{offset + i}', role='job_seeker') for i in range(count)
+                ])
+                hidden = {user.id for user in users if rng.random() < 0.1}
+                UserProfile.objects.bulk_create([
+                    UserProfile(user=user, profile_visibility=False) for user in users if user.id in hidden
+                ])
+                resumes = []
+                for user in users:
+                    address = f'{rng.randint(1, 999)} Main St, {rng.choice(CITIES)}'
+                    resumes.append(Resume(
+                        user=user, full_name=user.username, email=f'{user.username}@example.com', phone='1',
+                        address=address, location=location_key(address), searchable=user.id not in hidden,
+                        skills=rng.sample(SKILLS, rng.randint(2, 8)),
+                        summary=' '.join(rng.choices(FILLER, k=30) + rng.sample(WORDS, 3)),
+                        work_experience=' '.join(rng.choices(FILLER, k=80) + rng.sample(WORDS, 5)),
+                    ))
+                Resume.objects.bulk_create(resumes)
+                names = {}
+                for resume in resumes:
+                    names.update(normalized(resume.skills))
+                ids = get_or_create_skills(names)
+                Link.objects.bulk_create([
+                    Link(resume_id=resume.id, skill_id=ids[name])
+                    for resume in resumes for name in normalized(resume.skills)
+                ])
+
+    def _run(self, options):
+        rng = random.Random(42)
+        populated = 0
+        for size in options['sizes']:
+            started = time.perf_counter()
+            self._populate(rng, populated, size)
+            populated = size
+            load_time = time.perf_counter() - started
+
+            self.stdout.write(f'{size} resumes (generated in {load_time:.1f}s)')
+            for query in QUERIES:
+                filters = clean_filters(QueryDict(query))
+                cold, warm, queries = [], [], 0
+                for _ in range(options['runs']):
+                    facets.invalidate(FACET_NAMESPACE)
+                    for samples in (cold, warm):
+                        started = time.perf_counter()
+                        with CaptureQueriesContext(connection) as captured:
+                            resumes = search_candidates(filters).select_related('user')
+                            list(resumes.order_by('-updated_at', '-id')[:PAGE_SIZE + 1])
+                            candidate_facets(filters, resumes)
+                        samples.append(time.perf_counter() - started)
+                        queries = queries or len(captured)
+                self.stdout.write(
+                    f'  {query or "(no filters)":<40} facets computed p50={statistics.median(cold) * 1000:8.2f} ms '
+                    f'p99={_percentile(cold, 99) * 1000:8.2f} ms ({queries} queries)   '
+                    f'facets cached p50={statistics.median(warm) * 1000:7.2f} ms p99={_percentile(warm, 99) * 1000:7.2f} ms'
+                )
@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_resume.pdf_text import extract_text
+from job_resume.resume_pdf import TEMPLATE_STYLES, render_pdf
+
+SAMPLE = {
+    'name': 'Bench', 'full_name': 'Jordan Example', 'email': 'jordan@example.com',
+    'phone': '+1 555 0100', 'address': 'Berlin', 'linkedin': '', 'github': '',
+    'summary': 'Backend engineer with a focus on data-heavy web applications. ' * 6,
+    'skills': ['Python', 'Django', 'PostgreSQL', 'Redis', 'Docker'],
+    'work_experience': 'Senior Engineer, Acme (2020 - Present)\nBuilt and ran the search platform.\n' * 15,
+    'education': 'BSc Computer Science\n', 'projects': 'Open-source work.\n' * 5, 'certifications': '',
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure CV text extraction throughput (PDFs/sec) for 1..N worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=400, help='Number of PDFs to extract per run')
+        parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            templates = list(TEMPLATE_STYLES)
+            for index in range(options['count']):
+                payload = dict(SAMPLE, template_type=templates[index % len(templates)])
+                path = os.path.join(directory, f'{index}.pdf')
+                with open(path, 'wb') as handle:
+                    handle.write(render_pdf(payload))
+                paths.append(path)
+
+            processes = 1
+            while processes <= options['max_processes']:
+                started = time.perf_counter()
+                if processes == 1:
+                    for path in paths:
+                        extract_text(path)
+                else:
+                    with multiprocessing.Pool(processes) as pool:
+                        pool.map(extract_text, paths, chunksize=max(1, len(paths) // (processes * 4)))
+                elapsed = time.perf_counter() - started
+                rate = len(paths) / elapsed
+                self.stdout.write(
+                    f'{processes:>3} process(es): {rate:8.1f} PDFs/s  ({rate / processes:7.1f} per core)'
+                )
+                processes *= 2
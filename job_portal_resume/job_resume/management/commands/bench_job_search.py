@@ -0,0 +1,106 @@
+import importlib
+import random
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_resume.search import FTS_TABLE, build_match_expression, rank_sql
+
+# Runs against a private in-memory SQLite database using the same FTS schema
+# and triggers as migration 0006, so it never touches the project database.
+
+WORDS = (
+    'python django react senior junior backend frontend engineer developer '
+    'data analyst manager designer devops cloud aws kubernetes remote hybrid '
+    'marketing sales support finance accountant nurse teacher writer product '
+    'mobile android ios golang rust java scala security network qa testing'
+).split()
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka']
+CITIES = ['Dhaka', 'Berlin', 'London', 'Toronto', 'Austin', 'Remote', 'Singapore', 'Lagos']
+QUERIES = ['python', 'senior django', 'react remote', 'dev', 'cloud aws engineer', 'nurse berlin', 'kub']
+# Descriptions are mostly filler drawn from a larger vocabulary so that domain
+# terms stay selective, as they are in real postings.
+FILLER = [f'lorem{i}' for i in range(20000)]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FTS5 job search against the old icontains scan at several table sizes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000, 1000000])
+        parser.add_argument('--runs', type=int, default=50, help='Timed runs per query')
+        parser.add_argument('--limit', type=int, default=20, help='Rows fetched per search (one page)')
+        parser.add_argument('--skip-like', action='store_true', help='Do not time the LIKE baseline')
+
+    def handle(self, *args, **options):
+        migration = importlib.import_module('job_resume.migrations.0006_job_fts')
+        rng = random.Random(42)
+        for size in options['sizes']:
+            conn = sqlite3.connect(':memory:')
+            conn.execute(
+                'CREATE TABLE job_resume_job (id INTEGER PRIMARY KEY, title TEXT, company TEXT, '
+                'location TEXT, description TEXT, status TEXT, created_at TEXT)'
+            )
+            for sql in migration.CREATE_SQL:
+                conn.execute(sql)
+
+            started = time.perf_counter()
+            rows = (
+                (
+                    ' '.join(rng.sample(WORDS, 3)),
+                    rng.choice(COMPANIES),
+                    rng.choice(CITIES),
+                    ' '.join(rng.choices(FILLER, k=76) + rng.sample(WORDS, 4)),
+                    'approved' if rng.random() < 0.8 else 'pending',
+                    f'2025-01-01 00:00:{i % 60:02d}',
+                )
+                for i in range(size)
+            )
+            conn.executemany(
+                'INSERT INTO job_resume_job (title, company, location, description, status, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+            conn.commit()
+            load_time = time.perf_counter() - started
+
+            fts_sql = (
+                f'SELECT j.id FROM job_resume_job j JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = j.id '
+                f"WHERE {FTS_TABLE} MATCH ? AND j.status = 'approved' "
+                f'ORDER BY {rank_sql()} LIMIT ?'
+            )
+            like_sql = (
+                "SELECT id FROM job_resume_job WHERE status = 'approved' AND "
+                '(title LIKE ? OR description LIKE ? OR company LIKE ? OR location LIKE ?) '
+                'ORDER BY created_at DESC LIMIT ?'
+            )
+
+            fts_samples, like_samples = [], []
+            for _ in range(options['runs']):
+                for query in QUERIES:
+                    started = time.perf_counter()
+                    conn.execute(fts_sql, (build_match_expression(query), options['limit'])).fetchall()
+                    fts_samples.append(time.perf_counter() - started)
+                    if not options['skip_like']:
+                        pattern = f'%{query}%'
+                        started = time.perf_counter()
+                        conn.execute(like_sql, (pattern,) * 4 + (options['limit'],)).fetchall()
+                        like_samples.append(time.perf_counter() - started)
+            conn.close()
+
+            self.stdout.write(f'{size} jobs (loaded + indexed in {load_time:.1f}s)')
+            for label, samples in (('fts5', fts_samples), ('icontains', like_samples)):
+                if not samples:
+                    continue
+                self.stdout.write(
+                    f'  {label:<10} p50={statistics.median(samples) * 1000:8.2f} ms  '
+                    f'p99={_percentile(samples, 99) * 1000:8.2f} ms'
+                )
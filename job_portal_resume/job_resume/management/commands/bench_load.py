@@ -0,0 +1,320 @@
+import http.cookiejar
+import json
+import re
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone as django_timezone
+
+from job_resume.management.commands.bench_job_search import _percentile
+from job_resume.models import Application, Job, User
+from job_resume.synthetic import PASSWORD, generate
+from job_resume.urls import app_name, urlpatterns
+
+# End-to-end load benchmark: requests every URL in job_resume/urls.py as an
+# anonymous visitor and as each role, either in-process through the Django
+# test client or over HTTP against a running server (--base-url, e.g. a
+# local gunicorn pointed at the same database), and writes throughput and
+# latency percentiles per endpoint and role to a JSON file. Pass --compare
+# with an earlier file to print the change in p95.
+#
+# Data comes from `manage.py generate_data`; --test-db instead generates it
+# into a throwaway test database (test client only). GET requests that
+# change data (logging out, approving, deleting) are not benchmarked.
+#
+# --conditional replays the requests the way a browser revalidates: each
+# session sends back the last ETag it got for a path, and every
+# --touch-every requests the sample job is touched so cached pages go stale
+# now and then. Results then include the share of 304 responses; cpu_ms is
+# the CPU time of this process per request, which covers the server too when
+# the test client is used.
+
+ROLES = [None, 'job_seeker', 'employer', 'admin']
+UNSAFE = {'logout', 'approve_job', 'reject_job', 'delete_job', 'delete_user'}
+# Sample object used for each URL keyword argument; apply_job needs a job the
+# seeker has not applied to yet
+KWARG_SOURCES = {'job_id': 'job', 'application_id': 'application', 'resume_id': 'resume', 'user_id': 'seeker'}
+URL_SOURCES = {'apply_job': {'job_id': 'open_job'}}
+# Extra query strings benchmarked alongside the plain URL
+VARIANTS = {
+    'job_list': ['q=python', 'location=Berlin', 'salary=60k-100k'],
+    'candidate_search': ['skill=python', 'q=cloud&location=London'],
+    'job_applications': ['sort=score'],
+}
+
+_CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def _pick_user(users, prefix):
+    users = users.filter(is_active=True).order_by('id')
+    return users.filter(username__startswith=prefix).first() or users.first()
+
+
+def sample_objects(prefix):
+    seeker = _pick_user(User.objects.filter(role='job_seeker', resumes__isnull=False).distinct(), prefix)
+    applications = (
+        Application.objects.filter(job__status='approved', job__posted_by__role='employer')
+        .select_related('job__posted_by').order_by('id')
+    )
+    application = applications.filter(job__posted_by__username__startswith=prefix).first() or applications.first()
+    if seeker is None or application is None:
+        raise CommandError('Not enough data to benchmark; run `manage.py generate_data` first.')
+    return {
+        'job_seeker': seeker,
+        'employer': application.job.posted_by,
+        'admin': _pick_user(User.objects.filter(role='admin'), prefix),
+        'seeker': seeker,
+        'job': application.job,
+        'open_job': Job.objects.filter(status='approved').exclude(applications__user=seeker).order_by('-id').first(),
+        'application': application,
+        'resume': seeker.resumes.order_by('id').first(),
+    }
+
+
+def endpoints(data):
+    """``[(url name, path), ...]`` for every safe URL, with its query variants."""
+    found = []
+    for pattern in urlpatterns:
+        name = pattern.name
+        if name in UNSAFE:
+            continue
+        sources = {**KWARG_SOURCES, **URL_SOURCES.get(name, {})}
+        kwargs = {key: data[sources[key]].pk for key in pattern.pattern.converters}
+        path = reverse(f'{app_name}:{name}', kwargs=kwargs)
+        found.append((name, path))
+        found.extend((name, f'{path}?{query}') for query in VARIANTS.get(name, []))
+    return found
+
+
+def _compare_key(result):
+    # Object ids differ between data sets; the URL name and query do not
+    return result['url_name'], result['path'].partition('?')[2], result['role']
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class TestClientSession:
+
+    def __init__(self, user, conditional=False):
+        self.client = Client(raise_request_exception=False)
+        self.etags = {} if conditional else None
+        if user is not None:
+            self.client.force_login(user)
+
+    def get(self, path):
+        headers = {}
+        if self.etags is not None and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+        response = self.client.get(path, headers=headers)
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)
+        if self.etags is not None and response.has_header('ETag'):
+            self.etags[path] = response['ETag']
+        return response.status_code
+
+
+class HTTPSession:
+
+    def __init__(self, base_url, user, password, conditional=False):
+        self.base_url = base_url.rstrip('/')
+        self.etags = {} if conditional else None
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect,
+        )
+        if user is not None:
+            self.login(user.username, password)
+
+    def login(self, username, password):
+        login_url = self.base_url + reverse(f'{app_name}:login')
+        with self.opener.open(login_url) as response:
+            token = _CSRF_RE.search(response.read().decode())
+        body = urllib.parse.urlencode({
+            'username': username, 'password': password, 'csrfmiddlewaretoken': token.group(1) if token else '',
+        }).encode()
+        request = urllib.request.Request(login_url, data=body, headers={'Referer': login_url})
+        if self.get_request(request)[0] != 302:
+            raise CommandError(f'Could not log in to {self.base_url} as {username}.')
+
+    def get_request(self, request):
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                return response.status, response.headers
+        except urllib.error.HTTPError as error:
+            return error.code, error.headers
+
+    def get(self, path):
+        request = urllib.request.Request(self.base_url + path)
+        if self.etags is not None and path in self.etags:
+            request.add_header('If-None-Match', self.etags[path])
+        status, headers = self.get_request(request)
+        if self.etags is not None and headers.get('ETag'):
+            self.etags[path] = headers['ETag']
+        return status
+
+
+def run_endpoint(session, path, requests, warmup, concurrency, touch=None, touch_every=0):
+    for _ in range(warmup):
+        session.get(path)
+
+    def timed(i):
+        if touch and touch_every and i % touch_every == touch_every - 1:
+            touch()
+        started = time.perf_counter()
+        status = session.get(path)
+        return status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(timed, range(requests)))
+    else:
+        samples = [timed(i) for i in range(requests)]
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    latencies = [duration for status, duration in samples]
+    statuses = {}
+    for status, duration in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': requests,
+        'errors': sum(1 for status, duration in samples if status >= 500),
+        'status_codes': statuses,
+        'not_modified': round(statuses.get('304', 0) / requests, 3),
+        'cpu_ms': round(cpu / requests * 1000, 2),
+        'throughput_rps': round(requests / elapsed, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every job_resume URL as each role and write per-endpoint throughput and latency to JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint and role')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint and role')
+        parser.add_argument('--base-url', help='Benchmark a running server (e.g. http://127.0.0.1:8000) over HTTP')
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel requests (--base-url only)')
+        parser.add_argument('--password', default=PASSWORD, help='Password of the benchmark users (--base-url only)')
+        parser.add_argument('--prefix', default='synth', help='Prefer users generated with this username prefix')
+        parser.add_argument('--roles', nargs='+', choices=['anonymous'] + ROLES[1:],
+                            default=['anonymous'] + ROLES[1:])
+        parser.add_argument('--only', nargs='+', metavar='URL_NAME', help='Benchmark only these URL names')
+        parser.add_argument('--conditional', action='store_true',
+                            help='Revalidate with If-None-Match like a browser and report the share of 304s')
+        parser.add_argument('--touch-every', type=int, default=10,
+                            help='With --conditional, touch the sample job every N requests (0 never)')
+        parser.add_argument('--test-db', action='store_true',
+                            help='Generate data into a throwaway test database and benchmark that')
+        parser.add_argument('--users', type=int, default=1000, help='Users to generate with --test-db')
+        parser.add_argument('--jobs', type=int, default=10000, help='Jobs to generate with --test-db')
+        parser.add_argument('--applications', type=int, default=50000, help='Applications to generate with --test-db')
+        parser.add_argument('--output', default='load_benchmark.json')
+        parser.add_argument('--compare', help='Earlier output file to compare p95 latencies against')
+
+    def handle(self, *args, **options):
+        if options['base_url'] and options['test_db']:
+            raise CommandError('--test-db cannot be combined with --base-url; the server would not see it.')
+        if options['concurrency'] > 1 and not options['base_url']:
+            raise CommandError('--concurrency needs --base-url; the test client runs requests one at a time.')
+
+        if not options['test_db']:
+            report = self._run(options)
+        else:
+            old_name = connection.creation.create_test_db(verbosity=0)
+            try:
+                generate(users=options['users'], jobs=options['jobs'], applications=options['applications'],
+                         prefix=options['prefix'], log=self.stdout.write)
+                report = self._run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(report["results"])} results to {options["output"]}'))
+        if options['compare']:
+            self._compare(report, options['compare'])
+
+    def _run(self, options):
+        data = sample_objects(options['prefix'])
+        found = [(name, path) for name, path in endpoints(data) if not options['only'] or name in options['only']]
+        report = {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'target': options['base_url'] or 'test-client',
+            'concurrency': options['concurrency'],
+            'conditional': options['conditional'],
+            'rows': {
+                'users': User.objects.count(), 'jobs': Job.objects.count(),
+                'applications': Application.objects.count(),
+            },
+            'results': [],
+        }
+        job_id = data['job'].pk
+
+        def touch():
+            Job.objects.filter(pk=job_id).update(updated_at=django_timezone.now())
+
+        conditional = options['conditional']
+        self.stdout.write(f'{"endpoint":<55} {"role":<10} {"status":<12} {"req/s":>8} '
+                          f'{"p50":>8} {"p95":>8} {"p99":>8} {"cpu":>8}')
+        for role in options['roles']:
+            user = None if role == 'anonymous' else data[role]
+            if options['base_url']:
+                session = HTTPSession(options['base_url'], user, options['password'], conditional)
+            else:
+                session = TestClientSession(user, conditional)
+            for name, path in found:
+                result = {'url_name': name, 'path': path, 'role': role}
+                result.update(run_endpoint(session, path, options['requests'], options['warmup'],
+                                           options['concurrency'], touch if conditional else None,
+                                           options['touch_every']))
+                report['results'].append(result)
+                statuses = ','.join(sorted(result['status_codes']))
+                line = (f'{path:<55} {role:<10} {statuses:<12} {result["throughput_rps"]:>8.1f} '
+                        f'{result["p50_ms"]:>8.1f} {result["p95_ms"]:>8.1f} {result["p99_ms"]:>8.1f} '
+                        f'{result["cpu_ms"]:>8.1f}')
+                self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+        if conditional and report['results']:
+            total = sum(r['requests'] for r in report['results'])
+            not_modified = sum(r['status_codes'].get('304', 0) for r in report['results'])
+            self.stdout.write(f'{not_modified} of {total} requests ({not_modified / total:.0%}) answered 304')
+        return report
+
+    def _compare(self, report, path):
+        with open(path) as previous_file:
+            previous = {_compare_key(r): r for r in json.load(previous_file)['results']}
+        self.stdout.write(f'p95 change against {path}:')
+        cpu_before = cpu_after = 0
+        for result in report['results']:
+            before = previous.get(_compare_key(result))
+            if before is None or not before['p95_ms']:
+                continue
+            change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            line = (f'{result["path"]:<55} {result["role"]:<10} {before["p95_ms"]:>8.1f} -> '
+                    f'{result["p95_ms"]:>8.1f} ms ({change:+.0f}%)')
+            self.stdout.write(self.style.WARNING(line) if change > 20 else line)
+            if 'cpu_ms' in before:
+                cpu_before += before['cpu_ms'] * before['requests']
+                cpu_after += result['cpu_ms'] * result['requests']
+        if cpu_before:
+            self.stdout.write(f'CPU time: {cpu_before:.0f} -> {cpu_after:.0f} ms '
+                              f'({(cpu_after - cpu_before) / cpu_before * 100:+.0f}%)')
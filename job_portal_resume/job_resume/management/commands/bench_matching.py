@@ -0,0 +1,66 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_resume.management.commands.bench_job_search import FILLER, WORDS, _percentile
+from job_resume.matching import MatchIndex, term_frequencies
+
+# Builds a private MatchIndex from synthetic postings; the database is not
+# touched. Skills are drawn from a skewed distribution so that popular ones
+# (python, sql, ...) have long postings lists, as on a real board.
+
+SKILLS = WORDS + [f'skill{i}' for i in range(2000)]
+COMMON = 'experience team work strong skills years environment develop support'.split()
+
+
+def _skill(rng):
+    return SKILLS[min(len(SKILLS) - 1, int(rng.paretovariate(1.1)) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark top-k job recommendations for one resume against N approved jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        for size in options['sizes']:
+            started = time.perf_counter()
+            index = MatchIndex()
+            index.build(
+                (job_id, term_frequencies([
+                    (' '.join(_skill(rng) for _ in range(3)), 3.0),
+                    (' '.join(rng.choices(FILLER, k=60) + COMMON + [_skill(rng) for _ in range(8)]), 1.0),
+                ]))
+                for job_id in range(size)
+            )
+            build_time = time.perf_counter() - started
+
+            resumes = [
+                term_frequencies([
+                    (' '.join(_skill(rng) for _ in range(12)), 3.0),
+                    (' '.join(rng.choices(FILLER, k=80) + COMMON), 1.0),
+                ])
+                for _ in range(options['queries'])
+            ]
+            samples = []
+            for terms in resumes:
+                started = time.perf_counter()
+                index.top_k(terms, k=options['k'])
+                samples.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for job_id in range(100):
+                index.add(size + job_id, resumes[job_id % len(resumes)])
+            add_time = (time.perf_counter() - started) / 100
+
+            self.stdout.write(f'{size} jobs (index built in {build_time:.1f}s, {len(index.postings)} terms)')
+            self.stdout.write(
+                f'  top-{options["k"]}  p50={statistics.median(samples) * 1000:8.2f} ms  '
+                f'p99={_percentile(samples, 99) * 1000:8.2f} ms   incremental add {add_time * 1000:.2f} ms'
+            )
@@ -0,0 +1,62 @@
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from job_resume.resume_pdf import TEMPLATE_STYLES, get_resume_pdf, render_pdf, resume_payload
+from job_resume.models import Resume
+
+EXPERIENCE = (
+    'Senior Software Engineer, Acme Corp (2021 - Present)\n'
+    'Led the migration of a monolith to services, cutting p99 latency by 40%. '
+    'Mentored five engineers and owned the hiring pipeline for the platform team.\n\n'
+    'Software Engineer, Globex (2017 - 2021)\n'
+    'Built billing and reporting features in Django and PostgreSQL used by 2M customers.\n'
+)
+
+
+def _resume(template_type, index):
+    # Unsaved instance; only its field values are used
+    return Resume(
+        id=index, template_type=template_type, name=f'Bench {index}',
+        full_name='Jordan Example', email='jordan@example.com', phone='+1 555 0100',
+        address='Berlin, Germany', linkedin='https://linkedin.com/in/jordan',
+        github='https://github.com/jordan', summary='Backend engineer. ' * 20,
+        skills=['Python', 'Django', 'PostgreSQL', 'Redis', 'Docker', 'AWS', f'Skill{index}'],
+        work_experience=EXPERIENCE * 3, education='BSc Computer Science (2013 - 2017)\n' * 2,
+        projects='Open-source contributor to several Django packages.\n' * 4,
+        certifications='AWS Certified Solutions Architect\n',
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cold server-side resume PDF renders against cached downloads for each template.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Distinct resumes per template')
+        parser.add_argument('--workers', type=int, default=0, help='Render process pool size (0 = inline)')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        with tempfile.TemporaryDirectory() as cache, \
+                override_settings(RESUME_PDF_CACHE_DIR=cache, RESUME_PDF_WORKERS=options['workers']):
+            for template_type in TEMPLATE_STYLES:
+                resumes = [_resume(template_type, index) for index in range(count)]
+
+                started = time.perf_counter()
+                size = len(render_pdf(resume_payload(resumes[0])))
+                for resume in resumes:
+                    get_resume_pdf(resume)
+                cold = time.perf_counter() - started
+
+                started = time.perf_counter()
+                for resume in resumes:
+                    with open(get_resume_pdf(resume), 'rb') as pdf:
+                        pdf.read()
+                warm = time.perf_counter() - started
+
+                self.stdout.write(
+                    f'{template_type:<10} {size / 1024:5.1f} KiB  '
+                    f'cold {count / cold:8.1f} pdf/s   cached {count / warm:9.1f} pdf/s'
+                )
@@ -0,0 +1,108 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from job_resume.management.commands.bench_load import sample_objects
+
+# Startup benchmark: starts fresh processes that load the WSGI application
+# the way a server worker does, with and without DJANGO_WARMUP (see
+# job_resume/warmup.py), and reports how long each took to be ready and how
+# long its first and second request to each page took. The difference
+# between the first and second request is the per-process cost the warm-up
+# moves out of the request path.
+#
+# Each process runs this command with --child and the settings module of
+# the parent, so run it under the settings you deploy with, e.g.
+# DJANGO_SETTINGS_MODULE=job_portal_resume.settings_production, against a
+# database filled by `manage.py generate_data`.
+
+MODES = {'cold': '0', 'warm': '1'}
+# (url name, sample object for the job_id argument, logged in)
+PAGES = [
+    ('login', None, False),
+    ('home', None, True),
+    ('job_list', None, True),
+    ('job_detail', 'job', True),
+    ('api_job_list', None, False),
+]
+
+
+def _measure(client, path):
+    started = time.perf_counter()
+    response = client.get(path)
+    elapsed = time.perf_counter() - started
+    if response.status_code != 200:
+        raise CommandError(f'{path} returned {response.status_code}')
+    return elapsed
+
+
+class Command(BaseCommand):
+    help = 'Measure process startup time and first-request latency with and without the warm-up.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=5, help='Processes to start per mode')
+        parser.add_argument('--prefix', default='synth', help='Username prefix of the generated users')
+        parser.add_argument('--child', action='store_true', help='Internal: run one measured process')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self._child(options)
+            return
+
+        results = {mode: [] for mode in MODES}
+        for round_number in range(options['rounds']):
+            for mode, flag in MODES.items():
+                results[mode].append(self._spawn(flag, options))
+            self.stdout.write(f'round {round_number + 1}/{options["rounds"]} done')
+
+        for mode, runs in results.items():
+            ready = statistics.median(run['ready'] for run in runs)
+            first_total = statistics.median(sum(run['first'].values()) for run in runs)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'\n{mode}: ready in {ready * 1000:.0f} ms, first requests {first_total * 1000:.0f} ms in total'
+            ))
+            for name, job, logged_in in PAGES:
+                first = statistics.median(run['first'][name] for run in runs)
+                second = statistics.median(run['second'][name] for run in runs)
+                self.stdout.write(f'  {name:<14} first={first * 1000:7.1f} ms  second={second * 1000:7.1f} ms')
+
+    def _spawn(self, flag, options):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+            'DJANGO_WARMUP': flag,
+            'BENCH_STARTED': repr(time.time()),
+        }
+        command = [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'bench_startup', '--child',
+                   '--prefix', options['prefix']]
+        finished = subprocess.run(command, env=env, capture_output=True, text=True)
+        if finished.returncode:
+            raise CommandError(f'Child process failed:\n{finished.stderr}')
+        return json.loads(finished.stdout.splitlines()[-1])
+
+    def _child(self, options):
+        # manage.py has already set Django up; importing the WSGI module is
+        # what a server adds on top, including the warm-up when enabled
+        from job_portal_resume.wsgi import application  # noqa: F401
+
+        ready = time.time() - float(os.environ['BENCH_STARTED'])
+        data = sample_objects(options['prefix'])
+        host = next((host for host in settings.ALLOWED_HOSTS if '*' not in host), 'testserver').lstrip('.')
+        anonymous, seeker = Client(SERVER_NAME=host), Client(SERVER_NAME=host)
+        seeker.force_login(data['job_seeker'])
+
+        report = {'ready': ready, 'first': {}, 'second': {}}
+        for name, job, logged_in in PAGES:
+            path = reverse(f'job_resume:{name}', args=[data[job].pk] if job else [])
+            client = seeker if logged_in else anonymous
+            report['first'][name] = _measure(client, path)
+            report['second'][name] = _measure(client, path)
+        self.stdout.write(json.dumps(report))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from job_resume.query_budgets import check_urls
+
+# Runs against a throwaway test database, created and destroyed by the
+# command like `manage.py test` does.
+
+
+class Command(BaseCommand):
+    help = 'Request every job_resume URL and check its SQL query count against the per-view budget.'
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            results = check_urls()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        failed = 0
+        for result in results:
+            line = (f'{result.view_name:<45} {str(result.status or "-"):>4} '
+                    f'{result.count:>3}/{result.budget:<3} {result.duration * 1000:7.1f} ms')
+            if result.ok:
+                self.stdout.write(line)
+                continue
+            failed += 1
+            self.stdout.write(self.style.ERROR(f'{line}  {result.error}'))
+            for sql, times in result.repeated:
+                self.stdout.write(f'    {times}x {sql[:160]}')
+        if failed:
+            raise CommandError(f'{failed} view(s) over budget or failing.')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} views within their query budgets.'))
@@ -0,0 +1,91 @@
+import os
+import re
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from job_resume.models import StoredFile
+from job_resume.storage import tracked_fields, blob_name_for, blob_storage
+
+BLOB_NAME_RE = re.compile(r'^(?:.+/)?[0-9a-f]{2}/[0-9a-f]{64}(?:\.\w+)?$')
+
+
+class Command(BaseCommand):
+    help = ('Move existing CV and profile picture uploads into content-addressed storage, '
+            'removing duplicate copies, and rebuild the blob reference counts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change without touching anything')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = blob_storage()
+        moved = removed = missing = 0
+        bytes_saved = 0
+
+        for model, field in tracked_fields().items():
+            directory = model._meta.get_field(field).upload_to.rstrip('/')
+            names = (
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .order_by().values_list(field, flat=True).distinct()
+            )
+            for name in names.iterator():
+                if BLOB_NAME_RE.match(name):
+                    continue
+                if not storage.exists(name):
+                    missing += 1
+                    self.stderr.write(f'Missing file for {model.__name__}.{field}: {name}')
+                    continue
+
+                path = storage.path(name)
+                blob_name = blob_name_for(path, directory)
+                if storage.exists(blob_name):
+                    bytes_saved += os.path.getsize(path)
+                    removed += 1
+                    action = 'duplicate of'
+                else:
+                    moved += 1
+                    action = 'move to'
+                self.stdout.write(f'{name}: {action} {blob_name}')
+                if dry_run:
+                    continue
+
+                with transaction.atomic():
+                    # queryset.update() skips the reference-count signals;
+                    # the counts are rebuilt from scratch below.
+                    model.objects.filter(**{field: name}).update(**{field: blob_name})
+                    if action == 'move to':
+                        blob_path = storage.path(blob_name)
+                        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                        os.replace(path, blob_path)
+                    else:
+                        os.unlink(path)
+
+        if not dry_run:
+            self._rebuild_reference_counts(storage)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{moved} file(s) moved, {removed} duplicate(s) removed '
+            f'({bytes_saved / 1024 / 1024:.1f} MiB saved), {missing} missing.'
+        ))
+
+    def _rebuild_reference_counts(self, storage):
+        counts = {}
+        for model, field in tracked_fields().items():
+            rows = (
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .order_by().values(field).annotate(total=Count('pk'))
+            )
+            for row in rows:
+                counts[row[field]] = counts.get(row[field], 0) + row['total']
+
+        with transaction.atomic():
+            StoredFile.objects.all().delete()
+            StoredFile.objects.bulk_create(
+                [
+                    StoredFile(name=name, ref_count=total, size=storage.size(name) if storage.exists(name) else 0)
+                    for name, total in counts.items()
+                ],
+                batch_size=1000,
+            )
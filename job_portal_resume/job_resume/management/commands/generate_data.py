@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from job_resume.synthetic import PASSWORD, generate
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with synthetic users, profiles, resumes, jobs and applications for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users across all roles (85%% job seekers)')
+        parser.add_argument('--jobs', type=int, default=10000)
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='synth', help='Username prefix of the generated users')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        generate(
+            users=options['users'], jobs=options['jobs'], applications=options['applications'],
+            seed=options['seed'], batch_size=options['batch_size'], prefix=options['prefix'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Done in {time.perf_counter() - started:.1f}s. '
+            f'Generated users log in with the password "{PASSWORD}".'
+        ))
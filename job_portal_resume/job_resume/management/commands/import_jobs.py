@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from job_resume.imports import IMPORT_BATCH_SIZE, ImportFileError, detect_format, import_jobs
+from job_resume.models import User
+
+
+def _chunks(path, size=64 * 1024):
+    with open(path, 'rb') as source:
+        while chunk := source.read(size):
+            yield chunk
+
+
+class Command(BaseCommand):
+    help = 'Import jobs for an employer from a CSV or JSON Lines file; invalid rows are reported and skipped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--employer', required=True, help='Username of the employer posting the jobs')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        employer = User.objects.filter(username=options['employer'], role='employer').first()
+        if employer is None:
+            raise CommandError(f'No employer named "{options["employer"]}".')
+        started = time.perf_counter()
+        try:
+            file_format = options['format'] or detect_format(options['path'])
+            result = import_jobs(_chunks(options['path']), file_format, employer, options['batch_size'])
+        except (ImportFileError, OSError) as error:
+            raise CommandError(str(error))
+
+        for line, message in result.errors:
+            self.stdout.write(self.style.ERROR(f'line {line or "-"}: {message}'))
+        if result.failed > len(result.errors):
+            self.stdout.write(f'... and {result.failed - len(result.errors)} more')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} jobs, rejected {result.failed} rows '
+            f'in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from job_resume.resume_pdf import cache_dir, prune_cache
+
+
+class Command(BaseCommand):
+    help = 'Delete cached resume PDFs that are expired or over the cache size limit (see job_resume/resume_pdf.py).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-bytes', type=int, help='Size limit (default: RESUME_PDF_CACHE_MAX_BYTES)')
+        parser.add_argument('--max-age', type=int, help='Age limit in seconds (default: RESUME_PDF_CACHE_MAX_AGE)')
+
+    def handle(self, *args, **options):
+        removed = prune_cache(options['max_bytes'], options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} cached PDF(s) from {cache_dir()}.'))
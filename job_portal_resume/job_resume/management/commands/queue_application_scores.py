@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from job_resume import tasks
+from job_resume.models import Application
+
+
+class Command(BaseCommand):
+    help = 'Queue match scoring for every job with unscored or stale applications (see run_worker).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rescore every job that has applications')
+
+    def handle(self, *args, **options):
+        applications = Application.objects.all()
+        if options['all']:
+            applications.update(match_scored_at=None)
+        applications = applications.filter(match_scored_at__isnull=True)
+        job_ids = applications.values_list('job_id', flat=True).distinct().order_by('job_id')
+        queued = sum(1 for job_id in job_ids.iterator() if tasks.enqueue_once(tasks.SCORE_APPLICATIONS, job_id))
+        self.stdout.write(self.style.SUCCESS(f'Queued scoring for {queued} job(s).'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from job_resume.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search indexes (job postings, CV text, resumes) from their tables.'
+
+    def handle(self, *args, **options):
+        if rebuild_index():
+            self.stdout.write(self.style.SUCCESS('Search indexes rebuilt.'))
+        else:
+            self.stdout.write('Full-text index is only used on SQLite; nothing to do.')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.forms.models import model_to_dict
+
+from job_resume.counters import get_counters, recount
+
+
+class Command(BaseCommand):
+    help = 'Recount users, jobs and applications and correct any drift in the dashboard counters.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            before = model_to_dict(get_counters())
+            after = model_to_dict(recount())
+        drift = {
+            column: after[column] - before[column]
+            for column in after
+            if column != 'id' and after[column] != before[column]
+        }
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Counters are accurate.'))
+            return
+        for column, delta in sorted(drift.items()):
+            self.stdout.write(f'{column}: {before[column]} -> {after[column]} ({delta:+d})')
+        self.stdout.write(self.style.SUCCESS(f'Corrected {len(drift)} counter(s).'))
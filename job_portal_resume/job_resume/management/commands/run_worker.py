@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from job_resume import tasks
+
+
+def _work(options, stop_event):
+    # Connections inherited from the parent must not be shared across processes
+    connections.close_all()
+    while not stop_event.is_set():
+        claimed = tasks.run_batch(
+            options['batch_size'], kinds=options['kind'] or None,
+            max_attempts=options['max_attempts'], backoff=options['backoff'],
+        )
+        if claimed:
+            continue
+        if options['once']:
+            break
+        stop_event.wait(options['poll_interval'])
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Process queued background tasks (CV text extraction, ...) with a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--max-attempts', type=int, default=tasks.MAX_ATTEMPTS)
+        parser.add_argument('--backoff', type=int, default=tasks.BACKOFF_SECONDS,
+                            help='Base retry delay in seconds, doubled after each failed attempt')
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument('--kind', action='append', help='Only run tasks of this kind (repeatable)')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        requeued = tasks.requeue_stale()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale task(s).')
+
+        stop_event = multiprocessing.Event()
+        if options['processes'] <= 1:
+            try:
+                _work(options, stop_event)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_work, args=(options, stop_event), name=f'worker-{index}')
+            for index in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f'Started {len(workers)} worker process(es).')
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        started = time.monotonic()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(f'Workers stopped after {time.monotonic() - started:.1f}s.')
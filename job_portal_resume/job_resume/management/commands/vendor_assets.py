@@ -0,0 +1,96 @@
+import base64
+import hashlib
+import posixpath
+import re
+import urllib.request
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from job_resume.assets import VENDOR_ASSETS
+
+# Downloads the third-party assets listed in job_resume/assets.py into
+# job_resume/static/ so they are served by us (see assets.py). Files that
+# CSS refers to with url() - Font Awesome's webfonts, the Google Fonts files -
+# are downloaded next to it and the CSS is rewritten to point at them, so
+# collectstatic can fingerprint the whole set. Run it when VENDOR_ASSETS
+# changes and commit the result.
+
+# Google Fonts only serves woff2 to browsers it recognises
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+_URL_RE = re.compile(r'url\(\s*([\'"]?)([^)\'"]+)\1\s*\)')
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def check_integrity(data, integrity):
+    algorithm, expected = integrity.split('-', 1)
+    actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode()
+    return actual == expected
+
+
+class Command(BaseCommand):
+    help = 'Download the third-party CSS, JS and fonts in job_resume/assets.py into job_resume/static/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', metavar='NAME', help='Assets to fetch (default: all)')
+        parser.add_argument('--force', action='store_true', help='Download assets that are already vendored')
+
+    def handle(self, *args, **options):
+        self.root = (Path(apps.get_app_config('job_resume').path) / 'static').resolve()
+        names = options['names'] or list(VENDOR_ASSETS)
+        unknown = [name for name in names if name not in VENDOR_ASSETS]
+        if unknown:
+            raise CommandError(f'Unknown asset(s): {", ".join(unknown)}')
+
+        for name in names:
+            asset = VENDOR_ASSETS[name]
+            target = self.root / asset['path']
+            if target.exists() and not options['force']:
+                self.stdout.write(f'{name}: already vendored')
+                continue
+            data = self._fetch(asset['url'])
+            if 'integrity' in asset and not check_integrity(data, asset['integrity']):
+                raise CommandError(f'{name}: {asset["url"]} does not match its integrity hash')
+            if target.suffix == '.css':
+                data = self._localize(data.decode(), asset['url'], target).encode()
+            self._write(target, data)
+            self.stdout.write(self.style.SUCCESS(f'{name}: {asset["path"]} ({len(data)} bytes)'))
+
+    def _fetch(self, url):
+        try:
+            return fetch(url)
+        except OSError as error:
+            raise CommandError(f'Could not download {url}: {error}')
+
+    def _write(self, path, data):
+        if self.root not in path.resolve().parents:
+            raise CommandError(f'{path} is outside {self.root}')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _localize(self, css, base_url, target):
+        # Download every file the stylesheet refers to and point the CSS at
+        # the local copies
+        def replace(match):
+            ref = match.group(2).strip()
+            if ref.startswith(('data:', '#')):
+                return match.group(0)
+            source = urljoin(base_url, ref)
+            if urlparse(ref).netloc:
+                local = f'files/{posixpath.basename(urlparse(source).path)}'
+            else:
+                local = ref.split('#')[0].split('?')[0]
+            path = (target.parent / local).resolve()
+            if not path.exists():
+                self._write(path, self._fetch(source))
+            return f'url("{local}")'
+
+        return _URL_RE.sub(replace, css)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from job_resume.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Compile templates, load the URLconf and static manifest and prime caches (see job_resume/warmup.py).'
+
+    def handle(self, *args, **options):
+        timings = warm_up(log=self.stdout.write)
+        total = sum(seconds for step, count, seconds in timings)
+        self.stdout.write(self.style.SUCCESS(f'Warmed up in {total * 1000:.0f} ms.'))
@@ -0,0 +1,321 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import Job, Application, Resume
+
+# Resume-to-job matching.
+#
+# Approved jobs are sparse TF-IDF vectors held in an in-process inverted index
+# (term -> {job_id: weight}). Scoring a resume is a single sparse
+# matrix-vector product over the postings of its terms, so the cost depends
+# on the postings touched, not on the number of jobs, and the top k are taken
+# with a heap instead of sorting every score.
+#
+# The index is built on first use and then kept current incrementally: job
+# saves and deletes in this process update it from signals, and changes made
+# by other processes are picked up by re-reading jobs whose updated_at moved
+# since the last sync. Code changing Job.status with queryset.update() must
+# also set updated_at for other processes to notice. Deletes leave no
+# updated_at behind, so each sync also compares the number of approved jobs
+# with the size of the index and, when they differ, diffs the job ids. A
+# worker forked from a process that built the index (gunicorn --preload,
+# max_requests recycling) catches up the same way on its first sync.
+#
+# The same vectors rank a job's applicants: the background worker runs
+# score_applications() when a job, its applications or an applicant's resume
+# change, and stores the result on the row, so employers sort and filter by an
+# indexed column and viewing the list never writes. Only new or outdated
+# applications are scored; the term weights drift as jobs come and go, so
+# scores computed at different times can differ slightly, and editing the job
+# rescores all of them.
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]', re.UNICODE)
+
+STOP_WORDS = frozenset('''
+    a about an and are as at be been but by can for from has have in is it its
+    of on or our that the their this to was we were will with you your
+'''.split())
+
+# Field weights; a term in the title or skills says more than one in prose
+JOB_FIELDS = {'title': 3.0, 'description': 1.0}
+RESUME_FIELDS = {'skills': 3.0, 'summary': 1.0, 'work_experience': 1.0, 'projects': 0.5}
+APPLICANT_FIELDS = {'skills': 3.0, 'summary': 1.0, 'work_experience': 1.0}
+
+# Terms found in more than this share of jobs carry almost no signal but
+# have the longest postings lists, so they are left out of queries.
+MAX_DF = 0.5
+MAX_QUERY_TERMS = 50
+
+# Rebuild from scratch once this share of the index changed incrementally;
+# until then job norms use the IDF of the moment they were added.
+REBUILD_RATIO = 0.2
+
+SYNC_INTERVAL = 5  # seconds between checks for changes made elsewhere
+SYNC_OVERLAP = timedelta(seconds=2)  # transactions committing late
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_frequencies(fields):
+    """``{term: weighted sublinear tf}`` for ``[(text, field_weight), ...]``."""
+    counts = Counter()
+    for text, weight in fields:
+        for token in tokenize(text):
+            counts[token] += weight
+    return {term: 1.0 + math.log(count) if count >= 1 else count for term, count in counts.items()}
+
+
+def job_terms(job):
+    return term_frequencies((getattr(job, field) or '', weight) for field, weight in JOB_FIELDS.items())
+
+
+def resume_terms(resume, weights=RESUME_FIELDS):
+    fields = []
+    for field, weight in weights.items():
+        value = getattr(resume, field) or ''
+        if isinstance(value, list):
+            value = ' '.join(value)
+        fields.append((value, weight))
+    return term_frequencies(fields)
+
+
+class MatchIndex:
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}
+        self.df = Counter()
+        self.doc_terms = {}  # job_id -> terms, needed to undo a job's postings
+        self.changes = 0
+        self.synced_at = None
+        self.checked_at = 0.0
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def idf(self, term):
+        return math.log((len(self.doc_terms) + 1) / (self.df.get(term, 0) + 1)) + 1.0
+
+    def build(self, documents):
+        """Replace the index with ``documents``: an iterable of (job_id, terms)."""
+        with self.lock:
+            self.postings, self.df, self.doc_terms, self.changes = {}, Counter(), {}, 0
+            for job_id, terms in documents:
+                self.doc_terms[job_id] = terms
+                self.df.update(terms.keys())
+            for job_id, terms in self.doc_terms.items():
+                self._add_postings(job_id, terms)
+
+    def _add_postings(self, job_id, terms):
+        weights = {term: tf * self.idf(term) for term, tf in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        postings = self.postings
+        for term, weight in weights.items():
+            postings.setdefault(term, {})[job_id] = weight / norm
+
+    def add(self, job_id, terms):
+        with self.lock:
+            self.remove(job_id)
+            self.doc_terms[job_id] = terms
+            self.df.update(terms.keys())
+            self._add_postings(job_id, terms)
+            self.changes += 1
+
+    def remove(self, job_id):
+        with self.lock:
+            terms = self.doc_terms.pop(job_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                self.postings[term].pop(job_id, None)
+                if not self.postings[term]:
+                    del self.postings[term]
+                self.df[term] -= 1
+                if self.df[term] <= 0:
+                    del self.df[term]
+            self.changes += 1
+
+    def needs_rebuild(self):
+        return self.changes > max(100, len(self.doc_terms) * REBUILD_RATIO)
+
+    def query_vector(self, terms):
+        total = len(self.doc_terms)
+        vector = {}
+        for term, tf in terms.items():
+            df = self.df.get(term, 0)
+            if df and (df <= total * MAX_DF or total < 10):
+                vector[term] = tf * self.idf(term)
+        if len(vector) > MAX_QUERY_TERMS:
+            vector = dict(heapq.nlargest(MAX_QUERY_TERMS, vector.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def top_k(self, terms, k=10, exclude=()):
+        """Return ``[(job_id, cosine similarity), ...]`` best first."""
+        with self.lock:
+            scores = {}
+            get = scores.get
+            for term, query_weight in self.query_vector(terms).items():
+                for job_id, weight in self.postings[term].items():
+                    scores[job_id] = get(job_id, 0.0) + query_weight * weight
+        for job_id in exclude:
+            scores.pop(job_id, None)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def similarities(self, terms, documents):
+        """Cosine similarity of ``terms`` with each of ``documents`` (term dicts), in order."""
+        with self.lock:
+            idf = {}
+            for document in documents:
+                for term in document:
+                    if term not in idf:
+                        idf[term] = self.idf(term)
+            for term in terms:
+                if term not in idf:
+                    idf[term] = self.idf(term)
+        query = {term: tf * idf[term] for term, tf in terms.items()}
+        query_norm = math.sqrt(sum(weight * weight for weight in query.values())) or 1.0
+        scores = []
+        for document in documents:
+            dot = norm = 0.0
+            for term, tf in document.items():
+                weight = tf * idf[term]
+                norm += weight * weight
+                if term in query:
+                    dot += weight * query[term]
+            scores.append(dot / (query_norm * math.sqrt(norm)) if norm else 0.0)
+        return scores
+
+
+_index = MatchIndex()
+
+
+def _approved_jobs():
+    return Job.objects.filter(status='approved').only('id', 'title', 'description')
+
+
+def get_index():
+    index = _index
+    with index.lock:
+        if index.synced_at is None or index.needs_rebuild():
+            started = timezone.now()
+            index.build((job.id, job_terms(job)) for job in _approved_jobs().iterator(chunk_size=2000))
+            index.synced_at = started - SYNC_OVERLAP
+            index.checked_at = time.monotonic()
+        elif time.monotonic() - index.checked_at >= SYNC_INTERVAL:
+            sync(index)
+    return index
+
+
+def sync(index):
+    """Fold in jobs changed by other processes since the last sync."""
+    with index.lock:
+        started = timezone.now()
+        changed = Job.objects.filter(updated_at__gte=index.synced_at).only('id', 'title', 'description', 'status')
+        for job in changed.iterator(chunk_size=2000):
+            if job.status == 'approved':
+                index.add(job.id, job_terms(job))
+            else:
+                index.remove(job.id)
+        if _approved_jobs().count() != len(index):
+            _sync_ids(index)
+        index.synced_at = started - SYNC_OVERLAP
+        index.checked_at = time.monotonic()
+
+
+def _sync_ids(index):
+    # Jobs deleted, or approved and missed, by other processes
+    approved = set(_approved_jobs().values_list('id', flat=True).iterator(chunk_size=2000))
+    for job_id in set(index.doc_terms) - approved:
+        index.remove(job_id)
+    missing = sorted(approved - set(index.doc_terms))
+    for start in range(0, len(missing), 500):
+        for job in _approved_jobs().filter(id__in=missing[start:start + 500]):
+            index.add(job.id, job_terms(job))
+
+
+def recommend_jobs(user, limit=6):
+    """Approved jobs closest to the user's resumes, each with ``match_score`` (0-100)."""
+    terms = Counter()
+    for resume in Resume.objects.filter(user=user).only(*RESUME_FIELDS):
+        terms.update(resume_terms(resume))
+    if not terms:
+        return []
+
+    applied = user.applications.values_list('job_id', flat=True)
+    index = get_index()
+    # Over-fetch a little: jobs deleted by another process are still in the
+    # index until the next sync and are dropped by the query below.
+    ranked = index.top_k(terms, k=limit * 2, exclude=set(applied))
+    jobs = _approved_jobs().only('id', 'title', 'description', 'company', 'location', 'salary').in_bulk(
+        [job_id for job_id, score in ranked]
+    )
+    recommended = []
+    for job_id, score in ranked:
+        job = jobs.get(job_id)
+        if job is not None and score > 0:
+            job.match_score = round(score * 100)
+            recommended.append(job)
+    return recommended[:limit]
+
+
+def score_applications(job):
+    """Score the job's unscored or outdated applications in one batch; returns how many.
+
+    Run by the background worker (see tasks.py). An application is redone
+    when the job changed after it was scored, or when the applicant's resume
+    changed (which clears match_scored_at); the others keep their score.
+    """
+    pending = Application.objects.filter(job=job).filter(
+        Q(match_scored_at__isnull=True) | Q(match_scored_at__lt=job.updated_at)
+    )
+    applications = list(pending.only('id', 'user_id'))
+    if not applications:
+        return 0
+
+    applicant_terms = {}
+    resumes = Resume.objects.filter(user_id__in=pending.values('user_id')).only('user_id', *APPLICANT_FIELDS)
+    for resume in resumes.iterator(chunk_size=2000):
+        applicant_terms.setdefault(resume.user_id, Counter()).update(resume_terms(resume, APPLICANT_FIELDS))
+
+    scores = get_index().similarities(
+        job_terms(job), [applicant_terms.get(application.user_id, {}) for application in applications]
+    )
+    now = timezone.now()
+    for application, score in zip(applications, scores):
+        application.match_score = round(score * 100, 1)
+        application.match_scored_at = now
+    Application.objects.bulk_update(applications, ['match_score', 'match_scored_at'], batch_size=500)
+    return len(applications)
+
+
+def _on_job_saved(sender, instance, **kwargs):
+    if _index.synced_at is None:
+        return  # not built in this process yet
+    if instance.status == 'approved':
+        terms = job_terms(instance)
+        transaction.on_commit(lambda: _index.add(instance.pk, terms))
+    else:
+        transaction.on_commit(lambda: _index.remove(instance.pk))
+
+
+def _on_job_deleted(sender, instance, **kwargs):
+    job_id = instance.pk
+    transaction.on_commit(lambda: _index.remove(job_id))
+
+
+def connect_signals():
+    post_save.connect(_on_job_saved, sender=Job, dispatch_uid='matching_job_saved')
+    post_delete.connect(_on_job_deleted, sender=Job, dispatch_uid='matching_job_deleted')
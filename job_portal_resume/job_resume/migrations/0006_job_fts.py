@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# FTS5 index over job postings, see job_resume/search.py. SQLite only; other
+# backends keep using the icontains fallback.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_resume_job_fts USING fts5(
+        title, company, location, description,
+        content='job_resume_job', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_job_fts_ai AFTER INSERT ON job_resume_job BEGIN
+        INSERT INTO job_resume_job_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_job_fts_ad AFTER DELETE ON job_resume_job BEGIN
+        INSERT INTO job_resume_job_fts(job_resume_job_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_job_fts_au
+    AFTER UPDATE OF title, company, location, description ON job_resume_job BEGIN
+        INSERT INTO job_resume_job_fts(job_resume_job_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO job_resume_job_fts(rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    """,
+    "INSERT INTO job_resume_job_fts(job_resume_job_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS job_resume_job_fts_au',
+    'DROP TRIGGER IF EXISTS job_resume_job_fts_ad',
+    'DROP TRIGGER IF EXISTS job_resume_job_fts_ai',
+    'DROP TABLE IF EXISTS job_resume_job_fts',
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0005_userprofile'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:52
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    SiteCounters = apps.get_model('job_resume', 'SiteCounters')
+    values = {}
+    for model_name, field, prefix in [
+        ('User', 'role', 'users'),
+        ('Job', 'status', 'jobs'),
+        ('Application', 'status', 'applications'),
+    ]:
+        model = apps.get_model('job_resume', model_name)
+        for row in model.objects.order_by().values(field).annotate(total=models.Count('pk')):
+            column = f'{prefix}_{row[field]}'
+            if hasattr(SiteCounters, column):
+                values[column] = row['total']
+    SiteCounters.objects.update_or_create(pk=1, defaults=values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0007_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('users_job_seeker', models.IntegerField(default=0)),
+                ('users_employer', models.IntegerField(default=0)),
+                ('users_admin', models.IntegerField(default=0)),
+                ('jobs_pending', models.IntegerField(default=0)),
+                ('jobs_approved', models.IntegerField(default=0)),
+                ('jobs_rejected', models.IntegerField(default=0)),
+                ('applications_applied', models.IntegerField(default=0)),
+                ('applications_shortlisted', models.IntegerField(default=0)),
+                ('applications_rejected', models.IntegerField(default=0)),
+                ('applications_hired', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+# FTS5 index over the CV text extracted by the background worker, see
+# job_resume/search.py. SQLite only.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_resume_application_cv_fts USING fts5(
+        cv_text,
+        content='job_resume_application', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_application_cv_fts_ai AFTER INSERT ON job_resume_application BEGIN
+        INSERT INTO job_resume_application_cv_fts(rowid, cv_text) VALUES (new.id, new.cv_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_application_cv_fts_ad AFTER DELETE ON job_resume_application BEGIN
+        INSERT INTO job_resume_application_cv_fts(job_resume_application_cv_fts, rowid, cv_text)
+        VALUES ('delete', old.id, old.cv_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_application_cv_fts_au
+    AFTER UPDATE OF cv_text ON job_resume_application BEGIN
+        INSERT INTO job_resume_application_cv_fts(job_resume_application_cv_fts, rowid, cv_text)
+        VALUES ('delete', old.id, old.cv_text);
+        INSERT INTO job_resume_application_cv_fts(rowid, cv_text) VALUES (new.id, new.cv_text);
+    END
+    """,
+    "INSERT INTO job_resume_application_cv_fts(job_resume_application_cv_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS job_resume_application_cv_fts_au',
+    'DROP TRIGGER IF EXISTS job_resume_application_cv_fts_ad',
+    'DROP TRIGGER IF EXISTS job_resume_application_cv_fts_ai',
+    'DROP TABLE IF EXISTS job_resume_application_cv_fts',
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0010_background_tasks'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0013_application_match_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('label', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='resumes', to='job_resume.skill'),
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:05
+
+import re
+
+from django.db import migrations, models
+
+# Resume.location and Resume.searchable for candidate search, and an FTS5
+# index over resume summaries and work experience (SQLite only), see
+# job_resume/candidates.py.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_resume_resume_fts USING fts5(
+        summary, work_experience,
+        content='job_resume_resume', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_resume_fts_ai AFTER INSERT ON job_resume_resume BEGIN
+        INSERT INTO job_resume_resume_fts(rowid, summary, work_experience)
+        VALUES (new.id, new.summary, new.work_experience);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_resume_fts_ad AFTER DELETE ON job_resume_resume BEGIN
+        INSERT INTO job_resume_resume_fts(job_resume_resume_fts, rowid, summary, work_experience)
+        VALUES ('delete', old.id, old.summary, old.work_experience);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_resume_resume_fts_au
+    AFTER UPDATE OF summary, work_experience ON job_resume_resume BEGIN
+        INSERT INTO job_resume_resume_fts(job_resume_resume_fts, rowid, summary, work_experience)
+        VALUES ('delete', old.id, old.summary, old.work_experience);
+        INSERT INTO job_resume_resume_fts(rowid, summary, work_experience)
+        VALUES (new.id, new.summary, new.work_experience);
+    END
+    """,
+    "INSERT INTO job_resume_resume_fts(job_resume_resume_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS job_resume_resume_fts_au',
+    'DROP TRIGGER IF EXISTS job_resume_resume_fts_ad',
+    'DROP TRIGGER IF EXISTS job_resume_resume_fts_ai',
+    'DROP TABLE IF EXISTS job_resume_resume_fts',
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+# Frozen copy of candidates.location_key()
+def _location_key(address):
+    for segment in re.split(r'[,\n;]+', address or ''):
+        segment = re.sub(r'\s+', ' ', segment).strip(' .')
+        if segment and not any(char.isdigit() for char in segment):
+            return segment.title()[:100]
+    return ''
+
+
+def populate(apps, schema_editor):
+    Resume = apps.get_model('job_resume', 'Resume')
+    Resume.objects.exclude(user__role='job_seeker').update(searchable=False)
+    Resume.objects.filter(user__profile__profile_visibility=False).update(searchable=False)
+    batch = []
+    for resume in Resume.objects.exclude(address='').only('id', 'address').iterator(chunk_size=2000):
+        resume.location = _location_key(resume.address)
+        batch.append(resume)
+        if len(batch) >= 2000:
+            Resume.objects.bulk_update(batch, ['location'])
+            batch = []
+    Resume.objects.bulk_update(batch, ['location'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0014_skill_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='location',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='searchable',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(condition=models.Q(('searchable', True)), fields=['updated_at', 'id'], name='resume_searchable_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(condition=models.Q(('searchable', True)), fields=['location'], name='resume_searchable_location_idx'),
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_resume', '0016_job_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchEntry',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='job_resume.job')),
+                ('document', models.TextField(db_column='job_resume_job_fts')),
+            ],
+            options={
+                'db_table': 'job_resume_job_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
+from .storage import blob_storage
 
 # Custom User model with roles
 class User(AbstractUser):
@@ -11,6 +13,12 @@ class User(AbstractUser):
     ]
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='job_seeker')
 
+    class Meta(AbstractUser.Meta):
+        swappable = 'AUTH_USER_MODEL'
+        indexes = [
+            models.Index(fields=['date_joined', 'id'], name='user_joined_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -36,7 +44,7 @@ class UserProfile(models.Model):
     company_description = models.TextField(blank=True)
 
     # Profile Picture
-    profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profile_pictures/', storage=blob_storage, blank=True, null=True)
 
     # Preferences
     email_notifications = models.BooleanField(default=True)
@@ -69,9 +77,32 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='job_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='job_status_created_idx'),
+            models.Index(fields=['posted_by', 'created_at', 'id'], name='job_poster_created_idx'),
+            models.Index(fields=['updated_at'], name='job_updated_idx'),
+            models.Index(fields=['status', 'location'], name='job_status_location_idx'),
+            models.Index(fields=['status', 'company'], name='job_status_company_idx'),
+            models.Index(fields=['status', 'salary'], name='job_status_salary_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+# The FTS5 index over jobs (migration 0006, see search.py), so searches can
+# join it through the ORM. ``document`` is FTS5's hidden column named after
+# the table, used for MATCH and bm25(). SQLite only; never written.
+class JobSearchEntry(models.Model):
+    job = models.OneToOneField(Job, primary_key=True, db_column='rowid', db_constraint=False,
+                               on_delete=models.DO_NOTHING, related_name='search_entry')
+    document = models.TextField(db_column='job_resume_job_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'job_resume_job_fts'
+
 # Application model
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -84,16 +115,38 @@ class Application(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     name = models.CharField(max_length=100, default='')
     phone = models.CharField(max_length=20, default='')
-    cv_pdf = models.FileField(upload_to='applications/', validators=[FileExtensionValidator(allowed_extensions=['pdf'])], blank=True, null=True)
+    cv_pdf = models.FileField(upload_to='applications/', storage=blob_storage, validators=[FileExtensionValidator(allowed_extensions=['pdf'])], blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='applied')
     applied_at = models.DateTimeField(auto_now_add=True)
+    # Filled in by the background worker (see tasks.py); searchable through
+    # the job_resume_application_cv_fts index
+    cv_text = models.TextField(blank=True, default='')
+    # Similarity to the job (0-100), computed in batches by the background
+    # worker (see tasks.py); NULL until scored. match_scored_at is cleared
+    # when the applicant's resume changes so the next run redoes it
+    match_score = models.FloatField(null=True, blank=True)
+    match_scored_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ('user', 'job')
+        indexes = [
+            models.Index(fields=['user', 'applied_at', 'id'], name='application_user_applied_idx'),
+            models.Index(fields=['job', 'applied_at', 'id'], name='application_job_applied_idx'),
+            models.Index(fields=['job', 'match_score', 'id'], name='application_job_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.job.title}"
 
+# Normalized skill catalog (see skills.py). ``name`` is the canonical,
+# case-folded form used for lookups; ``label`` is how it was first written.
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    label = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.label
+
 # Resume model
 class Resume(models.Model):
     TEMPLATE_CHOICES = [
@@ -118,7 +171,9 @@ class Resume(models.Model):
     summary = models.TextField(blank=True)
 
     # Skills
-    skills = models.JSONField(default=list)  # List of skills
+    skills = models.JSONField(default=list)  # List of skills, as entered (used for rendering)
+    # Kept in sync with ``skills`` on save, for indexed lookups
+    skill_set = models.ManyToManyField(Skill, related_name='resumes', blank=True)
 
     # Work Experience
     work_experience = models.TextField(blank=True)
@@ -132,8 +187,99 @@ class Resume(models.Model):
     # Certifications
     certifications = models.TextField(blank=True)
 
+    # Precomputed for employer candidate search (see candidates.py): the
+    # city part of ``address``, and whether the owner is a job seeker with a
+    # visible profile
+    location = models.CharField(max_length=100, blank=True, default='')
+    searchable = models.BooleanField(default=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at', 'id'], name='resume_user_updated_idx'),
+            # Partial: hidden resumes are never searched
+            models.Index(fields=['updated_at', 'id'], name='resume_searchable_updated_idx',
+                         condition=models.Q(searchable=True)),
+            models.Index(fields=['location'], name='resume_searchable_location_idx',
+                         condition=models.Q(searchable=True)),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.name}"
+
+# Materialized totals for the admin dashboards, kept current by the signal
+# handlers in counters.py. There is a single row (pk=1); run
+# `manage.py reconcile_counters` to recount it if it ever drifts.
+class SiteCounters(models.Model):
+    users_job_seeker = models.IntegerField(default=0)
+    users_employer = models.IntegerField(default=0)
+    users_admin = models.IntegerField(default=0)
+
+    jobs_pending = models.IntegerField(default=0)
+    jobs_approved = models.IntegerField(default=0)
+    jobs_rejected = models.IntegerField(default=0)
+
+    applications_applied = models.IntegerField(default=0)
+    applications_shortlisted = models.IntegerField(default=0)
+    applications_rejected = models.IntegerField(default=0)
+    applications_hired = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return 'Site counters'
+
+    @property
+    def total_users(self):
+        return self.users_job_seeker + self.users_employer + self.users_admin
+
+    @property
+    def total_jobs(self):
+        return self.jobs_pending + self.jobs_approved + self.jobs_rejected
+
+    @property
+    def total_applications(self):
+        return (self.applications_applied + self.applications_shortlisted +
+                self.applications_rejected + self.applications_hired)
+
+# One row per stored upload blob (see storage.py). ref_count is the number of
+# Application / UserProfile rows pointing at the file; the blob is deleted
+# once it drops to zero.
+class StoredFile(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+# DB-backed work queue processed by `manage.py run_worker` (see tasks.py)
+class BackgroundTask(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    kind = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'], name='task_claim_idx'),
+            models.Index(fields=['locked_by'], name='task_locked_by_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}:{self.object_id} ({self.status})'
@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters, facets, job_facets
+from .models import Job
+from .search import search_jobs
+
+# Bulk job moderation for the admin queue.
+#
+# Approving or rejecting any number of jobs is one UPDATE per status the jobs
+# are leaving (normally just "pending"), so the row counts returned by the
+# database adjust the dashboard counters exactly. queryset.update() skips
+# the Job signals, so updated_at is set for the matching index to pick the
+# change up and the job facets are invalidated here. Deletes go through the
+# ORM in batches, so applications, their CV files and the counters are
+# cleaned up by the usual delete signals.
+
+ACTIONS = {
+    'approve': 'approved',
+    'reject': 'rejected',
+    'delete': None,
+}
+DELETE_BATCH_SIZE = 500
+
+
+def pending_jobs(query='', filters=None):
+    """Pending jobs matching the queue's keyword and facet filters."""
+    jobs = Job.objects.filter(status='pending')
+    if filters:
+        jobs = job_facets.apply_filters(jobs, filters)
+    if query:
+        # As a subquery, so the result can be updated (search_jobs annotates)
+        jobs = Job.objects.filter(pk__in=search_jobs(jobs, query).values('pk'))
+    return jobs
+
+
+def set_status(jobs, status):
+    """Move ``jobs`` to ``status``; returns how many changed."""
+    changes = {}
+    now = timezone.now()
+    with transaction.atomic():
+        for old_status, label in Job.STATUS_CHOICES:
+            if old_status == status:
+                continue
+            moved = jobs.filter(status=old_status).update(status=status, updated_at=now)
+            if moved:
+                changes[old_status] = -moved
+                changes[status] = changes.get(status, 0) + moved
+        counters.adjust(Job, changes)
+    if changes:
+        facets.invalidate(job_facets.FACET_NAMESPACE)
+    return changes.get(status, 0)
+
+
+def delete_jobs(jobs, batch_size=DELETE_BATCH_SIZE):
+    deleted = 0
+    ids = list(jobs.values_list('pk', flat=True))
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            total, per_model = Job.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+        deleted += per_model.get(Job._meta.label, 0)
+    return deleted
+
+
+def moderate(jobs, action):
+    """Apply an ACTIONS key to ``jobs``; returns the number of jobs affected."""
+    status = ACTIONS[action]
+    if status is None:
+        return delete_jobs(jobs)
+    return set_status(jobs, status)
@@ -0,0 +1,155 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+# Keyset (cursor) pagination.
+#
+# Pages are addressed by the sort key of the last row shown instead of an
+# OFFSET, so every page is a single indexed range scan of ``page_size + 1``
+# rows no matter how deep the client has paged. The ordering must end in a
+# unique column (normally ``-id``) so that the key is a total order.
+
+PAGE_SIZE = 20
+CURSOR_PARAM = 'cursor'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(json.JSONEncoder):
+    # Unlike DjangoJSONEncoder this keeps full microsecond precision, which
+    # the keyset comparison depends on.
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        return super().default(o)
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({'k': values, 'd': direction}, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = data['k'], data['d']
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise InvalidCursor(token)
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise InvalidCursor(token)
+    return values, direction
+
+
+class KeysetPage:
+    def __init__(self, object_list, ordering, request, has_next, has_previous):
+        self.object_list = object_list
+        self.ordering = ordering
+        self.request = request
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _key(self, obj):
+        if isinstance(obj, dict):  # rows of a values() queryset
+            return [obj[field.lstrip('-')] for field in self.ordering]
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def _query(self, cursor):
+        params = self.request.GET.copy()
+        params[CURSOR_PARAM] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        if not self.has_next:
+            return ''
+        return self._query(encode_cursor(self._key(self.object_list[-1]), 'next'))
+
+    @property
+    def previous_query(self):
+        if not self.has_previous:
+            return ''
+        return self._query(encode_cursor(self._key(self.object_list[0]), 'prev'))
+
+    @property
+    def first_query(self):
+        params = self.request.GET.copy()
+        params.pop(CURSOR_PARAM, None)
+        return params.urlencode()
+
+    @property
+    def is_paginated(self):
+        return self.has_next or self.has_previous
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def _to_python(model, field, value):
+    try:
+        return model._meta.get_field(field).to_python(value)
+    except FieldDoesNotExist:
+        # Annotations such as search_rank are plain JSON scalars
+        return value
+    except ValidationError:
+        raise InvalidCursor(value)
+
+
+def _after(model, ordering, values):
+    # Rows strictly after ``values`` in ``ordering``:
+    # (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        value = _to_python(model, name, value)
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def paginate(request, queryset, ordering, page_size=PAGE_SIZE):
+    """Return a KeysetPage of ``queryset`` sorted by ``ordering``.
+
+    The cursor is read from ``?cursor=``; malformed or stale tokens fall
+    back to the first page.
+    """
+    ordering = list(ordering)
+    direction = 'next'
+    token = request.GET.get(CURSOR_PARAM)
+    if token:
+        try:
+            values, direction = decode_cursor(token)
+            if len(values) != len(ordering):
+                raise InvalidCursor(token)
+            query_ordering = ordering if direction == 'next' else _reverse(ordering)
+            queryset = queryset.filter(_after(queryset.model, query_ordering, values))
+        except InvalidCursor:
+            token, direction = None, 'next'
+
+    query_ordering = ordering if direction == 'next' else _reverse(ordering)
+    rows = list(queryset.order_by(*query_ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if direction == 'next':
+        return KeysetPage(rows, ordering, request, has_next=has_more, has_previous=bool(token))
+    rows.reverse()
+    return KeysetPage(rows, ordering, request, has_next=True, has_previous=has_more)
@@ -0,0 +1,32 @@
+import io
+import re
+
+import pypdf
+
+# Plain-text extraction from uploaded CV PDFs, with pypdf.
+#
+# Text that still contains control characters (glyph ids from a font without
+# a usable ToUnicode map, NUL padding) is rejected rather than stored: the
+# task fails with the reason instead of indexing garbage as a success.
+
+MAX_TEXT_LENGTH = 200_000
+
+# Control characters other than tab, newline and carriage return
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ufffd]')
+
+
+class TextExtractionError(Exception):
+    pass
+
+
+def extract_text(path):
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        text = '\n'.join(page.extract_text() or '' for page in reader.pages)
+    except Exception as exc:
+        raise TextExtractionError(str(exc)) from exc
+    if _CONTROL_RE.search(text):
+        raise TextExtractionError('Extracted text contains unmapped or control characters')
+    return text[:MAX_TEXT_LENGTH]
@@ -0,0 +1,93 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.template.loader import get_template, render_to_string
+
+from .models import Resume
+
+# Rendered-HTML cache for resume previews.
+#
+# A preview only changes when the resume is saved or the template file is
+# edited, so the key is (resume id, updated_at, template type, hash of the
+# template source). The backend is whichever cache alias RESUME_PREVIEW_CACHE
+# names, e.g. a LocMemCache per process or a FileBasedCache shared between
+# workers. Saving or deleting a resume drops its cached previews right away
+# instead of leaving them to expire.
+
+KEY_PREFIX = 'resume_preview'
+STATS_KEYS = {'hits': f'{KEY_PREFIX}:stats:hits', 'misses': f'{KEY_PREFIX}:stats:misses'}
+
+_template_hashes = {}
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESUME_PREVIEW_CACHE', 'default')]
+
+
+def template_name(template_type):
+    return f'resume_{template_type}.html'
+
+
+def template_hash(template_type):
+    name = template_name(template_type)
+    if name not in _template_hashes:
+        source = get_template(name).template.source
+        _template_hashes[name] = hashlib.sha1(source.encode()).hexdigest()[:12]
+    return _template_hashes[name]
+
+
+def _index_key(resume_id):
+    return f'{KEY_PREFIX}:keys:{resume_id}'
+
+
+def preview_key(resume, template_type):
+    return f'{KEY_PREFIX}:{resume.pk}:{resume.updated_at.timestamp()}:{template_type}:{template_hash(template_type)}'
+
+
+def _count(cache, stat):
+    key = STATS_KEYS[stat]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    values = get_cache().get_many(STATS_KEYS.values())
+    return {stat: values.get(key, 0) for stat, key in STATS_KEYS.items()}
+
+
+def render_preview(resume, template_type=None):
+    template_type = template_type or resume.template_type
+    cache = get_cache()
+    key = preview_key(resume, template_type)
+    html = cache.get(key)
+    if html is not None:
+        _count(cache, 'hits')
+        return html
+
+    _count(cache, 'misses')
+    html = render_to_string(template_name(template_type), {'resume': resume})
+    cache.set(key, html)
+    keys = cache.get(_index_key(resume.pk), [])
+    if key not in keys:
+        cache.set(_index_key(resume.pk), keys + [key])
+    return html
+
+
+def invalidate(resume_id):
+    cache = get_cache()
+    keys = cache.get(_index_key(resume_id), [])
+    cache.delete_many(keys + [_index_key(resume_id)])
+
+
+def _on_resume_change(sender, instance, **kwargs):
+    invalidate(instance.pk)
+
+
+def connect_signals():
+    post_save.connect(_on_resume_change, sender=Resume, dispatch_uid='preview_cache_save')
+    post_delete.connect(_on_resume_change, sender=Resume, dispatch_uid='preview_cache_delete')
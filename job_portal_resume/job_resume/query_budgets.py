@@ -0,0 +1,148 @@
+from django.test import Client
+from django.urls import get_resolver, reverse
+
+from .models import Application, Job, Resume, User
+from .querycount import get_budget, record_queries, repeat_threshold
+from .urls import app_name, urlpatterns
+
+# Query-budget checks for every URL in job_resume/urls.py.
+#
+# check_urls() creates a small data set with several rows behind every list,
+# so that a per-row query shows up as a repeated fingerprint, requests each
+# URL as a role allowed to see it, and compares what querycount recorded
+# with the view's budget. QueryBudgetTestMixin turns the result into a test
+# case; `manage.py check_query_budgets` prints it and fails on overruns.
+# A URL without an entry in URL_CHECKS is reported as a failure, so new
+# views have to be given a budget.
+
+ROWS = 8
+
+
+def create_sample_data():
+    admin = User.objects.create_user('qb_admin', password='x', role='admin')
+    employer = User.objects.create_user('qb_employer', password='x', role='employer')
+    seeker = User.objects.create_user('qb_seeker', password='x', role='job_seeker')
+    jobs = [
+        Job.objects.create(title=f'Python developer {i}', description='Django and PostgreSQL', company=f'Company {i}',
+                           location=f'City {i % 3}', salary=40000 + i * 10000, posted_by=employer,
+                           status='approved' if i % 4 else 'pending')
+        for i in range(ROWS)
+    ]
+    applicants = [User.objects.create_user(f'qb_applicant{i}', password='x', role='job_seeker') for i in range(ROWS)]
+    for applicant in applicants + [seeker]:
+        Resume.objects.create(user=applicant, full_name=applicant.username, email=f'{applicant.username}@example.com',
+                              phone='1', address='City 1', skills=['Python', 'Django'], summary='Backend developer')
+        for job in jobs[1:4]:
+            Application.objects.create(user=applicant, job=job, name=applicant.username, phone='1')
+    return {
+        'admin': admin, 'employer': employer, 'job_seeker': seeker, 'jobs': jobs,
+        'job': jobs[1], 'application': Application.objects.filter(job=jobs[1]).first(),
+        'resume': Resume.objects.get(user=seeker),
+        'spare_job': jobs[-1], 'spare_user': applicants[-1],
+    }
+
+
+# url name -> (role or None for anonymous, kwargs from the sample data)
+URL_CHECKS = {
+    'register': (None, lambda data: {}),
+    'login': (None, lambda data: {}),
+    'logout': ('job_seeker', lambda data: {}),
+    'home': ('job_seeker', lambda data: {}),
+    'job_list': ('job_seeker', lambda data: {}),
+    'job_detail': ('job_seeker', lambda data: {'job_id': data['job'].id}),
+    'apply_job': ('job_seeker', lambda data: {'job_id': data['jobs'][5].id}),
+    'job_feed_rss': (None, lambda data: {}),
+    'job_feed_atom': (None, lambda data: {}),
+    'my_applications': ('job_seeker', lambda data: {}),
+    'post_job': ('employer', lambda data: {}),
+    'import_jobs': ('employer', lambda data: {}),
+    'my_jobs': ('employer', lambda data: {}),
+    'job_applications': ('employer', lambda data: {'job_id': data['job'].id}),
+    'export_job_applications': ('employer', lambda data: {'job_id': data['job'].id}),
+    'update_application_status': ('employer', lambda data: {'application_id': data['application'].id}),
+    'bulk_update_application_status': ('employer', lambda data: {'job_id': data['job'].id}),
+    'candidate_search': ('employer', lambda data: {}),
+    'resume_builder': ('job_seeker', lambda data: {}),
+    'edit_resume': ('job_seeker', lambda data: {'resume_id': data['resume'].id}),
+    'resume_preview': ('job_seeker', lambda data: {'resume_id': data['resume'].id}),
+    'download_resume': ('job_seeker', lambda data: {'resume_id': data['resume'].id}),
+    'my_resumes': ('job_seeker', lambda data: {}),
+    'admin_dashboard': ('admin', lambda data: {}),
+    'admin_dashboard_jobs': ('admin', lambda data: {}),
+    'admin_dashboard_users': ('admin', lambda data: {}),
+    'admin_dashboard_applications': ('admin', lambda data: {}),
+    'moderation_queue': ('admin', lambda data: {}),
+    'approve_job': ('admin', lambda data: {'job_id': data['jobs'][0].id}),
+    'reject_job': ('admin', lambda data: {'job_id': data['jobs'][4].id}),
+    'delete_job': ('admin', lambda data: {'job_id': data['spare_job'].id}),
+    'delete_user': ('admin', lambda data: {'user_id': data['spare_user'].id}),
+    'manage_users': ('admin', lambda data: {}),
+    'change_user_role': ('admin', lambda data: {'user_id': data['job_seeker'].id}),
+    'analytics_dashboard': ('admin', lambda data: {}),
+    'user_profile': ('job_seeker', lambda data: {}),
+    'api_job_list': (None, lambda data: {}),
+    'api_job_detail': (None, lambda data: {'job_id': data['job'].id}),
+}
+
+
+class BudgetResult:
+
+    def __init__(self, view_name, url, role, status=None, count=0, duration=0.0, repeated=(), error=''):
+        self.view_name = view_name
+        self.url = url
+        self.role = role
+        self.status = status
+        self.count = count
+        self.duration = duration
+        self.repeated = list(repeated)
+        self.error = error
+        self.budget = get_budget(view_name)
+
+    @property
+    def ok(self):
+        return not self.error and self.count <= self.budget and not self.repeated
+
+
+def check_urls(data=None):
+    """Request every job_resume URL once and return a BudgetResult for each."""
+    data = data or create_sample_data()
+    results = []
+    names = [pattern.name for pattern in urlpatterns]
+    for name in names:
+        view_name = f'{app_name}:{name}'
+        if name not in URL_CHECKS:
+            results.append(BudgetResult(view_name, '', None, error='no entry in URL_CHECKS'))
+            continue
+        role, kwargs = URL_CHECKS[name]
+        url = reverse(view_name, kwargs=kwargs(data))
+        client = Client(raise_request_exception=False)
+        if role:
+            client.force_login(data[role])
+        with record_queries() as recorder:
+            response = client.get(url)
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+        error = ''
+        if response.status_code >= 500:
+            error = f'HTTP {response.status_code}'
+        results.append(BudgetResult(
+            view_name, url, role, response.status_code, recorder.count, recorder.duration,
+            recorder.repeated(repeat_threshold()), error,
+        ))
+    return results
+
+
+class QueryBudgetTestMixin:
+    """Mix into a django.test.TestCase to fail on any view over its query budget."""
+
+    def test_query_budgets(self):
+        failures = []
+        for result in check_urls():
+            if result.ok:
+                continue
+            detail = result.error or f'{result.count} queries (budget {result.budget})'
+            for sql, times in result.repeated:
+                detail += f'; {times}x {sql[:120]}'
+            failures.append(f'{result.view_name} {result.url}: {detail}')
+        if failures:
+            self.fail('Query budget exceeded:\n' + '\n'.join(failures))
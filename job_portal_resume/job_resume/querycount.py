@@ -0,0 +1,167 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Per-request SQL instrumentation.
+#
+# QueryCountMiddleware wraps every database call of a request (through
+# connection.execute_wrapper, so it also works with DEBUG off) and records
+# the query count, the time spent in the database and a fingerprint of each
+# statement: the SQL with literals and IN-list lengths folded away, so the
+# same query issued once per row of a template shows up as one fingerprint
+# with a high count. Requests over their budget, or with a fingerprint
+# repeated QUERY_REPEAT_THRESHOLD times or more (an N+1), are logged to the
+# "job_resume.queries" logger. Queries run while a streaming response is
+# consumed happen after the middleware returns and are not counted.
+#
+# Settings: QUERY_COUNT_ENABLED (default True), QUERY_COUNT_BUDGET (default
+# 20), QUERY_TIME_BUDGET_MS (default 200), QUERY_REPEAT_THRESHOLD (default
+# 5) and QUERY_BUDGETS, a {view name: max queries} map overriding
+# VIEW_BUDGETS below.
+
+logger = logging.getLogger('job_resume.queries')
+
+DEFAULT_BUDGET = 20
+DEFAULT_TIME_BUDGET_MS = 200
+DEFAULT_REPEAT_THRESHOLD = 5
+
+# Query budgets per view, checked by `manage.py check_query_budgets`. They
+# include loading the user on a cold auth cache (sessions are read from the
+# cache, see auth_cache.py). Lower them when a view gets cheaper.
+VIEW_BUDGETS = {
+    'job_resume:register': 2,
+    'job_resume:login': 2,
+    'job_resume:logout': 3,
+    'job_resume:home': 10,  # with its ETag probe (3 queries), all a 304 costs
+    'job_resume:job_list': 6,  # with its ETag probe
+    'job_resume:job_detail': 4,  # with its ETag probe
+    'job_resume:apply_job': 4,
+    'job_resume:job_feed_rss': 2,  # with its ETag probe
+    'job_resume:job_feed_atom': 2,  # with its ETag probe
+    'job_resume:my_applications': 3,
+    'job_resume:post_job': 2,
+    'job_resume:import_jobs': 5,  # plus 2 per IMPORT_BATCH_SIZE rows imported
+    'job_resume:my_jobs': 3,
+    'job_resume:job_applications': 5,
+    'job_resume:export_job_applications': 3,
+    'job_resume:update_application_status': 6,  # POST; a GET takes 2
+    'job_resume:bulk_update_application_status': 6,
+    'job_resume:candidate_search': 6,
+    'job_resume:resume_builder': 2,
+    'job_resume:edit_resume': 3,
+    'job_resume:resume_preview': 4,  # with its ETag probe
+    'job_resume:download_resume': 3,
+    'job_resume:my_resumes': 3,
+    'job_resume:admin_dashboard': 3,
+    'job_resume:admin_dashboard_jobs': 3,
+    'job_resume:admin_dashboard_users': 3,
+    'job_resume:admin_dashboard_applications': 3,
+    'job_resume:moderation_queue': 5,  # deletes add about 6 per DELETE_BATCH_SIZE jobs
+    'job_resume:approve_job': 7,
+    'job_resume:reject_job': 7,
+    'job_resume:delete_job': 11,
+    'job_resume:delete_user': 20,  # cascades; the user's row is re-read for the counters
+    'job_resume:manage_users': 3,
+    'job_resume:change_user_role': 5,  # POST; a GET takes 2
+    'job_resume:analytics_dashboard': 4,
+    'job_resume:user_profile': 6,  # first visit creates the profile
+    'job_resume:api_job_list': 2,  # with its ETag probe
+    'job_resume:api_job_detail': 2,  # with its ETag probe
+}
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+# Transaction control is not counted: atomic() issues BEGIN in autocommit
+# mode but SAVEPOINT/RELEASE inside a TestCase, and budgets must hold in both
+_TRANSACTION_RE = re.compile(r'\s*(BEGIN|SAVEPOINT|RELEASE|ROLLBACK|COMMIT)\b', re.IGNORECASE)
+
+
+def fingerprint(sql):
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('N', sql)
+    sql = _IN_LIST_RE.sub('(%s, ...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def get_budget(view_name):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return VIEW_BUDGETS.get(view_name, getattr(settings, 'QUERY_COUNT_BUDGET', DEFAULT_BUDGET))
+
+
+def repeat_threshold():
+    return getattr(settings, 'QUERY_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD)
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if not _TRANSACTION_RE.match(sql):
+                self.duration += time.perf_counter() - started
+                self.count += 1
+                self.fingerprints[fingerprint(sql)] += 1
+
+    def repeated(self, threshold=None):
+        """``[(fingerprint, times), ...]`` issued at least ``threshold`` times."""
+        threshold = repeat_threshold() if threshold is None else threshold
+        return [(sql, times) for sql, times in self.fingerprints.most_common() if times >= threshold]
+
+
+@contextmanager
+def record_queries():
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def problems(view_name, recorder):
+    found = []
+    budget = get_budget(view_name)
+    if recorder.count > budget:
+        found.append(f'{recorder.count} queries (budget {budget})')
+    time_budget = getattr(settings, 'QUERY_TIME_BUDGET_MS', DEFAULT_TIME_BUDGET_MS)
+    if recorder.duration * 1000 > time_budget:
+        found.append(f'{recorder.duration * 1000:.1f} ms in the database (budget {time_budget} ms)')
+    for sql, times in recorder.repeated():
+        found.append(f'{times}x {sql[:200]}')
+    return found
+
+
+class QueryCountMiddleware:
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_COUNT_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        found = problems(view_name, recorder)
+        if found:
+            logger.warning('%s %s: %s', request.method, view_name, '; '.join(found))
+        if settings.DEBUG:
+            response['Server-Timing'] = f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        return response
@@ -0,0 +1,624 @@
+import atexit
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from django.conf import settings
+
+# Server-side PDF rendering for resumes.
+#
+# render_pdf() is a small, dependency-free PDF writer (base-14 fonts, A4,
+# word-wrapped text) that takes a plain dict, so it can run in a worker
+# process. get_resume_pdf() keys the output on a hash of everything that
+# affects it - the resume fields, the template type and that template's
+# version - and keeps it on disk, so downloading an unchanged resume again is
+# a plain file send.
+#
+# The base-14 fonts only cover Windows-1252. A resume with other characters
+# is set in the TrueType fonts of RESUME_PDF_UNICODE_FONTS instead, embedded
+# in the PDF; text those fonts have no glyphs for raises UnsupportedText
+# rather than coming out as '?'.
+#
+# Cached PDFs whose mtime is older than RESUME_PDF_CACHE_MAX_AGE are deleted,
+# oldest first, until the cache is under RESUME_PDF_CACHE_MAX_BYTES; a hit
+# refreshes the mtime. prune_cache() runs at most every RESUME_PDF_PRUNE_INTERVAL
+# seconds from get_resume_pdf(), or from `manage.py prune_resume_pdfs`.
+
+RENDERER_VERSION = 2
+
+PAGE_WIDTH, PAGE_HEIGHT = 595.28, 841.89  # A4 in points
+MARGIN = 50
+
+# Bump a template's version whenever its layout changes so cached PDFs for it
+# are regenerated.
+TEMPLATE_STYLES = {
+    'classic': {
+        'version': 1,
+        'name_font': 'Times-Bold', 'heading_font': 'Times-Bold', 'body_font': 'Times-Roman',
+        'name_color': (0.10, 0.10, 0.10), 'accent': (0.17, 0.17, 0.17), 'band': None,
+    },
+    'modern': {
+        'version': 1,
+        'name_font': 'Helvetica-Bold', 'heading_font': 'Helvetica-Bold', 'body_font': 'Helvetica',
+        'name_color': (0.12, 0.16, 0.22), 'accent': (0.15, 0.39, 0.92), 'band': None,
+    },
+    'creative': {
+        'version': 1,
+        'name_font': 'Helvetica-Bold', 'heading_font': 'Helvetica-Bold', 'body_font': 'Helvetica',
+        'name_color': (0.18, 0.06, 0.40), 'accent': (0.96, 0.45, 0.71), 'band': None,
+    },
+    'executive': {
+        'version': 1,
+        'name_font': 'Times-Bold', 'heading_font': 'Helvetica-Bold', 'body_font': 'Helvetica',
+        'name_color': (1.0, 1.0, 1.0), 'accent': (0.10, 0.13, 0.17), 'band': (0.10, 0.13, 0.17),
+    },
+}
+
+SECTIONS = [
+    ('summary', 'Professional Summary'),
+    ('work_experience', 'Experience'),
+    ('education', 'Education'),
+    ('skills', 'Skills'),
+    ('projects', 'Key Projects'),
+    ('certifications', 'Certifications'),
+]
+
+PAYLOAD_FIELDS = [
+    'name', 'template_type', 'full_name', 'email', 'phone', 'address', 'linkedin',
+    'github', 'summary', 'skills', 'work_experience', 'education', 'projects', 'certifications',
+]
+
+FONTS = ['Helvetica', 'Helvetica-Bold', 'Times-Roman', 'Times-Bold']
+
+
+class PdfError(Exception):
+    pass
+
+
+class UnsupportedText(PdfError):
+    pass
+
+
+class RenderTimeout(PdfError):
+    pass
+
+# Helvetica advance widths (1/1000 em) for printable ASCII. Times and the bold
+# faces are approximated by scaling, which is close enough for line breaking.
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_FONT_SCALE = {'Helvetica': 1.0, 'Helvetica-Bold': 1.07, 'Times-Roman': 0.9, 'Times-Bold': 0.97}
+
+
+def text_width(text, font, size):
+    total = 0
+    for char in text:
+        code = ord(char)
+        total += _HELVETICA_WIDTHS[code - 32] if 32 <= code < 127 else 556
+    return total * _FONT_SCALE[font] * size / 1000
+
+
+def wrap(text, font, size, width, measure=text_width):
+    lines = []
+    for paragraph in text.splitlines():
+        words = paragraph.split()
+        if not words:
+            lines.append('')
+            continue
+        line = words[0]
+        for word in words[1:]:
+            candidate = f'{line} {word}'
+            if measure(candidate, font, size) <= width:
+                line = candidate
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+def _escape(text):
+    data = text.encode('cp1252')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _is_latin(text):
+    try:
+        text.encode('cp1252')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+class TrueTypeFont:
+    """The parts of a TrueType file needed to embed it: glyph ids, widths and metrics."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.name = self.path.stem.replace(' ', '')
+        self.data = data = self.path.read_bytes()
+        # tag -> (offset, length)
+        self.tables = {}
+        for index in range(struct.unpack_from('>H', data, 4)[0]):
+            tag, _, offset, length = struct.unpack_from('>4sIII', data, 12 + 16 * index)
+            self.tables[tag] = (offset, length)
+        tables = {tag: offset for tag, (offset, length) in self.tables.items()}
+        head, hhea = tables[b'head'], tables[b'hhea']
+        scale = 1000 / struct.unpack_from('>H', data, head + 18)[0]
+        self.bbox = [round(value * scale) for value in struct.unpack_from('>4h', data, head + 36)]
+        ascent, descent = struct.unpack_from('>2h', data, hhea + 4)
+        self.ascent, self.descent = round(ascent * scale), round(descent * scale)
+        metrics = struct.unpack_from('>H', data, hhea + 34)[0]
+        self.widths = [
+            round(struct.unpack_from('>H', data, tables[b'hmtx'] + 4 * index)[0] * scale) for index in range(metrics)
+        ]
+        self.glyphs = self._read_cmap(tables[b'cmap'])
+
+    def _read_cmap(self, cmap):
+        data = self.data
+        subtables = {}
+        for index in range(struct.unpack_from('>H', data, cmap + 2)[0]):
+            platform, encoding, offset = struct.unpack_from('>HHI', data, cmap + 4 + 8 * index)
+            subtables[platform, encoding] = cmap + offset
+        glyphs = {}
+        if (3, 10) in subtables:
+            table = subtables[3, 10]
+            for group in range(struct.unpack_from('>I', data, table + 12)[0]):
+                start, end, glyph = struct.unpack_from('>III', data, table + 16 + 12 * group)
+                for code in range(start, end + 1):
+                    glyphs[chr(code)] = glyph + code - start
+            return glyphs
+        table = subtables.get((3, 1)) or subtables.get((0, 3))
+        if table is None:
+            raise UnsupportedText(f'{self.path.name} has no Unicode character map.')
+        segments = struct.unpack_from('>H', data, table + 6)[0] // 2
+        ends = table + 14
+        starts = ends + 2 * segments + 2
+        deltas = starts + 2 * segments
+        range_offsets = deltas + 2 * segments
+        for index in range(segments):
+            end, start = struct.unpack_from('>H', data, ends + 2 * index)[0], struct.unpack_from('>H', data, starts + 2 * index)[0]
+            delta = struct.unpack_from('>h', data, deltas + 2 * index)[0]
+            range_offset = struct.unpack_from('>H', data, range_offsets + 2 * index)[0]
+            for code in range(start, min(end, 0xFFFE) + 1):
+                if range_offset:
+                    glyph = struct.unpack_from('>H', data, range_offsets + 2 * index + range_offset + 2 * (code - start))[0]
+                    glyph = (glyph + delta) & 0xFFFF if glyph else 0
+                else:
+                    glyph = (code + delta) & 0xFFFF
+                if glyph:
+                    glyphs[chr(code)] = glyph
+        return glyphs
+
+    def width(self, glyph):
+        return self.widths[min(glyph, len(self.widths) - 1)]
+
+    def _table(self, tag):
+        offset, length = self.tables[tag]
+        return self.data[offset:offset + length]
+
+    def subset(self, glyphs):
+        """A copy of the font with every outline but those of ``glyphs`` (and their components) emptied.
+
+        Glyph ids are unchanged, so the text needs no re-encoding; only the
+        tables a PDF viewer uses for TrueType outlines are kept.
+        """
+        head = bytearray(self._table(b'head'))
+        glyf = self._table(b'glyf')
+        count = struct.unpack_from('>H', self._table(b'maxp'), 4)[0]
+        if struct.unpack_from('>h', head, 50)[0]:
+            loca = struct.unpack_from(f'>{count + 1}I', self._table(b'loca'))
+        else:
+            loca = [offset * 2 for offset in struct.unpack_from(f'>{count + 1}H', self._table(b'loca'))]
+
+        keep, pending = set(), {0, *glyphs}
+        while pending:
+            glyph = pending.pop()
+            if glyph in keep or glyph >= count:
+                continue
+            keep.add(glyph)
+            outline = glyf[loca[glyph]:loca[glyph + 1]]
+            if len(outline) < 10 or struct.unpack_from('>h', outline, 0)[0] >= 0:
+                continue
+            # Composite glyph: walk its component records
+            position, more = 10, True
+            while more:
+                flags, component = struct.unpack_from('>HH', outline, position)
+                pending.add(component)
+                position += 4 + (4 if flags & 0x1 else 2)
+                position += 2 if flags & 0x8 else 4 if flags & 0x40 else 8 if flags & 0x80 else 0
+                more = flags & 0x20
+
+        new_glyf, new_loca = bytearray(), []
+        for glyph in range(count):
+            new_loca.append(len(new_glyf))
+            if glyph in keep:
+                new_glyf += glyf[loca[glyph]:loca[glyph + 1]]
+                new_glyf += b'\0' * (-len(new_glyf) % 4)
+        new_loca.append(len(new_glyf))
+        struct.pack_into('>I', head, 8, 0)  # checkSumAdjustment, not checked by viewers
+        struct.pack_into('>h', head, 50, 1)  # long loca offsets
+
+        tables = {tag: self._table(tag) for tag in (b'cvt ', b'fpgm', b'hhea', b'hmtx', b'maxp', b'prep')
+                  if tag in self.tables}
+        tables.update({b'glyf': bytes(new_glyf), b'head': bytes(head), b'loca': struct.pack(f'>{count + 1}I', *new_loca)})
+        return _sfnt(tables)
+
+    def text_width(self, text, size):
+        return sum(self.width(self.glyphs.get(char, 0)) for char in text) * size / 1000
+
+    def missing(self, text):
+        return {char for char in text if char not in self.glyphs and not char.isspace()}
+
+
+def _checksum(data):
+    data += b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+
+def _sfnt(tables):
+    """Assemble a TrueType file from ``{tag: bytes}``."""
+    count = len(tables)
+    power = 1 << (count.bit_length() - 1)
+    header = struct.pack('>IHHHH', 0x00010000, count, power * 16, power.bit_length() - 1, (count - power) * 16)
+    records, body = b'', b''
+    offset = 12 + 16 * count
+    for tag in sorted(tables):
+        data = tables[tag]
+        records += struct.pack('>4sIII', tag, _checksum(data), offset + len(body), len(data))
+        body += data + b'\0' * (-len(data) % 4)
+    return header + records + body
+
+
+_unicode_fonts = {}
+
+
+def unicode_fonts():
+    """``{base-14 font: TrueTypeFont}`` from RESUME_PDF_UNICODE_FONTS, loaded once per process."""
+    paths = getattr(settings, 'RESUME_PDF_UNICODE_FONTS', {})
+    if not paths.get('regular') or not os.path.exists(paths['regular']):
+        raise UnsupportedText('No Unicode font is configured for PDF resumes (RESUME_PDF_UNICODE_FONTS).')
+    regular = paths['regular']
+    bold = paths['bold'] if paths.get('bold') and os.path.exists(paths['bold']) else regular
+    for path in (regular, bold):
+        if path not in _unicode_fonts:
+            _unicode_fonts[path] = TrueTypeFont(path)
+    return {
+        'Helvetica': _unicode_fonts[regular], 'Times-Roman': _unicode_fonts[regular],
+        'Helvetica-Bold': _unicode_fonts[bold], 'Times-Bold': _unicode_fonts[bold],
+    }
+
+
+def _payload_text(payload):
+    # Only the fields render_pdf() prints
+    for field in PAYLOAD_FIELDS[2:]:
+        value = payload[field]
+        yield from value if isinstance(value, list) else [str(value or '')]
+
+
+class _Canvas:
+    def __init__(self, embedded=None):
+        # embedded: {base-14 font: TrueTypeFont} to set every font in
+        self.embedded = embedded
+        self.used = {}  # TrueTypeFont -> {glyph: character}
+        self.pages = []
+        self.new_page()
+
+    def text_width(self, text, font, size):
+        if self.embedded:
+            return self.embedded[font].text_width(text, size)
+        return text_width(text, font, size)
+
+    def _encode(self, value, font):
+        if not self.embedded:
+            return b'(%s)' % _escape(value)
+        ttf = self.embedded[font]
+        used = self.used.setdefault(ttf, {})
+        glyphs = []
+        for char in value:
+            glyph = ttf.glyphs.get(char, 0)
+            used.setdefault(glyph, char)
+            glyphs.append(glyph)
+        return b'<%s>' % ''.join(f'{glyph:04X}' for glyph in glyphs).encode()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure_space(self, height):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def rect(self, x, y, width, height, color):
+        self.ops.append(b'%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f' % (*color, x, y, width, height))
+
+    def line(self, x1, y1, x2, y2, color, width=0.8):
+        self.ops.append(b'%.3f %.3f %.3f RG %.2f w %.2f %.2f m %.2f %.2f l S' % (*color, width, x1, y1, x2, y2))
+
+    def text(self, x, y, value, font, size, color=(0.2, 0.2, 0.2)):
+        self.ops.append(
+            b'BT /F%d %.1f Tf %.3f %.3f %.3f rg %.2f %.2f Td %s Tj ET'
+            % (FONTS.index(font) + 1, size, *color, x, y, self._encode(value, font))
+        )
+
+    def paragraph(self, value, font, size, leading, color=(0.2, 0.2, 0.2)):
+        for line in wrap(value, font, size, PAGE_WIDTH - 2 * MARGIN, self.text_width):
+            self.ensure_space(leading)
+            self.y -= leading
+            if line:
+                self.text(MARGIN, self.y, line, font, size, color)
+
+    def to_pdf(self):
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            None,  # page tree, filled in once the page objects are numbered
+        ]
+        font_refs = []
+        embedded_refs = {}
+        for font in FONTS:
+            if self.embedded:
+                ttf = self.embedded[font]
+                if ttf not in embedded_refs:
+                    embedded_refs[ttf] = self._embed(ttf, objects)
+                font_refs.append(embedded_refs[ttf])
+            else:
+                objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % font.encode())
+                font_refs.append(len(objects))
+        resources = b'<< /Font << %s >> >>' % b' '.join(
+            b'/F%d %d 0 R' % (index + 1, ref) for index, ref in enumerate(font_refs)
+        )
+
+        page_refs = []
+        for ops in self.pages:
+            stream = zlib.compress(b'\n'.join(ops))
+            objects.append(b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(stream), stream))
+            content_ref = len(objects)
+            objects.append(
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources %s /Contents %d 0 R >>'
+                % (PAGE_WIDTH, PAGE_HEIGHT, resources, content_ref)
+            )
+            page_refs.append(len(objects))
+        objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(b'%d 0 R' % ref for ref in page_refs), len(page_refs)
+        )
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            out += b'%010d 00000 n \n' % offset
+        out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        return bytes(out)
+
+    def _embed(self, ttf, objects):
+        """Append a Type0 font for ``ttf`` (glyph ids as character codes) to ``objects``; returns its number."""
+        used = sorted(self.used.get(ttf, {}).items())
+        # Subset fonts are named with a tag derived from their glyphs
+        tag = ''.join(chr(65 + byte % 26) for byte in hashlib.md5(repr(used).encode()).digest()[:6])
+        name = f'{tag}+{ttf.name}'.encode()
+        subset = ttf.subset(glyph for glyph, char in used)
+        font_file = zlib.compress(subset)
+        objects.append(b'<< /Length %d /Length1 %d /Filter /FlateDecode >>\nstream\n%s\nendstream'
+                       % (len(font_file), len(subset), font_file))
+        objects.append(
+            b'<< /Type /FontDescriptor /FontName /%s /Flags 32 /FontBBox [%d %d %d %d] /ItalicAngle 0'
+            b' /Ascent %d /Descent %d /CapHeight %d /StemV 80 /FontFile2 %d 0 R >>'
+            % (name, *ttf.bbox, ttf.ascent, ttf.descent, ttf.ascent, len(objects))
+        )
+        widths = b' '.join(b'%d [%d]' % (glyph, ttf.width(glyph)) for glyph, char in used)
+        objects.append(
+            b'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /%s'
+            b' /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >>'
+            b' /FontDescriptor %d 0 R /W [%s] /CIDToGIDMap /Identity >>' % (name, len(objects), widths)
+        )
+        # Maps glyph ids back to text, for copying and searching
+        mappings = ''.join(
+            f'<{glyph:04X}> <{char.encode("utf-16-be").hex().upper()}>\n' for glyph, char in used
+        )
+        cmap = (
+            '/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n'
+            '/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n'
+            '/CMapName /Adobe-Identity-UCS def /CMapType 2 def\n'
+            '1 begincodespacerange <0000> <FFFF> endcodespacerange\n'
+            + ''.join(
+                f'{len(chunk)} beginbfchar\n{"".join(chunk)}endbfchar\n'
+                for chunk in (mappings.splitlines(True)[i:i + 100] for i in range(0, len(used), 100))
+            )
+            + 'endcmap CMapName currentdict /CMap defineresource pop end end'
+        ).encode()
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(cmap), cmap))
+        objects.append(
+            b'<< /Type /Font /Subtype /Type0 /BaseFont /%s /Encoding /Identity-H'
+            b' /DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>' % (name, len(objects) - 1, len(objects))
+        )
+        return len(objects)
+
+
+def render_pdf(payload):
+    """Render a resume payload (see resume_payload) to PDF bytes.
+
+    Raises UnsupportedText for characters no configured font can show.
+    """
+    style = TEMPLATE_STYLES.get(payload['template_type'], TEMPLATE_STYLES['classic'])
+    embedded = None
+    text = ''.join(_payload_text(payload))
+    if not _is_latin(text):
+        embedded = unicode_fonts()
+        missing = set().union(*(ttf.missing(text) for ttf in set(embedded.values())))
+        if missing:
+            raise UnsupportedText(f'The PDF fonts cannot show these characters: {"".join(sorted(missing))}')
+    canvas = _Canvas(embedded)
+    body_font, heading_font = style['body_font'], style['heading_font']
+
+    # Header
+    contact = ' | '.join(
+        value for value in (payload['email'], payload['phone'], payload['address'],
+                            payload['linkedin'], payload['github']) if value
+    )
+    if style['band']:
+        canvas.rect(0, PAGE_HEIGHT - 110, PAGE_WIDTH, 110, style['band'])
+        canvas.text(MARGIN, PAGE_HEIGHT - 60, payload['full_name'], style['name_font'], 26, style['name_color'])
+        canvas.text(MARGIN, PAGE_HEIGHT - 85, contact, body_font, 9, (0.89, 0.91, 0.94))
+        canvas.y = PAGE_HEIGHT - 110 - 10
+    else:
+        canvas.y -= 26
+        canvas.text(MARGIN, canvas.y, payload['full_name'], style['name_font'], 26, style['name_color'])
+        canvas.y -= 18
+        canvas.text(MARGIN, canvas.y, contact, body_font, 9, (0.35, 0.35, 0.35))
+        canvas.y -= 10
+        canvas.line(MARGIN, canvas.y, PAGE_WIDTH - MARGIN, canvas.y, style['accent'], 1.2)
+
+    for field, title in SECTIONS:
+        value = payload[field]
+        if field == 'skills':
+            value = ', '.join(value)
+        if not value:
+            continue
+        canvas.ensure_space(40)
+        canvas.y -= 24
+        canvas.text(MARGIN, canvas.y, title.upper(), heading_font, 11.5, style['accent'])
+        canvas.y -= 5
+        canvas.line(MARGIN, canvas.y, PAGE_WIDTH - MARGIN, canvas.y, style['accent'], 0.5)
+        canvas.y -= 3
+        canvas.paragraph(value, body_font, 10, 14)
+
+    return canvas.to_pdf()
+
+
+def resume_payload(resume):
+    payload = {field: getattr(resume, field) for field in PAYLOAD_FIELDS}
+    skills = payload['skills']
+    payload['skills'] = list(skills) if isinstance(skills, (list, tuple)) else [str(skills)] if skills else []
+    return payload
+
+
+def cache_key(payload):
+    style = TEMPLATE_STYLES.get(payload['template_type'], TEMPLATE_STYLES['classic'])
+    material = json.dumps(
+        [RENDERER_VERSION, payload['template_type'], style['version'], payload],
+        sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def cache_dir():
+    return Path(getattr(settings, 'RESUME_PDF_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'resume_pdfs'))
+
+
+def cache_path(key):
+    return cache_dir() / key[:2] / f'{key}.pdf'
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    workers = getattr(settings, 'RESUME_PDF_WORKERS', 2)
+    if not workers:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+def _render(payload):
+    global _executor
+    executor = _get_executor()
+    if executor is None:
+        return render_pdf(payload)
+    future = executor.submit(render_pdf, payload)
+    try:
+        return future.result(timeout=getattr(settings, 'RESUME_PDF_TIMEOUT', 20))
+    except TimeoutError:
+        future.cancel()
+        raise RenderTimeout('Rendering the PDF took too long.')
+    except BrokenProcessPool:
+        _executor = None
+        return render_pdf(payload)
+
+
+def prune_cache(max_bytes=None, max_age=None):
+    """Delete expired PDFs, then the least recently used until under ``max_bytes``; returns the count."""
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'RESUME_PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+    if max_age is None:
+        max_age = getattr(settings, 'RESUME_PDF_CACHE_MAX_AGE', 30 * 24 * 3600)
+    files = []
+    for path in cache_dir().glob('*/*'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+    total = sum(size for mtime, size, path in files)
+    expired = time.time() - max_age
+    removed = 0
+    for mtime, size, path in files:
+        if mtime >= expired and total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _maybe_prune():
+    # A marker file shares the last run time between worker processes
+    marker = cache_dir() / '.pruned'
+    interval = getattr(settings, 'RESUME_PDF_PRUNE_INTERVAL', 3600)
+    try:
+        if time.time() - marker.stat().st_mtime < interval:
+            return
+    except FileNotFoundError:
+        pass
+    marker.touch()
+    prune_cache()
+
+
+def get_resume_pdf(resume):
+    """Return the path of the rendered PDF for ``resume``, rendering it on a miss.
+
+    Raises UnsupportedText or RenderTimeout (both PdfError) when it cannot.
+    """
+    payload = resume_payload(resume)
+    path = cache_path(cache_key(payload))
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    data = _render(payload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so concurrent requests never serve a partial file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    _maybe_prune()
+    return path
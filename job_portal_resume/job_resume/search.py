@@ -0,0 +1,175 @@
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Lookup, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import JobSearchEntry
+
+# Full-text search over Job postings, extracted CV text and resumes.
+#
+# On SQLite each searchable table is mirrored by an FTS5 external-content
+# table kept in sync by triggers (migrations 0006, 0011 and 0015), so inserts,
+# edits, status changes and deletes - including queryset.update() and bulk
+# deletes - never leave an index stale. Other backends fall back to
+# icontains scans.
+
+FTS_TABLE = 'job_resume_job_fts'
+CV_FTS_TABLE = 'job_resume_application_cv_fts'
+RESUME_FTS_TABLE = 'job_resume_resume_fts'
+
+# FTS table -> (content table, indexed columns)
+FTS_INDEXES = {
+    FTS_TABLE: ('job_resume_job', ['title', 'company', 'location', 'description']),
+    CV_FTS_TABLE: ('job_resume_application', ['cv_text']),
+    RESUME_FTS_TABLE: ('job_resume_resume', ['summary', 'work_experience']),
+}
+
+# bm25() weights, in the column order of the FTS table
+FTS_COLUMNS = ['title', 'company', 'location', 'description']
+FTS_WEIGHTS = {'title': 10.0, 'company': 5.0, 'location': 3.0, 'description': 1.0}
+
+# Tokens shorter than this are matched exactly instead of as a prefix,
+# otherwise "a*" would expand to half the vocabulary.
+MIN_PREFIX_LENGTH = 2
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(query):
+    # Every token must match (implicit AND); quoting keeps FTS5 operators and
+    # column filters typed by users from being interpreted.
+    terms = []
+    for token in TOKEN_RE.findall(query.lower()):
+        if len(token) >= MIN_PREFIX_LENGTH:
+            terms.append(f'"{token}"*')
+        else:
+            terms.append(f'"{token}"')
+    return ' '.join(terms)
+
+
+def rank_sql():
+    weights = ', '.join(str(FTS_WEIGHTS[column]) for column in FTS_COLUMNS)
+    return f'bm25({FTS_TABLE}, {weights})'
+
+
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+JobSearchEntry._meta.get_field('document').register_lookup(Match)
+
+
+def search_jobs(queryset, query):
+    """Filter a Job queryset to postings matching ``query``, best match first.
+
+    Results are annotated with ``search_rank`` (lower is better, as returned
+    by bm25()).
+    """
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset
+
+    if not fts_enabled():
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(company__icontains=query) |
+            Q(location__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    # The FTS table is joined once, as the search_entry relation: SQLite runs
+    # the MATCH, looks up each matching job by rowid, and bm25() ranks the
+    # joined row.
+    weights = [Value(FTS_WEIGHTS[column]) for column in FTS_COLUMNS]
+    rank = Func(F('search_entry__document'), *weights, function='bm25', output_field=FloatField())
+    return (
+        queryset.filter(search_entry__document__match=expression)
+        .annotate(search_rank=rank)
+        .order_by('search_rank', '-created_at', '-id')
+    )
+
+
+def search_applications(queryset, query):
+    """Filter an Application queryset to those whose extracted CV text matches ``query``."""
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset
+    if not fts_enabled():
+        return queryset.filter(cv_text__icontains=query)
+    matches = RawSQL(
+        f'SELECT rowid FROM {CV_FTS_TABLE} WHERE {CV_FTS_TABLE} MATCH %s',
+        [expression],
+    )
+    return queryset.filter(id__in=matches)
+
+
+def search_resumes(queryset, query):
+    """Filter a Resume queryset to those whose summary or work experience matches ``query``."""
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset
+    if not fts_enabled():
+        return queryset.filter(Q(summary__icontains=query) | Q(work_experience__icontains=query))
+    matches = RawSQL(
+        f'SELECT rowid FROM {RESUME_FTS_TABLE} WHERE {RESUME_FTS_TABLE} MATCH %s',
+        [expression],
+    )
+    return queryset.filter(id__in=matches)
+
+
+def rebuild_index(fts_table=None):
+    if not fts_enabled():
+        return False
+    with connection.cursor() as cursor:
+        for table in [fts_table] if fts_table else FTS_INDEXES:
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    return True
+
+
+def _trigger_sql(fts_table):
+    content_table, columns = FTS_INDEXES[fts_table]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    insert = f'INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});'
+    delete = (f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+              f"VALUES ('delete', old.id, {old_values});")
+    return {
+        f'{fts_table}_ai': f'CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {content_table} BEGIN {insert} END',
+        f'{fts_table}_ad': f'CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {content_table} BEGIN {delete} END',
+        f'{fts_table}_au': (f'CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {column_list} ON {content_table} '
+                            f'BEGIN {delete} {insert} END'),
+    }
+
+
+def ensure_fts_triggers(using='default', **kwargs):
+    """Recreate sync triggers dropped by SQLite table rebuilds (post_migrate).
+
+    Django applies many SQLite schema changes by copying the table, which
+    silently drops its triggers; an index that lost them is rebuilt.
+    """
+    from django.db import connections
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+        for fts_table in FTS_INDEXES:
+            if fts_table not in existing:
+                continue
+            missing = {name: sql for name, sql in _trigger_sql(fts_table).items() if name not in existing}
+            for sql in missing.values():
+                cursor.execute(sql)
+            if missing:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
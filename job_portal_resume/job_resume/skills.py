@@ -0,0 +1,105 @@
+import re
+
+from django.db.models import Count
+from django.db.models.signals import post_save
+
+from .models import Resume, Skill
+
+# Normalized skill catalog.
+#
+# Resume.skills keeps the list exactly as the user typed it for rendering;
+# every save also links the resume to canonical Skill rows through the
+# Resume.skill_set many-to-many, so "which resumes list Django" and skill
+# frequency stats are index scans on the join table instead of decoding the
+# JSON of every resume. Names are case-folded, whitespace-collapsed and
+# merged through ALIASES ("ReactJS", "react.js" and "React" are one skill).
+
+ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'k8s': 'kubernetes',
+    'py': 'python',
+    'python3': 'python',
+    'ml': 'machine learning',
+    'aws cloud': 'aws',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+    'c sharp': 'c#',
+    'cpp': 'c++',
+    'drf': 'django rest framework',
+}
+
+MAX_LENGTH = Skill._meta.get_field('name').max_length
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize(label):
+    name = _SPACE_RE.sub(' ', label.casefold()).strip(' .,;:')
+    return ALIASES.get(name, name)[:MAX_LENGTH]
+
+
+def normalized(labels):
+    """``{name: label}`` for the distinct skills in ``labels``, first spelling wins."""
+    names = {}
+    for label in labels or []:
+        if not isinstance(label, str):
+            continue
+        name = normalize(label)
+        if name and name not in names:
+            names[name] = label.strip()[:MAX_LENGTH]
+    return names
+
+
+def get_or_create_skills(names):
+    """Map ``{name: label}`` to ``{name: skill_id}``, creating missing skills in one insert."""
+    if not names:
+        return {}
+    ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [Skill(name=name, label=label) for name, label in names.items() if name not in ids]
+    if missing:
+        # ignore_conflicts: another request may have created the same skill
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        ids.update(Skill.objects.filter(name__in=[skill.name for skill in missing]).values_list('name', 'id'))
+    return ids
+
+
+def sync_resume_skills(resume):
+    ids = get_or_create_skills(normalized(resume.skills))
+    resume.skill_set.set(ids.values())
+
+
+def resumes_with_skill(label, queryset=None):
+    queryset = Resume.objects.all() if queryset is None else queryset
+    return queryset.filter(skill_set__name=normalize(label))
+
+
+def skill_frequencies(limit=20):
+    """Most listed skills as ``[(label, resume_count), ...]``."""
+    Link = Resume.skill_set.through
+    rows = (
+        Link.objects.values('skill_id').annotate(total=Count('resume_id'))
+        .order_by('-total')[:limit]
+    )
+    rows = list(rows)
+    labels = dict(Skill.objects.filter(id__in=[row['skill_id'] for row in rows]).values_list('id', 'label'))
+    return [(labels[row['skill_id']], row['total']) for row in rows]
+
+
+def _on_resume_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_resume_skills(instance)
+
+
+def connect_signals():
+    post_save.connect(_on_resume_saved, sender=Resume, dispatch_uid='skills_resume_saved')
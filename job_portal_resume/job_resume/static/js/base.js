@@ -0,0 +1,180 @@
+// Enhanced UI JavaScript
+document.addEventListener('DOMContentLoaded', function () {
+    // Back to Top Button Functionality
+    const backToTopBtn = document.getElementById('backToTop');
+
+    // Show/hide back to top button based on scroll position
+    window.addEventListener('scroll', function () {
+        if (window.pageYOffset > 300) {
+            backToTopBtn.classList.add('show');
+        } else {
+            backToTopBtn.classList.remove('show');
+        }
+    });
+
+    // Smooth scroll to top when button is clicked
+    backToTopBtn.addEventListener('click', function () {
+        window.scrollTo({
+            top: 0,
+            behavior: 'smooth'
+        });
+    });
+
+    // Enhanced Navbar Functionality
+    const navbar = document.querySelector('.navbar-custom');
+    const navbarToggler = document.querySelector('.navbar-toggler-custom');
+    const navbarCollapse = document.querySelector('.navbar-collapse');
+
+    // Add scroll effect to navbar
+    window.addEventListener('scroll', function () {
+        if (window.scrollY > 50) {
+            navbar.style.boxShadow = 'var(--shadow-lg)';
+        } else {
+            navbar.style.boxShadow = 'var(--shadow)';
+        }
+    });
+
+    // Close navbar when clicking outside on mobile
+    document.addEventListener('click', function (event) {
+        const isClickInsideNavbar = navbar.contains(event.target);
+        if (!isClickInsideNavbar && navbarCollapse.classList.contains('show')) {
+            const bsCollapse = new bootstrap.Collapse(navbarCollapse, {
+                hide: true
+            });
+        }
+    });
+
+    // Enhanced Alert Dismissal
+    const alerts = document.querySelectorAll('.alert-custom');
+    alerts.forEach(alert => {
+        const closeBtn = alert.querySelector('.btn-close');
+        if (closeBtn) {
+            closeBtn.addEventListener('click', function () {
+                alert.style.animation = 'slideOut 0.3s ease-out forwards';
+                setTimeout(() => {
+                    alert.remove();
+                }, 300);
+            });
+        }
+    });
+
+
+
+    // Enhanced Dropdown Animation
+    const dropdowns = document.querySelectorAll('.dropdown');
+    dropdowns.forEach(dropdown => {
+        const toggle = dropdown.querySelector('.dropdown-toggle');
+        const menu = dropdown.querySelector('.dropdown-menu');
+
+        toggle.addEventListener('shown.bs.dropdown', function () {
+            menu.style.animation = 'fadeInDown 0.3s ease-out';
+        });
+
+        toggle.addEventListener('hidden.bs.dropdown', function () {
+            menu.style.animation = '';
+        });
+    });
+
+    // Keyboard Navigation Enhancements
+    document.addEventListener('keydown', function (e) {
+        // Close navbar with Escape key
+        if (e.key === 'Escape' && navbarCollapse.classList.contains('show')) {
+            const bsCollapse = new bootstrap.Collapse(navbarCollapse, {
+                hide: true
+            });
+        }
+    });
+
+    // Add fade-in animation to elements
+    const observerOptions = {
+        threshold: 0.1,
+        rootMargin: '0px 0px -50px 0px'
+    };
+
+    const observer = new IntersectionObserver(function (entries) {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.style.opacity = '1';
+                entry.target.style.transform = 'translateY(0)';
+            }
+        });
+    }, observerOptions);
+
+    // Observe elements for animation
+    const animateElements = document.querySelectorAll('.fade-in-up');
+    animateElements.forEach(el => {
+        el.style.opacity = '0';
+        el.style.transform = 'translateY(20px)';
+        el.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        observer.observe(el);
+    });
+
+    // Performance Optimization: Lazy load images if any
+    const images = document.querySelectorAll('img[data-src]');
+    if (images.length > 0) {
+        const imageObserver = new IntersectionObserver(function (entries) {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    const img = entry.target;
+                    img.src = img.dataset.src;
+                    img.classList.remove('lazy');
+                    imageObserver.unobserve(img);
+                }
+            });
+        });
+
+        images.forEach(img => imageObserver.observe(img));
+    }
+
+    // Add CSS animations
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes fadeInDown {
+            from {
+                opacity: 0;
+                transform: translateY(-10px);
+            }
+            to {
+                opacity: 1;
+                transform: translateY(0);
+            }
+        }
+
+        @keyframes slideOut {
+            from {
+                opacity: 1;
+                transform: translateX(0);
+            }
+            to {
+                opacity: 0;
+                transform: translateX(100%);
+            }
+        }
+
+        .fade-in-up {
+            transition: opacity 0.6s ease, transform 0.6s ease;
+        }
+    `;
+    document.head.appendChild(style);
+
+    // Service Worker Registration (if needed in future)
+    if ('serviceWorker' in navigator) {
+        // Register service worker for PWA capabilities
+        // navigator.serviceWorker.register('/sw.js');
+    }
+});
+
+// Error Handling
+window.addEventListener('error', function (e) {
+    console.error('JavaScript Error:', e.error);
+    // Could send error reports to monitoring service
+});
+
+// Performance Monitoring
+window.addEventListener('load', function () {
+    // Log performance metrics
+    if ('performance' in window) {
+        const perfData = performance.getEntriesByType('navigation')[0];
+        console.log('Page load time:', perfData.loadEventEnd - perfData.fetchStart, 'ms');
+    }
+});
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+import threading
+
+from django.core.files.storage import FileSystemStorage
+from django.core.signals import request_finished
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal
+from django.utils.deconstruct import deconstructible
+
+# Content-addressed, deduplicated storage for uploads.
+#
+# Uploads are hashed while being streamed to disk and stored once under
+# ``<upload_to>/<aa>/<sha256>.<ext>``. If the same bytes are uploaded again,
+# the stored blob is reused. StoredFile counts how many rows reference each
+# blob. The count is updated by the signal handlers below whenever a tracked
+# file field changes. A blob is removed from disk only when its last
+# reference goes away.
+#
+# Removing a blob and referencing it again race: an upload can find the blob
+# on disk in _save() just before the last reference to it is released and the
+# blob deleted. Both sides lock the StoredFile row, the delete re-checks the
+# count under that lock, and an upload that found the blob already on disk
+# keeps its own copy until add_reference() has seen the blob still there
+# (after its row write, so also on SQLite, which ignores row locks) and puts
+# the copy in place if it is not. A copy nobody claims - the field already
+# pointed at that blob, or the model save failed - is deleted when the
+# instance is saved or, at the latest, when the request finishes.
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+_local = threading.local()
+
+
+def _pending_uploads():
+    # blob name -> temporary copy of an upload whose blob already existed
+    if not hasattr(_local, 'uploads'):
+        _local.uploads = {}
+    return _local.uploads
+
+
+def discard_pending(name=None):
+    # Deletes the temporary copy kept for ``name``, or every one kept by this thread
+    uploads = _pending_uploads()
+    for blob_name in [name] if name else list(uploads):
+        path = uploads.pop(blob_name, None)
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+# Sent after a tracked file field of a saved instance points at a different
+# blob; receives ``instance``, ``field``, ``old_name`` and ``new_name``.
+stored_file_changed = Signal()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save()
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        target_dir = os.path.join(self.location, directory)
+        os.makedirs(target_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            blob_name = posixpath.join(directory, hexdigest[:2], f'{hexdigest}{extension}')
+            blob_path = self.path(blob_name)
+            if os.path.exists(blob_path):
+                discard_pending(blob_name)
+                _pending_uploads()[blob_name] = tmp_path
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(tmp_path, blob_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(blob_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return blob_name
+
+
+def blob_storage():
+    return ContentAddressedStorage()
+
+
+def blob_name_for(path, directory):
+    """Return the content-addressed name for an existing file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    hexdigest = digest.hexdigest()
+    extension = os.path.splitext(path)[1].lower()
+    return posixpath.join(directory, hexdigest[:2], f'{hexdigest}{extension}')
+
+
+# Reference counting
+
+def tracked_fields():
+    from .models import Application, UserProfile
+    return {Application: 'cv_pdf', UserProfile: 'profile_picture'}
+
+
+def add_reference(name):
+    from .models import StoredFile
+    storage = blob_storage()
+    pending = _pending_uploads().pop(name, None)
+    try:
+        with transaction.atomic():
+            if StoredFile.objects.select_for_update().filter(name=name).exists():
+                StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+            else:
+                try:
+                    with transaction.atomic():
+                        size = storage.size(name) if storage.exists(name) else 0
+                        StoredFile.objects.create(name=name, size=size, ref_count=1)
+                except IntegrityError:
+                    StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+            # Any release that deleted the blob after _save() found it has
+            # committed by now
+            if pending and not storage.exists(name):
+                os.replace(pending, storage.path(name))
+                pending = None
+                StoredFile.objects.filter(name=name).update(size=storage.size(name))
+    finally:
+        if pending and os.path.exists(pending):
+            os.unlink(pending)
+
+
+def release_reference(name):
+    from .models import StoredFile
+    StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') - 1)
+
+    def delete_if_unreferenced():
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            # Re-checked under the lock: the blob may have been referenced again
+            if stored is not None and stored.ref_count <= 0:
+                stored.delete()
+                blob_storage().delete(name)
+
+    transaction.on_commit(delete_if_unreferenced)
+
+
+def _remember_file(sender, instance, **kwargs):
+    field = tracked_fields()[sender]
+    if instance.pk is not None and field not in instance.__dict__:
+        # Deferred: the row's file is unknown and will not be written by save()
+        instance._stored_file_name = None
+        return
+    value = instance.__dict__.get(field)
+    instance._stored_file_name = str(value) if value else ''
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    field = tracked_fields()[sender]
+    old = getattr(instance, '_stored_file_name', '')
+    if old is None:
+        return
+    value = getattr(instance, field)
+    new = value.name if value else ''
+    if new == old:
+        # Re-uploaded the same bytes: this row's reference keeps the blob
+        if new:
+            discard_pending(new)
+    else:
+        if new:
+            add_reference(new)
+        if old:
+            release_reference(old)
+        instance._stored_file_name = new
+        stored_file_changed.send(sender=sender, instance=instance, field=field, old_name=old, new_name=new)
+
+
+def _on_delete(sender, instance, **kwargs):
+    name = getattr(instance, '_stored_file_name', '')
+    if name:
+        release_reference(name)
+
+
+def _on_request_finished(sender, **kwargs):
+    discard_pending()
+
+
+def connect_signals():
+    request_finished.connect(_on_request_finished, dispatch_uid='storage_request_finished')
+    for model in tracked_fields():
+        post_init.connect(_remember_file, sender=model, dispatch_uid=f'storage_init_{model.__name__}')
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'storage_save_{model.__name__}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'storage_delete_{model.__name__}')
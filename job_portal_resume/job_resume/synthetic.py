@@ -0,0 +1,205 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from . import candidates, facets, job_facets
+from .candidates import location_key
+from .counters import recount
+from .models import Application, Job, Resume, User, UserProfile
+from .skills import get_or_create_skills, normalized
+
+# Synthetic bulk data for load testing (`manage.py generate_data`).
+#
+# Rows are written with batched bulk_create(), one transaction per batch, and
+# only primary keys are kept between phases, so millions of jobs and
+# applications fit in memory. bulk_create() skips model signals, so the
+# columns and tables they maintain are filled in here instead: Resume.location
+# and searchable, the Resume.skill_set links, and the dashboard counters
+# (recounted at the end). The FTS indexes are kept by database triggers. Every
+# generated user has the password PASSWORD.
+
+PASSWORD = 'password'
+
+ROLE_WEIGHTS = {'job_seeker': 0.85, 'employer': 0.14, 'admin': 0.01}
+JOB_STATUS_WEIGHTS = {'approved': 0.8, 'pending': 0.15, 'rejected': 0.05}
+APPLICATION_STATUS_WEIGHTS = {'applied': 0.7, 'shortlisted': 0.15, 'rejected': 0.12, 'hired': 0.03}
+
+SENIORITY = ['Junior', 'Mid-level', 'Senior', 'Lead', 'Principal', 'Staff']
+ROLES = [
+    'Python Developer', 'Backend Engineer', 'Frontend Developer', 'Full Stack Engineer', 'Data Analyst',
+    'Data Engineer', 'DevOps Engineer', 'Site Reliability Engineer', 'Mobile Developer', 'QA Engineer',
+    'Product Manager', 'UX Designer', 'Security Engineer', 'Machine Learning Engineer', 'Support Engineer',
+    'Accountant', 'Marketing Manager', 'Sales Representative', 'Registered Nurse', 'Technical Writer',
+]
+COMPANIES = [
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Wonka',
+    'Soylent', 'Cyberdyne', 'Tyrell', 'Aperture', 'Vandelay', 'Pied Piper', 'Massive Dynamic', 'Oscorp',
+]
+CITIES = [
+    'Dhaka', 'Chittagong', 'Berlin', 'London', 'Toronto', 'Austin', 'Remote', 'Singapore', 'Lagos',
+    'Bangalore', 'Sydney', 'Amsterdam', 'New York', 'Dubai', 'Nairobi', 'Sao Paulo',
+]
+SKILLS = [
+    'Python', 'Django', 'Flask', 'React', 'Vue', 'TypeScript', 'JavaScript', 'Node.js', 'Go', 'Rust',
+    'Java', 'Kotlin', 'Swift', 'C#', 'PHP', 'SQL', 'PostgreSQL', 'MySQL', 'Redis', 'AWS', 'Google Cloud',
+    'Docker', 'Kubernetes', 'Terraform', 'Linux', 'Git', 'Spark', 'Machine Learning', 'Excel', 'Figma',
+    'Salesforce', 'SEO', 'Communication', 'Leadership', 'Agile', 'Scrum',
+]
+PHRASES = [
+    'We are looking for someone to join our growing team.',
+    'You will design, build and maintain services used by thousands of customers.',
+    'Experience with automated testing and code review is expected.',
+    'You will work closely with product, design and operations.',
+    'We offer flexible hours, remote work and a learning budget.',
+    'Strong written and spoken communication skills are required.',
+    'Comfortable owning features from idea to production.',
+    'Mentored junior colleagues and led technical planning.',
+    'Improved page load times and reduced infrastructure costs.',
+    'Built internal tools that automated manual reporting.',
+    'Migrated legacy systems to a modern cloud platform.',
+    'Collaborated with stakeholders to define requirements.',
+]
+
+
+def _choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _prose(rng, sentences, extra=()):
+    words = rng.choices(PHRASES, k=sentences)
+    words.extend(f'Experience with {term}.' for term in extra)
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def _batches(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield start, min(batch_size, total - start)
+
+
+class Generator:
+
+    def __init__(self, seed=42, batch_size=5000, prefix='synth', log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.log = log or (lambda message: None)
+        self.password = make_password(PASSWORD)
+        self.user_ids = {role: [] for role in ROLE_WEIGHTS}
+        self.job_ids = []
+
+    def users(self, role, total):
+        rng = self.rng
+        start = User.objects.filter(username__startswith=f'{self.prefix}_{role}').count()
+        for offset, count in _batches(total, self.batch_size):
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=f'{self.prefix}_{role}{start + offset + i}', role=role, password=self.password,
+                         email=f'{self.prefix}_{role}{start + offset + i}@example.com')
+                    for i in range(count)
+                ])
+                profiles = []
+                for user in users:
+                    profile = UserProfile(user=user, full_name=user.username.replace('_', ' ').title(),
+                                          address=f'{rng.randint(1, 999)} Main St, {rng.choice(CITIES)}',
+                                          profile_visibility=rng.random() >= 0.1)
+                    if role == 'employer':
+                        profile.company_name = rng.choice(COMPANIES)
+                    profiles.append(profile)
+                UserProfile.objects.bulk_create(profiles)
+            self.user_ids[role].extend(user.id for user in users)
+            if role == 'job_seeker':
+                hidden = {profile.user_id for profile in profiles if not profile.profile_visibility}
+                self.resumes(users, hidden)
+        self.log(f'{total} {role} users')
+
+    def resumes(self, users, hidden):
+        rng = self.rng
+        Link = Resume.skill_set.through
+        resumes = []
+        for user in users:
+            for i in range(1 if rng.random() < 0.8 else 2):
+                address = f'{rng.randint(1, 999)} Main St, {rng.choice(CITIES)}'
+                skills = rng.sample(SKILLS, rng.randint(3, 10))
+                resumes.append(Resume(
+                    user_id=user.id, name='My Resume' if i == 0 else 'Alternate Resume',
+                    template_type=rng.choice(Resume.TEMPLATE_CHOICES)[0],
+                    full_name=user.username.replace('_', ' ').title(), email=user.email,
+                    phone=f'+1555{rng.randint(1000000, 9999999)}', address=address,
+                    location=location_key(address), searchable=user.id not in hidden, skills=skills,
+                    summary=_prose(rng, 3, skills[:2]),
+                    work_experience=_prose(rng, 8, skills[2:5]),
+                    education='BSc Computer Science', projects=_prose(rng, 2),
+                ))
+        with transaction.atomic():
+            Resume.objects.bulk_create(resumes)
+            names = {}
+            for resume in resumes:
+                names.update(normalized(resume.skills))
+            ids = get_or_create_skills(names)
+            Link.objects.bulk_create([
+                Link(resume_id=resume.id, skill_id=ids[name])
+                for resume in resumes for name in normalized(resume.skills)
+            ])
+
+    def jobs(self, total):
+        rng = self.rng
+        employers = self.user_ids['employer']
+        if not employers:
+            return
+        for _, count in _batches(total, self.batch_size):
+            batch = []
+            for _ in range(count):
+                role = rng.choice(ROLES)
+                batch.append(Job(
+                    title=f'{rng.choice(SENIORITY)} {role}', company=rng.choice(COMPANIES),
+                    location=rng.choice(CITIES), posted_by_id=rng.choice(employers),
+                    status=_choice(rng, JOB_STATUS_WEIGHTS),
+                    salary=Decimal(rng.randrange(20000, 200000, 1000)) if rng.random() < 0.7 else None,
+                    description=_prose(rng, 10, rng.sample(SKILLS, 4)),
+                ))
+            with transaction.atomic():
+                Job.objects.bulk_create(batch)
+            self.job_ids.extend(job.id for job in batch if job.status == 'approved')
+        self.log(f'{total} jobs')
+
+    def applications(self, total):
+        rng = self.rng
+        seekers, jobs = self.user_ids['job_seeker'], self.job_ids
+        if not seekers or not jobs:
+            return
+        before = Application.objects.count()
+        for _, count in _batches(total, self.batch_size):
+            batch = []
+            for _ in range(count):
+                user_id = rng.choice(seekers)
+                batch.append(Application(user_id=user_id, job_id=rng.choice(jobs), name=f'Applicant {user_id}',
+                                         phone=f'+1555{rng.randint(1000000, 9999999)}',
+                                         status=_choice(rng, APPLICATION_STATUS_WEIGHTS)))
+            with transaction.atomic():
+                # ignore_conflicts: the same (user, job) pair may be drawn twice
+                Application.objects.bulk_create(batch, ignore_conflicts=True)
+        self.log(f'{Application.objects.count() - before} applications')
+
+    def finish(self):
+        recount()
+        facets.invalidate(job_facets.FACET_NAMESPACE)
+        facets.invalidate(candidates.FACET_NAMESPACE)
+
+
+def generate(users=1000, jobs=10000, applications=50000, seed=42, batch_size=5000, prefix='synth', log=None):
+    """Create ``users`` users split over the roles by ROLE_WEIGHTS, then jobs and applications.
+
+    Job seekers get one or two resumes each, employers post the jobs and
+    applications go to approved jobs. Returns the Generator, whose
+    ``user_ids`` and ``job_ids`` list what was created.
+    """
+    generator = Generator(seed=seed, batch_size=batch_size, prefix=prefix, log=log)
+    for role, weight in ROLE_WEIGHTS.items():
+        generator.users(role, max(1, round(users * weight)))
+    generator.jobs(jobs)
+    generator.applications(applications)
+    generator.finish()
+    return generator
@@ -0,0 +1,196 @@
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .matching import JOB_FIELDS, score_applications
+from .models import Application, BackgroundTask, Job, Resume
+from .pdf_text import extract_text
+from .storage import stored_file_changed
+
+# A small DB-backed work queue.
+#
+# Request handlers only INSERT a BackgroundTask row; `manage.py run_worker`
+# claims pending rows in batches, runs the handler registered for each kind
+# and records the outcome. Failed tasks are retried with exponential backoff
+# until MAX_ATTEMPTS, then left as 'failed' with the last error.
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 30
+STALE_AFTER = timedelta(minutes=10)
+
+EXTRACT_CV_TEXT = 'extract_cv_text'
+SCORE_APPLICATIONS = 'score_applications'  # object_id is the job
+RESCORE_APPLICANT = 'rescore_applicant'  # object_id is the user
+
+
+def enqueue(kind, object_id):
+    return BackgroundTask.objects.create(kind=kind, object_id=object_id)
+
+
+def enqueue_once(kind, object_id):
+    # For tasks that redo the whole job: one still waiting covers this change
+    if BackgroundTask.objects.filter(kind=kind, object_id=object_id, status='pending').exists():
+        return None
+    return enqueue(kind, object_id)
+
+
+def worker_token():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def claim_batch(batch_size, kinds=None):
+    """Atomically mark up to ``batch_size`` due tasks as running and return them."""
+    now = timezone.now()
+    token = worker_token()
+    with transaction.atomic():
+        due = BackgroundTask.objects.filter(status='pending', run_after__lte=now)
+        if kinds:
+            due = due.filter(kind__in=kinds)
+        ids = list(
+            due.order_by('run_after', 'id').select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        # Re-checking status makes the claim safe on backends without row
+        # locks: a row another worker took in the meantime is not updated.
+        BackgroundTask.objects.filter(id__in=ids, status='pending').update(
+            status='running', locked_by=token, locked_at=now, attempts=F('attempts') + 1,
+        )
+    return list(BackgroundTask.objects.filter(locked_by=token, status='running').order_by('id'))
+
+
+def mark_done(tasks):
+    BackgroundTask.objects.filter(id__in=[task.id for task in tasks]).update(
+        status='done', locked_by='', locked_at=None, last_error='',
+    )
+
+
+def mark_failed(task, error, max_attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS):
+    if task.attempts >= max_attempts:
+        status, run_after = 'failed', task.run_after
+    else:
+        status, run_after = 'pending', timezone.now() + timedelta(seconds=backoff * 2 ** (task.attempts - 1))
+    BackgroundTask.objects.filter(id=task.id).update(
+        status=status, run_after=run_after, locked_by='', locked_at=None, last_error=str(error)[:2000],
+    )
+
+
+def requeue_stale(stale_after=STALE_AFTER):
+    # Tasks whose worker died mid-batch
+    return BackgroundTask.objects.filter(status='running', locked_at__lt=timezone.now() - stale_after).update(
+        status='pending', locked_by='', locked_at=None,
+    )
+
+
+# Handlers take the claimed tasks of one kind and return {task_id: error}
+# for the ones that failed.
+
+def extract_cv_texts(tasks):
+    applications = Application.objects.only('id', 'cv_pdf').in_bulk([task.object_id for task in tasks])
+    errors, extracted = {}, []
+    for task in tasks:
+        application = applications.get(task.object_id)
+        if application is None or not application.cv_pdf:
+            continue  # deleted or CV removed since it was queued
+        try:
+            application.cv_text = extract_text(application.cv_pdf.path)
+        except Exception as exc:
+            errors[task.id] = f'{type(exc).__name__}: {exc}'
+        else:
+            extracted.append(application)
+    Application.objects.bulk_update(extracted, ['cv_text'])
+    return errors
+
+
+def score_job_applications(tasks):
+    by_job = {}
+    for task in tasks:
+        by_job.setdefault(task.object_id, []).append(task)
+    jobs = Job.objects.in_bulk(list(by_job))
+    errors = {}
+    for job_id, job_tasks in by_job.items():
+        job = jobs.get(job_id)
+        if job is None:
+            continue  # deleted since it was queued
+        try:
+            score_applications(job)
+        except Exception as exc:
+            errors.update({task.id: f'{type(exc).__name__}: {exc}' for task in job_tasks})
+    return errors
+
+
+def rescore_applicants(tasks):
+    # Their resumes changed: every job they applied to scores them again
+    user_ids = {task.object_id for task in tasks}
+    Application.objects.filter(user_id__in=user_ids).update(match_scored_at=None)
+    for job in Job.objects.filter(applications__user_id__in=user_ids).distinct().iterator(chunk_size=200):
+        score_applications(job)
+    return {}
+
+
+HANDLERS = {
+    EXTRACT_CV_TEXT: extract_cv_texts,
+    SCORE_APPLICATIONS: score_job_applications,
+    RESCORE_APPLICANT: rescore_applicants,
+}
+
+
+def run_batch(batch_size, kinds=None, max_attempts=MAX_ATTEMPTS, backoff=BACKOFF_SECONDS):
+    """Claim and process one batch; returns the number of tasks claimed."""
+    tasks = claim_batch(batch_size, kinds)
+    by_kind = {}
+    for task in tasks:
+        by_kind.setdefault(task.kind, []).append(task)
+
+    for kind, kind_tasks in by_kind.items():
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            errors = {task.id: f'No handler for task kind {kind!r}' for task in kind_tasks}
+        else:
+            try:
+                errors = handler(kind_tasks)
+            except Exception as exc:
+                errors = {task.id: f'{type(exc).__name__}: {exc}' for task in kind_tasks}
+        mark_done([task for task in kind_tasks if task.id not in errors])
+        for task in kind_tasks:
+            if task.id in errors:
+                mark_failed(task, errors[task.id], max_attempts, backoff)
+    return len(tasks)
+
+
+def _on_cv_changed(sender, instance, field, new_name, **kwargs):
+    if field == 'cv_pdf' and new_name:
+        transaction.on_commit(lambda: enqueue(EXTRACT_CV_TEXT, instance.pk))
+
+
+def _on_application_saved(sender, instance, created, **kwargs):
+    if created:
+        job_id = instance.job_id
+        transaction.on_commit(lambda: enqueue_once(SCORE_APPLICATIONS, job_id))
+
+
+def _on_job_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not set(update_fields) & set(JOB_FIELDS)):
+        return  # no applications yet, or the text did not change
+    job_id = instance.pk
+    transaction.on_commit(lambda: enqueue_once(SCORE_APPLICATIONS, job_id))
+
+
+def _on_resume_changed(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: enqueue_once(RESCORE_APPLICANT, user_id))
+
+
+def connect_signals():
+    stored_file_changed.connect(_on_cv_changed, sender=Application, dispatch_uid='tasks_cv_changed')
+    post_save.connect(_on_application_saved, sender=Application, dispatch_uid='tasks_application_saved')
+    post_save.connect(_on_job_saved, sender=Job, dispatch_uid='tasks_job_saved')
+    post_save.connect(_on_resume_changed, sender=Resume, dispatch_uid='tasks_resume_saved')
+    post_delete.connect(_on_resume_changed, sender=Resume, dispatch_uid='tasks_resume_deleted')
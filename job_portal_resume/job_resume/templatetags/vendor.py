@@ -0,0 +1,10 @@
+from django import template
+
+from ..assets import asset_tag
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    return asset_tag(name)
@@ -1,3 +1,453 @@
-from django.test import TestCase
+import datetime
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.signals import request_finished
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import assets, counters, imports, moderation, tasks
+from .models import Application, BackgroundTask, Job, StoredFile, User
+from .pagination import paginate
+from .query_budgets import QueryBudgetTestMixin
+
+
+class AdminDashboardQueryTests(TestCase):
+    """The dashboard and its panels run a fixed number of queries, however many rows there are."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='x', role='admin')
+        employer = User.objects.create_user('employer', password='x', role='employer')
+        jobs = [
+            Job.objects.create(title=f'Job {i}', description='Django', company='Acme', location='Berlin',
+                               salary=50000, posted_by=employer, status='approved')
+            for i in range(15)
+        ]
+        for i in range(15):
+            seeker = User.objects.create_user(f'seeker{i}', password='x', role='job_seeker')
+            for job in jobs[:3]:
+                Application.objects.create(user=seeker, job=job, name=seeker.username, phone='1')
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.client.force_login(self.admin)
+
+    def assertQueries(self, url_name, expected):
+        url = reverse(f'job_resume:{url_name}')
+        with self.assertNumQueries(expected):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard(self):
+        self.assertQueries('admin_dashboard', 2)
+
+    def test_jobs_panel(self):
+        self.assertQueries('admin_dashboard_jobs', 2)
+
+    def test_users_panel(self):
+        self.assertQueries('admin_dashboard_users', 2)
+
+    def test_applications_panel(self):
+        self.assertQueries('admin_dashboard_applications', 2)
+
+
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    pass
+
+
+class StorageTests(TestCase):
+    """Uploads are stored once per content and deleted with their last reference."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        employer = User.objects.create_user('employer', password='x', role='employer')
+        self.job = Job.objects.create(title='Job', description='Django', company='Acme', location='Berlin',
+                                      salary=50000, posted_by=employer, status='approved')
+
+    def apply(self, username, content):
+        seeker = User.objects.create_user(username, password='x', role='job_seeker')
+        application = Application.objects.create(user=seeker, job=self.job, name=username, phone='1')
+        application.cv_pdf.save('cv.pdf', ContentFile(content))
+        return application
+
+    def leftover_uploads(self):
+        return list(Path(self.media).rglob('*.upload'))
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.apply('a', b'%PDF same bytes')
+        second = self.apply('b', b'%PDF same bytes')
+        self.assertEqual(first.cv_pdf.name, second.cv_pdf.name)
+        self.assertEqual(StoredFile.objects.get(name=first.cv_pdf.name).ref_count, 2)
+        self.assertEqual(self.leftover_uploads(), [])
+
+    def test_blob_deleted_with_last_reference(self):
+        first = self.apply('a', b'%PDF same bytes')
+        second = self.apply('b', b'%PDF same bytes')
+        name, path = first.cv_pdf.name, first.cv_pdf.path
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(Path(path).exists())
+        self.assertEqual(StoredFile.objects.get(name=name).ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(Path(path).exists())
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_reuploading_same_file_leaves_no_temporary_copy(self):
+        application = self.apply('a', b'%PDF same bytes')
+        application.cv_pdf.save('cv.pdf', ContentFile(b'%PDF same bytes'))
+        self.assertEqual(self.leftover_uploads(), [])
+        self.assertEqual(StoredFile.objects.get(name=application.cv_pdf.name).ref_count, 1)
+
+    def test_unclaimed_copy_removed_when_request_finishes(self):
+        application = self.apply('a', b'%PDF same bytes')
+        application.cv_pdf.storage.save('applications/cv.pdf', ContentFile(b'%PDF same bytes'))
+        self.assertEqual(len(self.leftover_uploads()), 1)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(self.leftover_uploads(), [])
+
+
+class BulkApplicationStatusTests(TestCase):
+    """Bulk status changes update only the employer's matching rows and keep the counters exact."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='x', role='employer')
+        other = User.objects.create_user('other', password='x', role='employer')
+        cls.job = Job.objects.create(title='Job', description='Django', company='Acme', location='Berlin',
+                                     salary=50000, posted_by=cls.employer, status='approved')
+        other_job = Job.objects.create(title='Other', description='Django', company='Acme', location='Berlin',
+                                       salary=50000, posted_by=other, status='approved')
+        statuses = ['applied', 'applied', 'shortlisted', 'rejected', 'hired']
+        for i, status in enumerate(statuses):
+            seeker = User.objects.create_user(f'seeker{i}', password='x', role='job_seeker')
+            Application.objects.create(user=seeker, job=cls.job, name='n', phone='1', status=status)
+            Application.objects.create(user=seeker, job=other_job, name='n', phone='1')
+
+    def setUp(self):
+        counters.recount()
+        self.client.force_login(self.employer)
+
+    def post(self, data, query=''):
+        url = reverse('job_resume:bulk_update_application_status', args=[self.job.id])
+        return self.client.post(f'{url}?{query}' if query else url, data)
+
+    def assertCountersMatchTable(self):
+        stored = counters.get_counters()
+        expected = counters.recount()
+        for status, label in Application.STATUS_CHOICES:
+            column = f'applications_{status}'
+            self.assertEqual(getattr(stored, column), getattr(expected, column), column)
+
+    def test_all_matching(self):
+        self.post({'status': 'rejected', 'scope': 'matching'})
+        self.assertEqual(Application.objects.filter(job=self.job).exclude(status='rejected').count(), 0)
+        self.assertEqual(Application.objects.exclude(job=self.job).filter(status='rejected').count(), 0)
+        self.assertCountersMatchTable()
+
+    def test_all_matching_respects_filter(self):
+        self.post({'status': 'hired', 'scope': 'matching'}, query='status=applied')
+        self.assertEqual(Application.objects.filter(job=self.job, status='hired').count(), 3)
+        self.assertCountersMatchTable()
+
+    def test_selected_ids_of_other_jobs_ignored(self):
+        ids = list(Application.objects.filter(status='applied').values_list('id', flat=True))
+        self.post({'status': 'shortlisted', 'application_ids': ids})
+        self.assertEqual(Application.objects.filter(job=self.job, status='shortlisted').count(), 3)
+        self.assertEqual(Application.objects.exclude(job=self.job).filter(status='shortlisted').count(), 0)
+        self.assertCountersMatchTable()
+
+    def test_unsupported_status_rejected(self):
+        response = self.post({'status': 'applied', 'scope': 'matching'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CounterTests(TestCase):
+    """SiteCounters follow saves and deletes, including of stale instances."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('seeker', password='x', role='job_seeker')
+        counters.recount()
+
+    def assertCounters(self, **expected):
+        stored = counters.get_counters()
+        for role, total in expected.items():
+            self.assertEqual(getattr(stored, f'users_{role}'), total, role)
+
+    def test_create_and_change(self):
+        User.objects.create_user('employer', password='x', role='employer')
+        self.user.role = 'admin'
+        self.user.save()
+        self.assertCounters(job_seeker=0, employer=1, admin=1)
+
+    def test_stale_instances_count_one_change(self):
+        first, second = User.objects.get(pk=self.user.pk), User.objects.get(pk=self.user.pk)
+        first.role = second.role = 'employer'
+        first.save()
+        second.save()
+        self.assertCounters(job_seeker=0, employer=1)
+
+    def test_deferred_field(self):
+        user = User.objects.only('id').get(pk=self.user.pk)
+        user.role = 'employer'
+        user.save()
+        self.assertCounters(job_seeker=0, employer=1)
+
+    def test_save_without_tracked_field(self):
+        self.user.role = 'employer'  # not written
+        self.user.save(update_fields=['last_login'])
+        self.assertCounters(job_seeker=1, employer=0)
+
+    def test_delete_stale_instance(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.user.role = 'employer'
+        self.user.save()
+        stale.delete()
+        self.assertCounters(job_seeker=0, employer=0)
+
+    def test_delete_twice(self):
+        first, second = User.objects.get(pk=self.user.pk), User.objects.get(pk=self.user.pk)
+        first.delete()
+        second.delete()
+        self.assertCounters(job_seeker=0)
+
+    def test_moderation_update(self):
+        job = Job.objects.create(title='Job', description='Django', company='Acme', location='Berlin',
+                                 posted_by=User.objects.create_user('employer', password='x', role='employer'))
+        moderation.set_status(Job.objects.filter(pk=job.pk), 'approved')
+        moderation.set_status(Job.objects.filter(pk=job.pk), 'approved')
+        stored = counters.get_counters()
+        self.assertEqual((stored.jobs_pending, stored.jobs_approved), (0, 1))
+
+
+class TaskQueueTests(TestCase):
+    """Claiming, retries with backoff and stale-task recovery of the work queue."""
+
+    KIND = 'test_kind'
+
+    def handler(self, claimed):
+        self.handled.extend(task.id for task in claimed)
+        return {task.id: 'boom' for task in claimed if task.object_id in self.failing}
+
+    def setUp(self):
+        self.handled, self.failing = [], set()
+        patcher = mock.patch.dict(tasks.HANDLERS, {self.KIND: self.handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_claim_marks_running_once(self):
+        task = tasks.enqueue(self.KIND, 1)
+        claimed = tasks.claim_batch(10)
+        self.assertEqual([t.id for t in claimed], [task.id])
+        self.assertEqual((claimed[0].status, claimed[0].attempts), ('running', 1))
+        self.assertEqual(tasks.claim_batch(10), [])
+
+    def test_claim_respects_batch_size_kind_and_run_after(self):
+        tasks.enqueue(self.KIND, 1)
+        tasks.enqueue(self.KIND, 2)
+        tasks.enqueue('other', 3)
+        later = tasks.enqueue(self.KIND, 4)
+        BackgroundTask.objects.filter(pk=later.pk).update(run_after=timezone.now() + datetime.timedelta(hours=1))
+        self.assertEqual([t.object_id for t in tasks.claim_batch(1, kinds=[self.KIND])], [1])
+        self.assertEqual([t.object_id for t in tasks.claim_batch(10, kinds=[self.KIND])], [2])
+
+    def test_failed_task_retried_with_backoff_then_failed(self):
+        task = tasks.enqueue(self.KIND, 1)
+        self.failing = {1}
+        started = timezone.now()
+        tasks.run_batch(10, max_attempts=2, backoff=30)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts, task.last_error), ('pending', 1, 'boom'))
+        self.assertGreaterEqual(task.run_after, started + datetime.timedelta(seconds=30))
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        tasks.run_batch(10, max_attempts=2, backoff=30)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('failed', 2))
+        self.assertEqual(tasks.run_batch(10), 0)
+
+    def test_successful_and_unknown_tasks(self):
+        done = tasks.enqueue(self.KIND, 1)
+        unknown = tasks.enqueue('no_such_kind', 2)
+        self.assertEqual(tasks.run_batch(10, max_attempts=1), 2)
+        done.refresh_from_db()
+        unknown.refresh_from_db()
+        self.assertEqual(done.status, 'done')
+        self.assertEqual(self.handled, [done.id])
+        self.assertEqual(unknown.status, 'failed')
+
+    def test_requeue_stale(self):
+        task = tasks.enqueue(self.KIND, 1)
+        tasks.claim_batch(10)
+        BackgroundTask.objects.filter(pk=task.pk).update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(tasks.requeue_stale(), 1)
+        self.assertEqual([t.id for t in tasks.claim_batch(10)], [task.id])
+
+    def test_enqueue_once(self):
+        first = tasks.enqueue_once(self.KIND, 1)
+        self.assertIsNone(tasks.enqueue_once(self.KIND, 1))
+        tasks.claim_batch(10)
+        self.assertNotEqual(tasks.enqueue_once(self.KIND, 1).id, first.id)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages cover every row once, forward and backward, despite ties in the sort key."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user('employer', password='x', role='employer')
+        Job.objects.bulk_create([
+            Job(title=f'Job {i}', description='Django', company='Acme', location='Berlin', posted_by=employer)
+            for i in range(23)
+        ])
+        # Ties on the first key, broken by -id
+        created = timezone.now()
+        Job.objects.filter(pk__in=Job.objects.order_by('id').values('pk')[:10]).update(created_at=created)
+        cls.ordering = ['-created_at', '-id']
+        cls.expected = list(Job.objects.order_by(*cls.ordering).values_list('id', flat=True))
+
+    def page(self, query=''):
+        request = RequestFactory().get(f'/jobs/?{query}')
+        return paginate(request, Job.objects.all(), self.ordering, page_size=5)
+
+    def test_forward_and_backward(self):
+        pages, page = [], self.page()
+        self.assertFalse(page.has_previous)
+        while True:
+            pages.append([job.id for job in page])
+            if not page.has_next:
+                break
+            page = self.page(page.next_query)
+        self.assertEqual([job_id for ids in pages for job_id in ids], self.expected)
+        self.assertEqual([len(ids) for ids in pages], [5, 5, 5, 5, 3])
+
+        backward = []
+        while page.has_previous:
+            page = self.page(page.previous_query)
+            backward.insert(0, [job.id for job in page])
+        self.assertEqual(backward, pages[:-1])
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        for cursor in ['garbage', 'eyJrIjpbMV0sImQiOiJuZXh0In0']:  # the second has the wrong key length
+            page = self.page(f'cursor={cursor}')
+            self.assertEqual([job.id for job in page], self.expected[:5])
+
+
+class JobImportTests(TestCase):
+    """Imports validate each row, insert valid ones in batches and keep the counters current."""
+
+    def setUp(self):
+        self.employer = User.objects.create_user('employer', password='x', role='employer')
+        counters.recount()
+
+    def test_csv_rows_validated_and_batched(self):
+        rows = ['title,description,company,location,salary']
+        rows += [f'Job {i},Django,Acme,Berlin,{50000 + i}' for i in range(5)]
+        rows += [',Django,Acme,Berlin,', 'Bad salary,Django,Acme,Berlin,lots', 'Too,many,values,in,this,row']
+        data = '\n'.join(rows).encode()
+        with mock.patch.object(imports, '_insert', wraps=imports._insert) as insert:
+            result = imports.import_jobs([data[:40], data[40:]], 'csv', self.employer, batch_size=2)
+        self.assertEqual(result.created, 5)
+        self.assertEqual([len(call.args[0]) for call in insert.call_args_list], [2, 2, 1])
+        self.assertEqual([line for line, message in result.errors], [7, 8, 9])
+        self.assertTrue(result.errors[0][1].startswith('title:'))
+        self.assertTrue(result.errors[1][1].startswith('salary:'))
+        self.assertEqual(Job.objects.filter(posted_by=self.employer, status='pending').count(), 5)
+        self.assertEqual(counters.get_counters().jobs_pending, 5)
+
+    def test_jsonl(self):
+        data = b'{"title": "Job", "description": "Django", "company": "Acme", "location": "Berlin"}\n' \
+               b'not json\n\n[1, 2]\n'
+        result = imports.import_jobs([data], 'jsonl', self.employer)
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, message in result.errors], [2, 4])
+
+    def test_missing_columns(self):
+        with self.assertRaises(imports.ImportFileError):
+            imports.import_jobs([b'title,company\nJob,Acme\n'], 'csv', self.employer)
+
+
+class JobApiTests(TestCase):
+    """The job API lists approved jobs, and with updated_since also reports removed ones."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user('employer', password='x', role='employer')
+        cls.jobs = [
+            Job.objects.create(title=f'Job {i}', description='Django', company='Acme', location='Berlin',
+                               posted_by=employer, status='approved')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def get(self, **params):
+        return self.client.get(reverse('job_resume:api_job_list'), params)
+
+    def test_lists_approved_jobs(self):
+        moderation.set_status(Job.objects.filter(pk=self.jobs[0].pk), 'rejected')
+        ids = [row['id'] for row in self.get().json()['results']]
+        self.assertEqual(sorted(ids), sorted(job.id for job in self.jobs[1:]))
+
+    def test_updated_since_reports_removed_jobs(self):
+        since = timezone.now()
+        moderation.set_status(Job.objects.filter(pk=self.jobs[0].pk), 'rejected')
+        self.jobs[1].title = 'Edited'
+        self.jobs[1].save()
+        results = self.get(updated_since=since.isoformat()).json()['results']
+        self.assertEqual([row['id'] for row in results], [self.jobs[0].id, self.jobs[1].id])
+        self.assertEqual(results[0], {'id': self.jobs[0].id, 'updated_at': results[0]['updated_at'], 'removed': True})
+        self.assertEqual(results[1]['title'], 'Edited')
+        self.assertNotIn('removed', results[1])
+
+    def test_updated_since_pages(self):
+        since = (timezone.now() - datetime.timedelta(days=1)).isoformat()
+        first = self.get(updated_since=since, limit=2).json()
+        self.assertEqual(len(first['results']), 2)
+        second = self.client.get(first['next']).json()
+        self.assertEqual([row['id'] for row in first['results'] + second['results']],
+                         [job.id for job in self.jobs])
+        self.assertIsNone(second['next'])
+
+    def test_invalid_updated_since(self):
+        self.assertEqual(self.get(updated_since='yesterday').status_code, 400)
+
+
+class VendorAssetTests(TestCase):
+    """Vendored assets are linked locally only when they can be served; otherwise from the CDN."""
+
+    def setUp(self):
+        assets._local_urls.clear()
+        self.addCleanup(assets._local_urls.clear)
+
+    def test_missing_file_uses_cdn(self):
+        with mock.patch.object(assets.finders, 'find', return_value=None), \
+                mock.patch.object(assets.staticfiles_storage, 'exists', return_value=False):
+            tag = assets.asset_tag('bootstrap-css')
+        self.assertIn(assets.VENDOR_ASSETS['bootstrap-css']['url'], tag)
+        self.assertIn('integrity=', tag)
+
+    def test_file_missing_from_manifest_uses_cdn(self):
+        with mock.patch.object(assets.finders, 'find', return_value='/static/bootstrap.min.css'), \
+                mock.patch.object(assets, 'static', side_effect=ValueError('Missing manifest entry')):
+            tag = assets.asset_tag('bootstrap-js')
+        self.assertIn(assets.VENDOR_ASSETS['bootstrap-js']['url'], tag)
+
+    def test_vendored_file_served_locally(self):
+        with mock.patch.object(assets.finders, 'find', return_value='/static/all.min.css'):
+            tag = assets.asset_tag('font-awesome')
+        self.assertIn('/static/vendor/fontawesome-6.4.0/css/all.min.css', tag)
+        self.assertNotIn('integrity=', tag)
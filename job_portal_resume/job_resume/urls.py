@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, feeds, views
 
 app_name = 'job_resume'
 
@@ -14,13 +14,19 @@ urlpatterns = [
     path('jobs/', views.job_list, name='job_list'),
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
     path('jobs/<int:job_id>/apply/', views.apply_job, name='apply_job'),
+    path('jobs/feed/rss/', feeds.job_feed_rss, name='job_feed_rss'),
+    path('jobs/feed/atom/', feeds.job_feed_atom, name='job_feed_atom'),
     path('my-applications/', views.my_applications, name='my_applications'),
 
     # Employer
     path('post-job/', views.post_job, name='post_job'),
+    path('post-job/import/', views.import_jobs, name='import_jobs'),
     path('my-jobs/', views.my_jobs, name='my_jobs'),
     path('job/<int:job_id>/applications/', views.job_applications, name='job_applications'),
+    path('job/<int:job_id>/applications/export/', views.export_job_applications, name='export_job_applications'),
     path('application/<int:application_id>/update-status/', views.update_application_status, name='update_application_status'),
+    path('job/<int:job_id>/applications/status/', views.bulk_update_application_status, name='bulk_update_application_status'),
+    path('candidates/', views.candidate_search, name='candidate_search'),
 
     # Resume Builder
     path('resume-builder/', views.resume_builder, name='resume_builder'),
@@ -31,6 +37,10 @@ urlpatterns = [
 
     # Admin
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin-dashboard/jobs/', views.admin_dashboard_jobs, name='admin_dashboard_jobs'),
+    path('admin-dashboard/users/', views.admin_dashboard_users, name='admin_dashboard_users'),
+    path('admin-dashboard/applications/', views.admin_dashboard_applications, name='admin_dashboard_applications'),
+    path('admin-dashboard/moderation/', views.moderation_queue, name='moderation_queue'),
     path('approve-job/<int:job_id>/', views.approve_job, name='approve_job'),
     path('reject-job/<int:job_id>/', views.reject_job, name='reject_job'),
     path('delete-job/<int:job_id>/', views.delete_job, name='delete_job'),
@@ -41,4 +51,8 @@ urlpatterns = [
 
     # User Profile
     path('profile/', views.user_profile, name='user_profile'),
+
+    # Read-only API
+    path('api/jobs/', api.job_list, name='api_job_list'),
+    path('api/jobs/<int:job_id>/', api.job_detail, name='api_job_detail'),
 ]
@@ -1,15 +1,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest, FileResponse
 from django.template.loader import get_template
+from django.db import transaction
 
-from django.db.models import Q
 import json
 from .models import User, Job, Application, Resume, UserProfile
-from .forms import UserRegistrationForm, JobForm, ResumeForm, JobApplicationForm, UserProfileForm
+from .forms import UserRegistrationForm, JobForm, JobImportForm, ResumeForm, JobApplicationForm, UserProfileForm
 from .decorators import employer_required, admin_required, job_seeker_required
+from .search import search_applications, search_jobs
+from .pagination import paginate
+from .counters import get_counters
+from .resume_pdf import PdfError, RenderTimeout, get_resume_pdf
+from .preview_cache import render_preview
+from .exports import EXPORT_FORMATS, stream_applications
+from .imports import ImportFileError, detect_format, import_jobs as import_job_rows
+from .matching import recommend_jobs
+from .skills import skill_frequencies
+from .candidates import candidate_facets, clean_filters, filter_params, search_candidates
+from .facets import toggle_query
+from .conditional import conditional_page, home_etag, job_detail_etag, job_list_etag, resume_preview_etag
+from . import application_status, job_facets, moderation
 
 # Authentication Views
 def register(request):
@@ -47,34 +61,56 @@ def logout_view(request):
 
 # Job Portal Views
 @login_required
+@conditional_page(home_etag)
 def home(request):
+    recommended = []
     if request.user.role == 'admin':
         jobs = Job.objects.all().order_by('-created_at')[:10]
     elif request.user.role == 'employer':
         jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')[:10]
     else:  # job_seeker
         jobs = Job.objects.filter(status='approved').order_by('-created_at')[:10]
-    return render(request, 'home.html', {'jobs': jobs})
+        recommended = recommend_jobs(request.user)
+    return render(request, 'home.html', {'jobs': jobs, 'recommended': recommended})
 
 @login_required
+@conditional_page(job_list_etag)
 def job_list(request):
     query = request.GET.get('q', '')
+    filters = job_facets.clean_filters(request.GET)
+    ordering = ['-created_at', '-id']
     if request.user.role == 'admin':
-        jobs = Job.objects.all().order_by('-created_at')
+        jobs, scope = Job.objects.all(), 'all'
     elif request.user.role == 'employer':
-        jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
+        jobs, scope = Job.objects.filter(posted_by=request.user), f'employer:{request.user.pk}'
     else:  # job_seeker
-        jobs = Job.objects.filter(status='approved').order_by('-created_at')
+        jobs, scope = Job.objects.filter(status='approved'), 'approved'
         if query:
-            jobs = jobs.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(company__icontains=query) |
-                Q(location__icontains=query)
-            )
-    return render(request, 'job_list.html', {'jobs': jobs, 'query': query})
+            jobs = search_jobs(jobs, query)
+            ordering = ['search_rank', '-created_at', '-id']
+    facet_counts = job_facets.job_facets(scope, query if scope == 'approved' else '', filters, jobs)
+    page = paginate(request, job_facets.apply_filters(jobs, filters), ordering)
+    params = job_facets.filter_params(filters, query)
+    facet_groups = []
+    for facet, label in (('location', 'Location'), ('company', 'Company'), ('salary', 'Salary')):
+        options = [
+            {'value': value, 'label': job_facets.SALARY_LABELS.get(value, value) if facet == 'salary' else value,
+             'total': total, 'selected': value == filters[facet], 'query': toggle_query(params, facet, value)}
+            for value, total in facet_counts[facet]
+        ]
+        selected = filters[facet]
+        facet_groups.append({
+            'name': facet, 'label': label, 'options': options,
+            'selected': job_facets.SALARY_LABELS.get(selected, selected) if facet == 'salary' else selected,
+            'clear_query': toggle_query(params, facet, selected) if selected else '',
+        })
+    return render(request, 'job_list.html', {
+        'jobs': page.object_list, 'page': page, 'query': query,
+        'filters': filters, 'facet_groups': facet_groups,
+    })
 
 @login_required
+@conditional_page(job_detail_etag)
 def job_detail(request, job_id):
     job = get_object_or_404(Job, id=job_id)
     has_applied = Application.objects.filter(user=request.user, job=job).exists()
@@ -102,8 +138,9 @@ def apply_job(request, job_id):
 @login_required
 @job_seeker_required
 def my_applications(request):
-    applications = Application.objects.filter(user=request.user).order_by('-applied_at')
-    return render(request, 'my_applications.html', {'applications': applications})
+    applications = Application.objects.filter(user=request.user).select_related('job')
+    page = paginate(request, applications, ['-applied_at', '-id'])
+    return render(request, 'my_applications.html', {'applications': page.object_list, 'page': page})
 
 # Employer Views
 @login_required
@@ -121,28 +158,142 @@ def post_job(request):
         form = JobForm()
     return render(request, 'post_job.html', {'form': form})
 
+@login_required
+@employer_required
+def import_jobs(request):
+    result = None
+    if request.method == 'POST':
+        form = JobImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = import_job_rows(upload.chunks(), detect_format(upload.name), request.user)
+            except ImportFileError as error:
+                form.add_error('file', str(error))
+            else:
+                if result.created:
+                    messages.success(request, f'{result.created} jobs imported and sent for approval.')
+                if result.failed:
+                    messages.error(request, f'{result.failed} rows could not be imported.')
+    else:
+        form = JobImportForm()
+    return render(request, 'import_jobs.html', {'form': form, 'result': result})
+
 @login_required
 @employer_required
 def my_jobs(request):
-    jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
-    return render(request, 'my_jobs.html', {'jobs': jobs})
+    jobs = Job.objects.filter(posted_by=request.user)
+    page = paginate(request, jobs, ['-created_at', '-id'])
+    return render(request, 'my_jobs.html', {'jobs': page.object_list, 'page': page})
+
+def _filter_applications(job, params):
+    # Shared by the list and "change all matching": (queryset, sort, min_score, status, query)
+    applications = Application.objects.filter(job=job)
+    sort = params.get('sort', 'applied')
+    min_score = params.get('min_score', '')
+    status = params.get('status', '')
+    query = params.get('q', '').strip()
+    if query:
+        applications = search_applications(applications, query)
+    if sort == 'score':
+        applications = applications.filter(match_score__isnull=False)
+    try:
+        if min_score:
+            applications = applications.filter(match_score__gte=float(min_score))
+    except ValueError:
+        min_score = ''
+    if status in dict(Application.STATUS_CHOICES):
+        applications = applications.filter(status=status)
+    else:
+        status = ''
+    return applications, sort, min_score, status, query
 
 @login_required
 @employer_required
 def job_applications(request, job_id):
     job = get_object_or_404(Job, id=job_id, posted_by=request.user)
-    applications = Application.objects.filter(job=job).order_by('-applied_at')
-    return render(request, 'job_applications.html', {'job': job, 'applications': applications})
+    applications, sort, min_score, status, query = _filter_applications(job, request.GET)
+    ordering = ['-match_score', '-id'] if sort == 'score' else ['-applied_at', '-id']
+    page = paginate(request, applications.select_related('user'), ordering)
+    # Scored by the background worker; these are left out until it has
+    unscored = Application.objects.filter(job=job, match_score__isnull=True).count() if sort == 'score' else 0
+    return render(request, 'job_applications.html', {
+        'job': job, 'applications': page.object_list, 'page': page, 'sort': sort, 'min_score': min_score,
+        'unscored': unscored, 'status': status, 'query': query, 'status_choices': Application.STATUS_CHOICES,
+        'employer_statuses': application_status.EMPLOYER_STATUSES,
+    })
+
+@login_required
+@employer_required
+def bulk_update_application_status(request, job_id):
+    job = get_object_or_404(Job.objects.only('id'), id=job_id, posted_by=request.user)
+    if request.method != 'POST':
+        return redirect('job_resume:job_applications', job_id=job.id)
+    status = request.POST.get('status')
+    if status not in application_status.EMPLOYER_STATUSES:
+        return HttpResponseBadRequest('Unsupported application status.')
+    if request.POST.get('scope') == 'matching':
+        applications = _filter_applications(job, request.GET)[0]
+    else:
+        ids = [application_id for application_id in request.POST.getlist('application_ids') if application_id.isdigit()]
+        applications = Application.objects.filter(job=job, pk__in=ids)
+    count = application_status.set_status(applications.filter(job__posted_by=request.user), status)
+    messages.success(request, f'{count} application(s) marked as {status}.')
+    query = request.GET.urlencode()
+    url = reverse('job_resume:job_applications', kwargs={'job_id': job.id})
+    return redirect(f'{url}?{query}' if query else url)
+
+@login_required
+@employer_required
+def export_job_applications(request, job_id):
+    job = get_object_or_404(Job, id=job_id, posted_by=request.user)
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Unsupported export format.')
+    applications = Application.objects.filter(job=job)
+    statuses = [status for status in request.GET.getlist('status') if status in dict(Application.STATUS_CHOICES)]
+    if statuses:
+        applications = applications.filter(status__in=statuses)
+    return stream_applications(request, applications, export_format, f'job-{job.id}-applications')
+
+@login_required
+@employer_required
+def candidate_search(request):
+    filters = clean_filters(request.GET)
+    resumes = search_candidates(filters).select_related('user')
+    facet_counts = candidate_facets(filters, resumes)
+    page = paginate(request, resumes, ['-updated_at', '-id'])
+    params = filter_params(filters)
+    skill_facets = [
+        {'label': label, 'total': total, 'selected': name in filters['skills'],
+         'query': toggle_query(params, 'skill', name, multiple=True)}
+        for name, label, total in facet_counts['skills']
+    ]
+    location_facets = [
+        {'label': location, 'total': total, 'selected': location == filters['location'],
+         'query': toggle_query(params, 'location', location)}
+        for location, total in facet_counts['locations']
+    ]
+    active_filters = [
+        {'label': skill, 'query': toggle_query(params, 'skill', skill, multiple=True)}
+        for skill in filters['skills']
+    ]
+    if filters['location']:
+        active_filters.append({'label': filters['location'], 'query': toggle_query(params, 'location', filters['location'])})
+    return render(request, 'candidate_search.html', {
+        'resumes': page.object_list, 'page': page, 'filters': filters, 'active_filters': active_filters,
+        'skill_facets': skill_facets, 'location_facets': location_facets,
+    })
 
 @login_required
 @employer_required
 def update_application_status(request, application_id):
-    application = get_object_or_404(Application, id=application_id, job__posted_by=request.user)
+    application = get_object_or_404(Application.objects.select_related('job', 'user'), id=application_id,
+                                    job__posted_by=request.user)
     if request.method == 'POST':
         status = request.POST.get('status')
-        if status in ['shortlisted', 'rejected', 'hired']:
-            application.status = status
-            application.save()
+        if status in application_status.EMPLOYER_STATUSES:
+            application_status.set_status(Application.objects.filter(pk=application.pk), status)
             messages.success(request, f'Application status updated to {status}!')
         return redirect('job_resume:job_applications', job_id=application.job.id)
     return render(request, 'update_application_status.html', {'application': application})
@@ -179,21 +330,36 @@ def edit_resume(request, resume_id):
 
 @login_required
 @job_seeker_required
+@conditional_page(resume_preview_etag)
 def resume_preview(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    return render(request, f'resume_{resume.template_type}.html', {'resume': resume})
+    # ?template= previews the resume in another layout without saving it
+    template_type = request.GET.get('template', resume.template_type)
+    if template_type not in dict(Resume.TEMPLATE_CHOICES):
+        template_type = resume.template_type
+    return HttpResponse(render_preview(resume, template_type))
 
 @login_required
 @job_seeker_required
 def download_resume(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    return render(request, f'resume_{resume.template_type}.html', {'resume': resume, 'auto_download': True})
+    try:
+        path = get_resume_pdf(resume)
+    except RenderTimeout:
+        response = HttpResponse('The PDF is taking too long to generate. Please try again shortly.', status=503)
+        response['Retry-After'] = '30'
+        return response
+    except PdfError as error:
+        messages.error(request, f'{error} Open the preview and use your browser\'s Print to PDF instead.')
+        return redirect('job_resume:my_resumes')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{resume.name}.pdf', content_type='application/pdf')
 
 @login_required
 @job_seeker_required
 def my_resumes(request):
-    resumes = Resume.objects.filter(user=request.user).order_by('-updated_at')
-    return render(request, 'my_resumes.html', {'resumes': resumes})
+    resumes = Resume.objects.filter(user=request.user)
+    page = paginate(request, resumes, ['-updated_at', '-id'])
+    return render(request, 'my_resumes.html', {'resumes': page.object_list, 'page': page})
 
 # User Profile View
 @login_required
@@ -220,43 +386,76 @@ def user_profile(request):
 @login_required
 @admin_required
 def admin_dashboard(request):
-    users = User.objects.all().order_by('-date_joined')
-    jobs = Job.objects.all().order_by('-created_at')
-    applications = Application.objects.all().order_by('-applied_at')
-    
-    # Simple analytics
-    total_users = users.count()
-    total_jobs = jobs.count()
-    total_applications = applications.count()
-    recent_users = users[:5]
-    recent_jobs = jobs[:5]
-    
+    # The tables are loaded lazily from the admin_dashboard_* fragment views;
+    # the page itself only needs the headline totals from the counters row.
+    counters = get_counters()
     return render(request, 'admin_dashboard.html', {
-        'users': users,
-        'jobs': jobs,
-        'applications': applications,
-        'total_users': total_users,
-        'total_jobs': total_jobs,
-        'total_applications': total_applications,
-        'recent_users': recent_users,
-        'recent_jobs': recent_jobs
+        'total_users': counters.total_users,
+        'total_jobs': counters.total_jobs,
+        'total_applications': counters.total_applications,
+        'pending_jobs': counters.jobs_pending,
+    })
+
+@login_required
+@admin_required
+def admin_dashboard_jobs(request):
+    page = paginate(request, Job.objects.select_related('posted_by'), ['-created_at', '-id'])
+    return render(request, 'admin_jobs_panel.html', {'jobs': page.object_list, 'page': page, 'page_url': request.path})
+
+@login_required
+@admin_required
+def admin_dashboard_users(request):
+    page = paginate(request, User.objects.all(), ['-date_joined', '-id'])
+    return render(request, 'admin_users_panel.html', {'users': page.object_list, 'page': page, 'page_url': request.path})
+
+@login_required
+@admin_required
+def admin_dashboard_applications(request):
+    applications = Application.objects.select_related('user', 'job')
+    page = paginate(request, applications, ['-applied_at', '-id'])
+    return render(request, 'admin_applications_panel.html', {'applications': page.object_list, 'page': page, 'page_url': request.path})
+
+MODERATION_DONE = {'approve': 'approved', 'reject': 'rejected', 'delete': 'deleted'}
+
+@login_required
+@admin_required
+def moderation_queue(request):
+    query = request.GET.get('q', '').strip()
+    filters = job_facets.clean_filters(request.GET)
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action not in moderation.ACTIONS:
+            return HttpResponseBadRequest('Unknown moderation action.')
+        if request.POST.get('scope') == 'matching':
+            jobs = moderation.pending_jobs(query, filters)
+        else:
+            ids = [job_id for job_id in request.POST.getlist('job_ids') if job_id.isdigit()]
+            jobs = Job.objects.filter(status='pending', pk__in=ids)
+        count = moderation.moderate(jobs, action)
+        messages.success(request, f'{count} job(s) {MODERATION_DONE[action]}.')
+        return redirect(request.get_full_path())
+
+    jobs = moderation.pending_jobs(query, filters)
+    filtered = bool(query) or any(filters.values())
+    page = paginate(request, jobs.select_related('posted_by'), ['created_at', 'id'])
+    return render(request, 'moderation_queue.html', {
+        'jobs': page.object_list, 'page': page, 'query': query, 'filters': filters, 'filtered': filtered,
+        'matching': jobs.count() if filtered else get_counters().jobs_pending,
     })
 
 @login_required
 @admin_required
 def approve_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id)
-    job.status = 'approved'
-    job.save()
+    job = get_object_or_404(Job.objects.only('id'), id=job_id)
+    moderation.set_status(Job.objects.filter(pk=job.pk), 'approved')
     messages.success(request, 'Job approved successfully!')
     return redirect('job_resume:admin_dashboard')
 
 @login_required
 @admin_required
 def reject_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id)
-    job.status = 'rejected'
-    job.save()
+    job = get_object_or_404(Job.objects.only('id'), id=job_id)
+    moderation.set_status(Job.objects.filter(pk=job.pk), 'rejected')
     messages.success(request, 'Job rejected successfully!')
     return redirect('job_resume:admin_dashboard')
 
@@ -283,8 +482,8 @@ def delete_user(request, user_id):
 @admin_required
 def manage_users(request):
     # This might be redundant if we put everything in dashboard, but keeping it for safety
-    users = User.objects.all().order_by('-date_joined')
-    return render(request, 'manage_users.html', {'users': users})
+    page = paginate(request, User.objects.all(), ['-date_joined', '-id'])
+    return render(request, 'manage_users.html', {'users': page.object_list, 'page': page})
 
 @login_required
 @admin_required
@@ -293,8 +492,9 @@ def change_user_role(request, user_id):
     if request.method == 'POST':
         new_role = request.POST.get('role')
         if new_role in ['job_seeker', 'employer', 'admin']:
-            user.role = new_role
-            user.save()
+            with transaction.atomic():
+                user.role = new_role
+                user.save()
             messages.success(request, f'User role changed to {new_role}!')
         return redirect('job_resume:admin_dashboard')
     # If we want a separate page, we render 'change_user_role.html'.
@@ -304,15 +504,13 @@ def change_user_role(request, user_id):
 @login_required
 @admin_required
 def analytics_dashboard(request):
-    total_users = User.objects.count()
-    total_jobs = Job.objects.count()
-    total_applications = Application.objects.count()
-    approved_jobs = Job.objects.filter(status='approved').count()
-    pending_jobs = Job.objects.filter(status='pending').count()
+    counters = get_counters()
     return render(request, 'analytics_dashboard.html', {
-        'total_users': total_users,
-        'total_jobs': total_jobs,
-        'total_applications': total_applications,
-        'approved_jobs': approved_jobs,
-        'pending_jobs': pending_jobs,
+        'counters': counters,
+        'total_users': counters.total_users,
+        'total_jobs': counters.total_jobs,
+        'total_applications': counters.total_applications,
+        'approved_jobs': counters.jobs_approved,
+        'pending_jobs': counters.jobs_pending,
+        'top_skills': skill_frequencies(10),
     })
@@ -0,0 +1,104 @@
+import logging
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import DatabaseError, connections
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from . import assets, job_facets, matching, preview_cache
+from .counters import get_counters
+from .models import Job, Resume
+
+# Work a fresh process would otherwise do while answering its first
+# requests: importing every view, compiling every template (kept by the
+# cached template loader), loading the static files manifest and filling the
+# in-process caches - the job matching index, the facet counts of the job
+# list and the dashboard counters.
+#
+# wsgi.py runs warm_up() when DJANGO_WARMUP is set, so under gunicorn
+# --preload (see gunicorn.conf.py) it runs once in the master and every
+# forked worker starts warm; without --preload each worker warms itself
+# before it accepts connections. Database connections are closed at the end
+# so forked workers never share one. `manage.py warmup` runs it by hand.
+#
+# Warming up is best effort: a template that does not compile or a database
+# that is not migrated yet is logged and the server starts anyway, leaving
+# that work to the first request as before.
+
+logger = logging.getLogger('job_resume.warmup')
+
+
+def _url_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from _url_patterns(pattern)
+        else:
+            yield pattern
+
+
+def load_urls(log):
+    resolver = get_resolver()
+    patterns = list(_url_patterns(resolver))
+    resolver.reverse_dict  # builds the reverse() lookup tables
+    return len(patterns)
+
+
+def compile_templates(log):
+    templates = Path(apps.get_app_config('job_resume').path) / 'templates'
+    names = sorted(str(path.relative_to(templates)) for path in templates.rglob('*.html'))
+    compiled = 0
+    for name in names:
+        try:
+            get_template(name)
+        except TemplateSyntaxError as error:
+            # Left for the request that uses it (if any) to report
+            log(f'skipped {name}: {error}')
+        else:
+            compiled += 1
+    for template_type, label in Resume.TEMPLATE_CHOICES:
+        preview_cache.template_hash(template_type)
+    return compiled
+
+
+def load_static(log):
+    for name in assets.VENDOR_ASSETS:
+        assets.is_vendored(name)
+    # Manifest storage reads staticfiles.json when it is created
+    return len(getattr(staticfiles_storage, 'hashed_files', ()))
+
+
+def prime_caches(log):
+    get_counters()
+    approved = Job.objects.filter(status='approved')
+    job_facets.job_facets('approved', '', job_facets.clean_filters({}), approved)
+    return len(matching.get_index())
+
+
+STEPS = [
+    ('urls', load_urls),
+    ('templates', compile_templates),
+    ('static files', load_static),
+    ('caches', prime_caches),
+]
+
+
+def warm_up(log=logger.info):
+    """Run every warm-up step; returns ``[(step, count, seconds)]``."""
+    timings = []
+    try:
+        for step, function in STEPS:
+            started = time.perf_counter()
+            try:
+                count = function(log)
+            except DatabaseError as error:
+                log(f'{step}: skipped, {error}')
+                continue
+            timings.append((step, count, time.perf_counter() - started))
+            log(f'{step}: {count} in {timings[-1][2] * 1000:.0f} ms')
+    finally:
+        connections.close_all()
+    return timings